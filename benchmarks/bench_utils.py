@@ -0,0 +1,142 @@
+"""
+Benchmark helpers: per-stage timers, latency summaries and JSON results.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Summarize a list of durations in seconds.
+
+    Args:
+        samples: Stage durations in seconds
+
+    Returns:
+        dict: count, mean and p50/p95/p99 latency in milliseconds
+    """
+    if not samples:
+        return {"count": 0}
+    values = np.asarray(samples, dtype=np.float64) * 1000.0
+    summary = {"count": int(values.size), "mean_ms": float(values.mean())}
+    for pct, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        summary[f"p{pct}_ms"] = float(value)
+    return summary
+
+
+class StageTimer:
+    """Collect wall-clock durations per pipeline stage."""
+
+    def __init__(self):
+        """Initialize an empty timer."""
+        self.samples = defaultdict(list)
+
+    @contextmanager
+    def time(self, stage: str):
+        """Time the enclosed block and record it under ``stage``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples[stage].append(time.perf_counter() - start)
+
+    def add(self, stage: str, seconds: float):
+        """Record an externally measured duration."""
+        self.samples[stage].append(seconds)
+
+    def summary(self, frames: int, wall_time: float) -> dict:
+        """Build the result entry for one benchmark.
+
+        Args:
+            frames: Number of frames processed in the measured run
+            wall_time: Total measured wall time in seconds
+
+        Returns:
+            dict: Per-stage latency summaries plus throughput
+        """
+        return {
+            "frames": frames,
+            "wall_time_s": wall_time,
+            "throughput_fps": frames / wall_time if wall_time > 0 else 0.0,
+            "stages": {
+                stage: summarize(values) for stage, values in self.samples.items()
+            },
+        }
+
+
+def _git_revision() -> Optional[str]:
+    """Return the current git commit, if available."""
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL
+            )
+            .decode()
+            .strip()
+        )
+    except Exception:
+        return None
+
+
+def environment_info() -> dict:
+    """Describe the machine and library versions a run was made on."""
+    import cv2
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_revision": _git_revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+    }
+
+
+def write_results(path: str, results: dict):
+    """Write benchmark results together with environment info as JSON.
+
+    Args:
+        path: Output JSON file
+        results: Mapping of benchmark name to result entry
+    """
+    payload = {"environment": environment_info(), "results": results}
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+
+
+def format_table(results: dict) -> str:
+    """Render results as a plain-text table."""
+    lines = [
+        f"{'benchmark':<32} {'stage':<14} {'p50 ms':>9} {'p95 ms':>9} "
+        f"{'p99 ms':>9} {'fps':>9}"
+    ]
+    for name, entry in sorted(results.items()):
+        if "skipped" in entry:
+            lines.append(f"{name:<32} skipped: {entry['skipped']}")
+            continue
+        fps = f"{entry['throughput_fps']:>9.1f}" if "throughput_fps" in entry else ""
+        for stage, stats in entry.get("stages", {}).items():
+            if not stats.get("count"):
+                continue
+            lines.append(
+                f"{name:<32} {stage:<14} {stats['p50_ms']:>9.2f} "
+                f"{stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} {fps}"
+            )
+            name, fps = "", ""
+    return "\n".join(lines)
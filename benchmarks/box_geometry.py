@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Box Geometry Benchmark
+Time the vectorized box operations in src/geometry.py against plain Python
+loops at 10, 1k and 10k boxes: IoU against 100 reference boxes, class-aware
+NMS, weighted box fusion and crop-to-frame mapping.
+
+Usage:
+    python benchmarks/box_geometry.py
+    python benchmarks/box_geometry.py --sizes 10,1000 --budget 0.2
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from bench_utils import StageTimer, format_table, write_results
+
+# Add the parent directory to path so we can import src modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.geometry import batched_nms, crop_to_frame, iou_matrix, weighted_box_fusion
+
+
+def make_boxes(count: int, seed: int = 0):
+    """Detector-like output: about 8 jittered boxes per object, 5 classes."""
+    rng = np.random.default_rng(seed)
+    objects = max(1, count // 8)
+    centers = rng.uniform(0, 1920, (objects, 2))
+    sizes = rng.uniform(20, 200, (objects, 2))
+    owner = rng.integers(0, objects, count)
+    jitter = rng.normal(0, 4, (count, 4))
+    boxes = np.concatenate(
+        [centers[owner] - sizes[owner] / 2, centers[owner] + sizes[owner] / 2], axis=1
+    )
+    boxes = (boxes + jitter).astype(np.float32)
+    boxes[:, 2:] = np.maximum(boxes[:, 2:], boxes[:, :2] + 1)
+    scores = rng.uniform(0.05, 1.0, count).astype(np.float32)
+    class_ids = (owner % 5).astype(np.int64)
+    return boxes, scores, class_ids
+
+
+def naive_iou(a, b) -> float:
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    inter = max(width, 0.0) * max(height, 0.0)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def naive_iou_matrix(boxes, references):
+    return [[naive_iou(a, b) for b in references] for a in boxes]
+
+
+def naive_nms(boxes, scores, class_ids, threshold=0.5):
+    keep = []
+    for i in sorted(range(len(boxes)), key=lambda i: -scores[i]):
+        if all(
+            class_ids[i] != class_ids[j] or naive_iou(boxes[i], boxes[j]) <= threshold
+            for j in keep
+        ):
+            keep.append(i)
+    return keep
+
+
+def naive_fusion(boxes, scores, class_ids, threshold=0.55):
+    clusters = []  # [class, weighted sums, score sum, count, fused box]
+    for i in sorted(range(len(boxes)), key=lambda i: -scores[i]):
+        target = None
+        best = threshold
+        for cluster in clusters:
+            if cluster[0] == class_ids[i]:
+                overlap = naive_iou(boxes[i], cluster[4])
+                if overlap > best:
+                    target, best = cluster, overlap
+        if target is None:
+            target = [class_ids[i], [0.0] * 4, 0.0, 0, boxes[i]]
+            clusters.append(target)
+        target[1] = [s + c * scores[i] for s, c in zip(target[1], boxes[i])]
+        target[2] += scores[i]
+        target[3] += 1
+        target[4] = [s / target[2] for s in target[1]]
+    return clusters
+
+
+def naive_crop_to_frame(boxes, crop):
+    x1, y1 = crop[0], crop[1]
+    return [[b[0] + x1, b[1] + y1, b[2] + x1, b[3] + y1] for b in boxes]
+
+
+def run(timer: StageTimer, stage: str, function, budget: float) -> int:
+    """Call ``function`` until ``budget`` seconds have passed (at least once)."""
+    calls = 0
+    deadline = time.perf_counter() + budget
+    while True:
+        with timer.time(stage):
+            function()
+        calls += 1
+        if time.perf_counter() >= deadline:
+            return calls
+
+
+def bench_size(count: int, budget: float, max_naive: int) -> dict:
+    """Benchmark every operation at one box count.
+
+    Returns:
+        dict: Benchmark name -> entry with "numpy" and "python" stages
+    """
+    boxes, scores, class_ids = make_boxes(count)
+    references = make_boxes(100, seed=1)[0]
+    lists = (boxes.tolist(), scores.tolist(), class_ids.tolist())
+    crop = (640, 360, 1280, 720)
+
+    operations = {
+        "iou_vs_100": (
+            lambda: iou_matrix(boxes, references),
+            lambda: naive_iou_matrix(lists[0], references.tolist()),
+        ),
+        "nms": (
+            lambda: batched_nms(boxes, scores, class_ids, 0.5),
+            lambda: naive_nms(*lists),
+        ),
+        "fusion": (
+            lambda: weighted_box_fusion(boxes, scores, class_ids),
+            lambda: naive_fusion(*lists),
+        ),
+        "crop_to_frame": (
+            lambda: crop_to_frame(boxes, crop),
+            lambda: naive_crop_to_frame(lists[0], crop),
+        ),
+    }
+
+    results = {}
+    for name, (vectorized, naive) in operations.items():
+        timer = StageTimer()
+        start = time.perf_counter()
+        calls = run(timer, "numpy", vectorized, budget)
+        if count <= max_naive:
+            calls += run(timer, "python", naive, budget)
+        entry = timer.summary(calls, time.perf_counter() - start)
+        stages = entry["stages"]
+        if "python" in stages:
+            entry["speedup"] = stages["python"]["p50_ms"] / stages["numpy"]["p50_ms"]
+        results[f"geometry/{name}/{count}"] = entry
+    return results
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Box geometry benchmark")
+    parser.add_argument(
+        "--sizes", default="10,1000,10000", help="Comma-separated box counts"
+    )
+    parser.add_argument(
+        "--budget", type=float, default=0.5, help="Seconds spent per measurement"
+    )
+    parser.add_argument(
+        "--max-naive",
+        type=int,
+        default=10000,
+        help="Skip the Python loops above this many boxes",
+    )
+    parser.add_argument(
+        "--output",
+        default=os.path.join("benchmarks", "results", "box_geometry.json"),
+        help="JSON results file",
+    )
+    args = parser.parse_args()
+
+    results = {}
+    for count in (int(size) for size in args.sizes.split(",")):
+        results.update(bench_size(count, args.budget, args.max_naive))
+
+    write_results(args.output, results)
+    print(format_table(results))
+    print()
+    for name, entry in sorted(results.items()):
+        if "speedup" in entry:
+            print(f"{name:<32} numpy is {entry['speedup']:.1f}x faster")
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
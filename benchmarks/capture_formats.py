@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Capture Format Benchmark
+Open a camera in each pixel format (MJPG, YUYV), verify which settings the
+driver actually applied, and measure the achieved frame rate together with
+the cost of grabbing and of decoding frames. Also measures decode-on-demand,
+where every frame is grabbed but only every Nth is decoded.
+
+Usage:
+    python benchmarks/capture_formats.py --camera-id 0 --width 1920 --height 1080
+    python benchmarks/capture_formats.py --clip   # camera-free, generated MJPG clip
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+from bench_utils import StageTimer, format_table, write_results
+from sources import ensure_clip
+
+# Add the parent directory to path so we can import src modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.camera_handler import CAPTURE_FORMATS, CameraHandler
+
+
+def measure(camera: CameraHandler, frames: int, decode_every: int) -> dict:
+    """Grab ``frames`` frames, decoding every ``decode_every``-th one.
+
+    Returns:
+        dict: Benchmark entry with grab/decode stages and achieved fps
+    """
+    timer = StageTimer()
+    grabbed = 0
+    start = time.perf_counter()
+    for index in range(frames):
+        with timer.time("grab"):
+            ok = camera.grab_frame()
+        if not ok:
+            break
+        grabbed += 1
+        if index % decode_every == 0:
+            with timer.time("decode"):
+                ret, pooled = camera.retrieve_pooled_frame()
+            if ret:
+                pooled.release()
+    entry = timer.summary(grabbed, time.perf_counter() - start)
+    entry["decoded"] = len(timer.samples["decode"])
+    return entry
+
+
+def bench_source(camera: CameraHandler, args) -> dict:
+    """Run the full-decode and decode-on-demand measurements on one source.
+
+    The camera is reopened for each measurement, so both start from the
+    same state (and a clip from its first frame).
+    """
+    results = {}
+    for label, every in (("full", 1), (f"every{args.decode_every}", args.decode_every)):
+        if not camera.initialize_camera():
+            return {label: {"skipped": f"cannot open {camera.camera_id}"}}
+        try:
+            # Let auto-exposure settle and the frame pool get allocated
+            for _ in range(args.warmup):
+                ok, pooled = camera.read_pooled_frame()
+                if ok:
+                    pooled.release()
+            negotiated = camera.negotiated or camera.get_camera_info()
+            entry = measure(camera, args.frames, every)
+            entry["negotiated"] = negotiated
+            results[label] = entry
+        finally:
+            camera.release()
+    return results
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Capture format benchmark")
+    parser.add_argument("--camera-id", type=int, default=0, help="Camera device ID")
+    parser.add_argument(
+        "--clip", action="store_true", help="Use the generated MJPG clip instead"
+    )
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument(
+        "--formats",
+        default=",".join(CAPTURE_FORMATS),
+        help="Comma-separated FOURCCs to try (default: MJPG,YUYV)",
+    )
+    parser.add_argument("--buffer-size", type=int, default=1)
+    parser.add_argument("--frames", type=int, default=150, help="Frames measured")
+    parser.add_argument("--warmup", type=int, default=10, help="Frames discarded")
+    parser.add_argument(
+        "--decode-every", type=int, default=3, help="Decode-on-demand stride"
+    )
+    parser.add_argument(
+        "--output",
+        default=os.path.join("benchmarks", "results", "capture_formats.json"),
+        help="JSON results file",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.clip:
+        clip = ensure_clip(width=args.width, height=args.height, frames=args.frames)
+        sources = {
+            "clip": CameraHandler(
+                clip, frame_width=args.width, frame_height=args.height
+            )
+        }
+    else:
+        sources = {
+            fourcc: CameraHandler(
+                args.camera_id,
+                frame_width=args.width,
+                frame_height=args.height,
+                fps=args.fps,
+                fourcc=fourcc,
+                buffer_size=args.buffer_size,
+            )
+            for fourcc in args.formats.split(",")
+        }
+
+    results = {}
+    for name, camera in sources.items():
+        for label, entry in bench_source(camera, args).items():
+            results[f"capture/{name}/{label}"] = entry
+
+    write_results(args.output, results)
+    print(format_table(results))
+    for name, entry in sorted(results.items()):
+        if "negotiated" in entry:
+            print(
+                f"{name}: decoded {entry['decoded']} of {entry['frames']} frames, "
+                f"settings {entry['negotiated']}"
+            )
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Compare two benchmark result files and flag latency regressions.
+
+Exits with status 1 if any stage in the current run is slower than the
+baseline by more than the allowed threshold.
+"""
+
+import argparse
+import json
+import sys
+
+
+def load_results(path: str) -> dict:
+    """Load the ``results`` section of a benchmark JSON file."""
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def compare(baseline: dict, current: dict, metric: str, threshold: float, min_ms):
+    """Yield (benchmark, stage, old, new, ratio, regressed) tuples."""
+    for name, entry in sorted(current.items()):
+        old_entry = baseline.get(name, {})
+        for stage, stats in entry.get("stages", {}).items():
+            old = old_entry.get("stages", {}).get(stage, {}).get(metric)
+            new = stats.get(metric)
+            if old is None or new is None or old <= 0:
+                continue
+            ratio = new / old
+            regressed = ratio > 1.0 + threshold and new - old > min_ms
+            yield name, stage, old, new, ratio, regressed
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Compare benchmark results")
+    parser.add_argument("baseline", help="Baseline results JSON")
+    parser.add_argument("current", help="Current results JSON")
+    parser.add_argument(
+        "--metric",
+        default="p95_ms",
+        choices=["mean_ms", "p50_ms", "p95_ms", "p99_ms"],
+        help="Latency metric to compare (default: p95_ms)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Allowed relative slowdown before flagging (default: 0.10)",
+    )
+    parser.add_argument(
+        "--min-ms",
+        type=float,
+        default=0.05,
+        help="Ignore absolute differences below this many ms (default: 0.05)",
+    )
+    args = parser.parse_args()
+
+    rows = list(
+        compare(
+            load_results(args.baseline),
+            load_results(args.current),
+            args.metric,
+            args.threshold,
+            args.min_ms,
+        )
+    )
+    regressions = [row for row in rows if row[5]]
+    for name, stage, old, new, ratio, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        print(
+            f"{name:<32} {stage:<14} {old:>9.2f} -> {new:>9.2f} ms "
+            f"({ratio - 1.0:+.1%}) {flag}"
+        )
+
+    if regressions:
+        print(f"\n{len(regressions)} stage(s) regressed on {args.metric}")
+        sys.exit(1)
+    print(f"\nNo regressions on {args.metric}")
+
+
+if __name__ == "__main__":
+    main()
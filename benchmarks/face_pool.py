@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Face Detector Pool Benchmark
+Run several camera threads against one FaceDetectorPool and report frames
+and faces per second for each pool size, with and without splitting frames
+into horizontal bands.
+
+Usage:
+    python benchmarks/face_pool.py
+    python benchmarks/face_pool.py --cameras 8 --pool-sizes 1,2,4,8 --bands 1,4
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+import cv2
+
+from bench_utils import StageTimer, format_table, write_results
+from sources import render_faces
+
+# Add the parent directory to path so we can import src modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.face_detector_pool import FaceDetectorPool
+
+
+def bench_pool(size: int, bands: int, frames: list, args) -> dict:
+    """Feed ``frames`` from ``args.cameras`` threads through one pool.
+
+    Returns:
+        dict: Result entry with per-call latency, throughput and faces/sec
+    """
+    pool = FaceDetectorPool(size=size, bands=bands, overlap=args.overlap)
+    pool.detect_faces(frames[0])  # load and touch every lazy buffer once
+    timer = StageTimer()
+
+    def camera(offset: int):
+        for index in range(args.frames):
+            frame = frames[(offset + index) % len(frames)]
+            with timer.time("detect"):
+                pool.detect_faces(frame)
+
+    threads = [
+        threading.Thread(target=camera, args=(offset,))
+        for offset in range(args.cameras)
+    ]
+    faces_before = pool.stats()["faces"]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+    stats = pool.stats()
+    pool.close()
+
+    entry = timer.summary(args.cameras * args.frames, wall)
+    entry["faces_per_s"] = (stats["faces"] - faces_before) / wall
+    entry["mean_wait_ms"] = stats["mean_wait_ms"]
+    return entry
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Face detector pool benchmark")
+    parser.add_argument(
+        "--cameras", type=int, default=4, help="Threads submitting frames"
+    )
+    parser.add_argument(
+        "--frames", type=int, default=10, help="Frames submitted per camera"
+    )
+    parser.add_argument(
+        "--pool-sizes", default="1,2,4", help="Comma-separated pool sizes"
+    )
+    parser.add_argument(
+        "--bands", default="1,4", help="Comma-separated bands per frame (1: none)"
+    )
+    parser.add_argument(
+        "--overlap", type=int, default=96, help="Rows shared by neighbouring bands"
+    )
+    parser.add_argument("--width", type=int, default=1280, help="Frame width")
+    parser.add_argument("--height", type=int, default=720, help="Frame height")
+    parser.add_argument(
+        "--cv-threads",
+        type=int,
+        default=1,
+        help="cv2.setNumThreads() for each detectMultiScale call; 1 isolates "
+        "the pool's own parallelism",
+    )
+    parser.add_argument(
+        "--output",
+        default=os.path.join("benchmarks", "results", "face_pool.json"),
+        help="JSON results file",
+    )
+    args = parser.parse_args()
+
+    cv2.setNumThreads(args.cv_threads)
+    frames = [render_faces(index * 5, args.width, args.height) for index in range(8)]
+
+    results = {}
+    for bands in (int(value) for value in args.bands.split(",")):
+        baseline = None
+        for size in (int(value) for value in args.pool_sizes.split(",")):
+            entry = bench_pool(size, bands, frames, args)
+            baseline = baseline or entry["throughput_fps"]
+            entry["speedup"] = entry["throughput_fps"] / baseline
+            results[f"face_pool/bands{bands}/size{size}"] = entry
+
+    write_results(args.output, results)
+    print(format_table(results))
+    print()
+    for name, entry in sorted(results.items()):
+        print(
+            f"{name:<32} {entry['faces_per_s']:>8.1f} faces/s "
+            f"({entry['speedup']:.2f}x, waited {entry['mean_wait_ms']:.1f} ms/search)"
+        )
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+INT8 Quantization Report
+Build (or reuse) the INT8 model, run it and the FP32 ONNX model on the same
+frames, and report how closely INT8 reproduces FP32 detections together
+with the CPU speedup.
+
+Usage:
+    python benchmarks/quantization_report.py --mode static \\
+        --calibration-dir samples/calib --eval-dir samples/eval
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+
+import cv2
+
+from bench_utils import environment_info
+
+# Add the parent directory to path so we can import src modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.object_detector import ObjectDetector
+from src.quantization import compare_detectors, list_frames
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="INT8 vs FP32 accuracy report")
+    parser.add_argument("--model-path", default="yolov8n.pt", help="YOLO model")
+    parser.add_argument("--mode", default="static", choices=["dynamic", "static"])
+    parser.add_argument("--calibration-dir", help="Frames for static calibration")
+    parser.add_argument(
+        "--eval-dir", help="Frames to compare on (default: calibration dir)"
+    )
+    parser.add_argument("--limit", type=int, default=200, help="Max eval frames")
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--confidence", type=float, default=0.25)
+    parser.add_argument("--iou", type=float, default=0.5, help="Match IoU")
+    parser.add_argument("--cache-dir", help="Model cache directory")
+    parser.add_argument(
+        "--output",
+        default=os.path.join("benchmarks", "results", "quantization.json"),
+        help="JSON report file",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    eval_dir = args.eval_dir or args.calibration_dir
+    if not eval_dir:
+        parser.error("--eval-dir or --calibration-dir is required")
+    frames = [cv2.imread(path) for path in list_frames(eval_dir, args.limit)]
+    frames = [frame for frame in frames if frame is not None]
+    if not frames:
+        parser.error(f"No readable frames in {eval_dir}")
+
+    common = dict(
+        confidence_threshold=args.confidence,
+        device="cpu",
+        imgsz=args.imgsz,
+        cache_dir=args.cache_dir,
+    )
+    fp32 = ObjectDetector(args.model_path, backend="onnx", **common)
+    int8 = ObjectDetector(
+        args.model_path,
+        quantization=args.mode,
+        calibration_dir=args.calibration_dir,
+        **common,
+    )
+    if not fp32.load_model() or not int8.load_model():
+        sys.exit(1)
+    fp32.warmup((frames[0].shape[1], frames[0].shape[0]))
+    int8.warmup((frames[0].shape[1], frames[0].shape[0]))
+
+    report = compare_detectors(
+        fp32.detect_objects, int8.detect_objects, frames, args.iou
+    )
+    report.update(model=args.model_path, mode=args.mode, imgsz=args.imgsz)
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump({"environment": environment_info(), "report": report}, f, indent=2)
+
+    print(f"Frames:      {report['frames']}")
+    print(f"Precision:   {report['precision']:.3f} (INT8 boxes confirmed by FP32)")
+    print(f"Recall:      {report['recall']:.3f} (FP32 boxes kept by INT8)")
+    print(f"F1:          {report['f1']:.3f}, mean IoU {report['mean_iou']:.3f}")
+    print(
+        f"Latency:     FP32 {report['reference_latency_ms']:.1f} ms, "
+        f"INT8 {report['candidate_latency_ms']:.1f} ms "
+        f"({report['speedup']:.2f}x)"
+    )
+    print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+Time each pipeline stage (capture, preprocessing, inference, decode, drawing,
+encoding) for ObjectDetector, FaceDetector and the full SmartDetectionApp
+loop, using synthetic frames or a short generated clip - no camera needed.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output benchmarks/results/run.json
+    python benchmarks/compare.py baseline.json benchmarks/results/run.json
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+import cv2
+
+from bench_utils import StageTimer, format_table, write_results
+from sources import SyntheticCameraHandler, ensure_clip
+
+# Add the parent directory to path so we can import src modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.camera_handler import CameraHandler
+from src.face_detector import FaceDetector
+
+TARGETS = ("object", "face", "app")
+SOURCES = ("synthetic", "clip")
+
+
+def make_handler(source: str, width: int, height: int, frames: int):
+    """Create a camera handler for the requested frame source."""
+    if source == "synthetic":
+        return SyntheticCameraHandler(width, height, num_frames=frames)
+    if source == "clip":
+        return CameraHandler(camera_id=ensure_clip())
+    raise ValueError(f"Unknown source: {source}")
+
+
+def read_frame(handler, rewind: bool = True):
+    """Read a pooled frame, rewinding file sources at end of stream."""
+    ret, pooled = handler.read_pooled_frame()
+    if not ret and rewind:
+        handler.release()
+        handler.initialize_camera()
+        ret, pooled = handler.read_pooled_frame()
+    return ret, pooled
+
+
+def measure(handler, process, frames: int, warmup: int) -> dict:
+    """Run ``process(frame, timer)`` over frames from ``handler``.
+
+    Args:
+        handler: Initialized frame source
+        process: Callable timing its own stages on the given StageTimer
+        frames: Number of measured frames
+        warmup: Number of unmeasured frames run first
+
+    Returns:
+        dict: Benchmark result entry
+    """
+    if not handler.initialize_camera():
+        return {"skipped": "frame source could not be opened"}
+
+    try:
+        for _ in range(warmup):
+            ret, pooled = read_frame(handler)
+            if not ret:
+                break
+            with pooled as frame:
+                process(frame, StageTimer())
+
+        timer = StageTimer()
+        processed = 0
+        start = time.perf_counter()
+        while processed < frames:
+            loop_start = time.perf_counter()
+            with timer.time("capture"):
+                ret, pooled = read_frame(handler)
+            if not ret:
+                break
+            with pooled as frame:
+                process(frame, timer)
+            timer.add("loop", time.perf_counter() - loop_start)
+            processed += 1
+        return timer.summary(processed, time.perf_counter() - start)
+    finally:
+        handler.release()
+
+
+def encode(frame, timer: StageTimer):
+    """Time JPEG encoding of the annotated frame."""
+    with timer.time("encode"):
+        cv2.imencode(".jpg", frame)
+
+
+def bench_object_detector(handler, args) -> dict:
+    """Benchmark ObjectDetector stage by stage."""
+    try:
+        from src.object_detector import ObjectDetector
+    except ImportError as e:
+        return {"skipped": f"object detection dependencies missing: {e}"}
+
+    detector = ObjectDetector(args.model_path, args.confidence)
+    if not detector.load_model():
+        return {"skipped": f"could not load {args.model_path}"}
+
+    def process(frame, timer):
+        with timer.time("predict"):
+            results = detector.predict(frame)
+        # Ultralytics reports its internal stages in milliseconds
+        speed = results[0].speed if results else {}
+        for stage in ("preprocess", "inference", "postprocess"):
+            if speed.get(stage) is not None:
+                timer.add(stage, speed[stage] / 1000.0)
+        with timer.time("decode"):
+            detections = detector.decode_results(results)
+        with timer.time("draw"):
+            detector.draw_detections(frame, detections)
+        encode(frame, timer)
+
+    return measure(handler, process, args.frames, args.warmup)
+
+
+def bench_face_detector(handler, args) -> dict:
+    """Benchmark FaceDetector stage by stage."""
+    detector = FaceDetector()
+
+    def process(frame, timer):
+        with timer.time("preprocess"):
+            gray = detector.preprocess(frame)
+        with timer.time("inference"):
+            faces = detector.detect_faces_gray(gray)
+        with timer.time("decode"):
+            detections = detector.decode_faces(faces)
+        with timer.time("draw"):
+            detector.draw_faces(frame, detections)
+        encode(frame, timer)
+
+    return measure(handler, process, args.frames, args.warmup)
+
+
+def bench_app(handler, args) -> dict:
+    """Benchmark the full SmartDetectionApp loop without a display."""
+    try:
+        from src.smart_detection_app import SmartDetectionApp
+    except ImportError as e:
+        return {"skipped": f"object detection dependencies missing: {e}"}
+
+    app = SmartDetectionApp(
+        model_path=args.model_path, confidence_threshold=args.confidence
+    )
+    app.camera_handler = handler
+    timer = StageTimer()
+    marks = []
+    read_pooled_frame = handler.read_pooled_frame
+
+    def timed_read():
+        now = time.perf_counter()
+        if marks:
+            timer.add("loop", now - marks[-1])
+        marks.append(now)
+        if len(marks) > args.frames + args.warmup:
+            return False, None
+        with timer.time("capture"):
+            return read_pooled_frame()
+
+    handler.read_pooled_frame = timed_read
+    app.run(display_window=False)
+
+    if len(marks) <= args.warmup + 1:
+        return {"skipped": "application failed to initialize"}
+
+    # Drop warm-up iterations from every stage
+    for stage in timer.samples:
+        timer.samples[stage] = timer.samples[stage][args.warmup :]
+    processed = len(timer.samples["loop"])
+    return timer.summary(processed, marks[-1] - marks[args.warmup])
+
+
+BENCHMARKS = {
+    "object": bench_object_detector,
+    "face": bench_face_detector,
+    "app": bench_app,
+}
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Camera-free benchmark suite")
+    parser.add_argument(
+        "--targets",
+        default=",".join(TARGETS),
+        help="Comma-separated benchmarks to run (default: object,face,app)",
+    )
+    parser.add_argument(
+        "--sources",
+        default=",".join(SOURCES),
+        help="Comma-separated frame sources (default: synthetic,clip)",
+    )
+    parser.add_argument("--frames", type=int, default=200, help="Measured frames")
+    parser.add_argument("--warmup", type=int, default=10, help="Warm-up frames")
+    parser.add_argument("--width", type=int, default=640, help="Synthetic width")
+    parser.add_argument("--height", type=int, default=480, help="Synthetic height")
+    parser.add_argument("--model-path", default="yolov8n.pt", help="YOLO model")
+    parser.add_argument("--confidence", type=float, default=0.5)
+    parser.add_argument(
+        "--output",
+        default=os.path.join("benchmarks", "results", "latest.json"),
+        help="JSON results file",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    results = {}
+    for target in args.targets.split(","):
+        for source in args.sources.split(","):
+            name = f"{target}/{source}"
+            print(f"Running {name}...", flush=True)
+            handler = make_handler(
+                source, args.width, args.height, args.frames + args.warmup + 1
+            )
+            results[name] = BENCHMARKS[target](handler, args)
+
+    write_results(args.output, results)
+    print()
+    print(format_table(results))
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
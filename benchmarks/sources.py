@@ -0,0 +1,196 @@
+"""
+Camera-free frame sources for benchmarks: synthetic frames and a short clip.
+"""
+
+import os
+import sys
+
+import cv2
+import numpy as np
+
+# Add the parent directory to path so we can import src modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.camera_handler import CameraHandler
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DEFAULT_CLIP = os.path.join(DATA_DIR, "synthetic_clip.avi")
+
+
+def render_scene(index: int, width: int, height: int) -> np.ndarray:
+    """Render a deterministic scene of moving shapes.
+
+    Args:
+        index: Frame index, drives the object positions
+        width: Frame width
+        height: Frame height
+
+    Returns:
+        BGR frame
+    """
+    frame = np.full((height, width, 3), 40, dtype=np.uint8)
+    cv2.rectangle(frame, (0, height * 2 // 3), (width, height), (70, 90, 70), -1)
+    for k in range(6):
+        x = int((index * (3 + k) + k * width / 6) % width)
+        y = int(height / 4 + k * height / 10)
+        size = 20 + 8 * k
+        color = (60 + 30 * k, 200 - 25 * k, 120 + 20 * k)
+        cv2.rectangle(frame, (x, y), (x + size, y + 2 * size), color, -1)
+        cv2.circle(frame, (x + size // 2, y - size // 2), size // 2, color, -1)
+    return frame
+
+
+def draw_face(frame: np.ndarray, x: int, y: int, size: int):
+    """Draw a cartoon face the frontal Haar cascade accepts, in place.
+
+    Args:
+        frame: BGR frame
+        x: Left edge of the face
+        y: Top edge of the face
+        size: Face width and height
+    """
+    face = np.full((size, size), 90, dtype=np.uint8)
+    center = size // 2
+    axes = (int(size * 0.38), int(size * 0.48))
+    cv2.ellipse(face, (center, center), axes, 0, 0, 360, 200, -1)
+    for eye in (0.33, 0.67):
+        eye_center = (int(size * eye), int(size * 0.42))
+        eye_axes = (int(size * 0.09), int(size * 0.05))
+        cv2.ellipse(face, eye_center, eye_axes, 0, 0, 360, 40, -1)
+        brow = int(size * 0.33)
+        start, end = int(size * (eye - 0.12)), int(size * (eye + 0.12))
+        cv2.line(face, (start, brow), (end, brow), 60, max(1, size // 30))
+    nose_top, nose_bottom = int(size * 0.45), int(size * 0.62)
+    cv2.line(face, (center, nose_top), (center, nose_bottom), 170, max(1, size // 25))
+    mouth = (center, int(size * 0.75))
+    cv2.ellipse(face, mouth, (int(size * 0.14), int(size * 0.04)), 0, 0, 360, 70, -1)
+    face = cv2.GaussianBlur(face, (0, 0), size / 60)
+    bottom, right = y + size, x + size
+    frame[y:bottom, x:right] = cv2.cvtColor(face, cv2.COLOR_GRAY2BGR)
+
+
+def render_faces(index: int, width: int, height: int, count: int = 6) -> np.ndarray:
+    """Render a scene of moving shapes with ``count`` faces of varied size.
+
+    Args:
+        index: Frame index, drives the object and face positions
+        width: Frame width
+        height: Frame height
+        count: Number of faces
+
+    Returns:
+        BGR frame
+    """
+    frame = render_scene(index, width, height)
+    for k in range(count):
+        size = min(40 + 24 * k, width // 2, height // 2)
+        x = int((index * (2 + k) + k * width / count) % (width - size))
+        y = int((k * height / count + index * 3) % (height - size))
+        draw_face(frame, x, y, size)
+    return frame
+
+
+class SyntheticCapture:
+    """Minimal stand-in for cv2.VideoCapture that replays rendered frames."""
+
+    def __init__(
+        self, width: int = 640, height: int = 480, num_frames: int = 300, fps=30
+    ):
+        """Pre-render a short cycle of frames.
+
+        Args:
+            width: Frame width
+            height: Frame height
+            num_frames: Frames delivered before reporting end of stream
+            fps: Reported frame rate
+        """
+        self.width = width
+        self.height = height
+        self.num_frames = num_frames
+        self.fps = fps
+        self.frames = [render_scene(i, width, height) for i in range(30)]
+        self.position = 0
+        self.opened = True
+
+    def isOpened(self) -> bool:
+        return self.opened
+
+    def grab(self) -> bool:
+        if not self.opened or self.position >= self.num_frames:
+            return False
+        self.position += 1
+        return True
+
+    def retrieve(self, image=None):
+        if self.position == 0:
+            return False, None
+        source = self.frames[(self.position - 1) % len(self.frames)]
+        if image is not None and image.shape == source.shape:
+            np.copyto(image, source)
+            return True, image
+        return True, source.copy()
+
+    def read(self, image=None):
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+
+    def get(self, prop):
+        return {
+            cv2.CAP_PROP_FRAME_WIDTH: self.width,
+            cv2.CAP_PROP_FRAME_HEIGHT: self.height,
+            cv2.CAP_PROP_FPS: self.fps,
+            cv2.CAP_PROP_FRAME_COUNT: self.num_frames,
+            cv2.CAP_PROP_POS_FRAMES: self.position,
+        }.get(prop, 0)
+
+    def set(self, prop, value) -> bool:
+        return False
+
+    def release(self):
+        self.opened = False
+
+
+class SyntheticCameraHandler(CameraHandler):
+    """CameraHandler backed by SyntheticCapture instead of a device."""
+
+    def __init__(self, width: int = 640, height: int = 480, num_frames: int = 300):
+        super().__init__(camera_id="synthetic")
+        self.width = width
+        self.height = height
+        self.num_frames = num_frames
+
+    def initialize_camera(self) -> bool:
+        self.cap = SyntheticCapture(self.width, self.height, self.num_frames)
+        self.is_opened = True
+        return True
+
+
+def ensure_clip(
+    path: str = DEFAULT_CLIP, width: int = 640, height: int = 480, frames: int = 90
+) -> str:
+    """Create the short benchmark clip if it does not exist yet.
+
+    The clip is generated deterministically rather than stored in git, so
+    every checkout benchmarks against identical content.
+
+    Args:
+        path: Clip location
+        width: Frame width
+        height: Frame height
+        frames: Number of frames to write
+
+    Returns:
+        str: Path to the clip
+    """
+    if os.path.exists(path):
+        return path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (width, height))
+    if not writer.isOpened():
+        raise RuntimeError(f"Cannot create benchmark clip at {path}")
+    for i in range(frames):
+        writer.write(render_scene(i, width, height))
+    writer.release()
+    return path
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Startup-time Benchmark
+Measure how long the CLI takes to answer --help, how long the application
+modules take to import, and how long the YOLO model takes to load, warm
+up and serve its first frame.
+
+Usage:
+    python benchmarks/startup.py --output benchmarks/results/startup.json
+"""
+
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from bench_utils import format_table, summarize, write_results
+
+# Add the parent directory to path so we can import src modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); "
+    "import src.smart_detection_app; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def time_subprocess(command, runs: int) -> list:
+    """Wall time of a fresh interpreter running ``command``, ``runs`` times."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            command,
+            cwd=parent_dir,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def time_import(runs: int) -> list:
+    """In-interpreter import time of the application module."""
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET],
+            cwd=parent_dir,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        try:
+            samples.append(float(output.stdout.strip()))
+        except ValueError:
+            pass
+    return samples
+
+
+def bench_model(model_path: str, width: int, height: int, warmup: int) -> dict:
+    """Time model load, warm-up and first-frame latency cold vs warm."""
+    from src.object_detector import ObjectDetector
+
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    stages = {}
+
+    for label, warmup_frames in (("cold", 0), ("warm", warmup)):
+        detector = ObjectDetector(model_path)
+        start = time.perf_counter()
+        if not detector.load_model():
+            return {"skipped": f"could not load {model_path}"}
+        stages.setdefault("load", []).append(time.perf_counter() - start)
+        if warmup_frames:
+            stages["warmup"] = [detector.warmup((width, height), warmup_frames)]
+        start = time.perf_counter()
+        detector.detect_objects(frame)
+        stages[f"first_frame_{label}"] = [time.perf_counter() - start]
+
+    return {"stages": {stage: summarize(values) for stage, values in stages.items()}}
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Startup-time benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measurement")
+    parser.add_argument("--model-path", default="yolov8n.pt", help="YOLO model")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--warmup-frames", type=int, default=2)
+    parser.add_argument(
+        "--output",
+        default=os.path.join("benchmarks", "results", "startup.json"),
+        help="JSON results file",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    results = {
+        "startup/cli_help": {
+            "stages": {
+                "help": summarize(
+                    time_subprocess([sys.executable, "main.py", "--help"], args.runs)
+                )
+            }
+        },
+        "startup/import": {"stages": {"import": summarize(time_import(args.runs))}},
+    }
+    try:
+        results["startup/model"] = bench_model(
+            args.model_path, args.width, args.height, args.warmup_frames
+        )
+    except ImportError as e:
+        results["startup/model"] = {"skipped": f"dependencies missing: {e}"}
+
+    write_results(args.output, results)
+    print(format_table(results))
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
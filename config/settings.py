@@ -5,7 +5,11 @@ CAMERA_SETTINGS = {
     'default_camera_id': 0,
     'frame_width': 640,
     'frame_height': 480,
-    'fps': 30
+    'fps': 30,
+    # Pixel format: None (driver default), 'MJPG' or 'YUYV'
+    'fourcc': None,
+    # Driver frame buffer; 1 always delivers the newest frame
+    'buffer_size': None
 }
 
 # Detection model settings
@@ -18,7 +22,105 @@ MODEL_SETTINGS = {
         'yolov8m.pt',  # Medium
         'yolov8l.pt',  # Large
         'yolov8x.pt'   # Extra Large - most accurate
-    ]
+    ],
+    # 'pytorch' runs the .pt file; 'torchscript'/'onnx' use cached exports
+    'backend': 'pytorch',
+    'imgsz': 640,
+    'cache_dir': '~/.cache/webcam-smartdet/models',
+    # INT8 CPU inference: None, 'dynamic' or 'static' (needs calibration_dir)
+    'quantization': None,
+    'calibration_dir': None,
+    # Class filters by name or id, e.g. ['person', 'car']; None means all
+    'classes': None,
+    'exclude_classes': [],
+    # Per-class confidence thresholds, e.g. {'person': 0.6}
+    'class_thresholds': {},
+    # SQLite file of cached detections for re-processing recordings
+    'detection_cache': None
+}
+
+# Tiled inference for high-resolution cameras
+TILING_SETTINGS = {
+    'tile_size': 640,
+    # Minimum overlap between neighbouring tiles, as a fraction of a tile
+    'overlap': 0.2,
+    # Motion-based tile skipping
+    'motion_threshold': 25,
+    'min_changed_fraction': 0.002,
+    'refresh_interval': 30
+}
+
+# Live MJPEG preview over HTTP
+STREAM_SETTINGS = {
+    'host': '127.0.0.1',
+    'jpeg_quality': 80,
+    # Preview size relative to the captured frame
+    'scale': 1.0,
+    'max_fps': None
+}
+
+# Zone occupancy and line-crossing counts
+ANALYTICS_SETTINGS = {
+    # JSON file of zones and tripwires, optionally per camera
+    'config': None,
+    # Box point tested against zones and lines: 'bottom' or 'center'
+    'anchor': 'bottom',
+    # Largest movement between processed frames still linked to an object
+    'max_distance': 80,
+    'max_missed': 5
+}
+
+# Dwell-time heatmap
+HEATMAP_SETTINGS = {
+    # Frame pixels per heatmap cell
+    'cell_size': 8,
+    # Seconds for accumulated time to fade by half; None keeps everything
+    'half_life': 300.0,
+    'snapshot_interval': 60.0,
+    'classes': ['person'],
+    'overlay_alpha': 0.4
+}
+
+# Rolling per-class statistics written to the log
+STATS_SETTINGS = {
+    # Window lengths in seconds: 1 minute, 5 minutes, 1 hour
+    'windows': [60, 300, 3600],
+    # Buckets per window; windows slide in steps of length / buckets
+    'buckets': 60,
+    'log_interval': 60.0
+}
+
+# Privacy redaction of displayed, streamed and recorded frames
+REDACTION_SETTINGS = {
+    'classes': ['person', 'face'],
+    # Top fraction of person boxes redacted, where the head is; None for
+    # the whole person
+    'head_fraction': 0.3,
+    # Growth of each box per side, relative to its size
+    'margin': 0.1,
+    # Cells across a redacted region; lower is coarser
+    'cells': 8,
+    # Frames a region stays redacted after its last detection
+    'hold_frames': 10
+}
+
+# Thumbnails of significant detections for review
+SNAPSHOT_SETTINGS = {
+    'min_confidence': 0.6,
+    # Smallest box side worth a thumbnail, in pixels
+    'min_size': 32,
+    # Longer side of a thumbnail
+    'max_side': 256,
+    'quality': 85,
+    'workers': 2,
+    # Crops waiting to be encoded; more are dropped
+    'max_queue_mb': 32,
+    # Oldest snapshots are deleted above this size
+    'max_mb': 512,
+    # Skip a snapshot within this many dHash bits of one of the same
+    # object taken in the last dedup_window seconds
+    'dedup_distance': 6,
+    'dedup_window': 30.0
 }
 
 # Output settings
@@ -2,10 +2,18 @@
 """
 Combined Detection Demo
 Demonstrates both object detection (YOLO) and face detection working together.
+Several cameras can run at once; their face detection shares one
+FaceDetectorPool.
+
+Usage:
+    python examples/combined_detection_demo.py
+    python examples/combined_detection_demo.py --cameras 0,1 --bands 4
 """
 
+import argparse
 import cv2
 import logging
+import threading
 import sys
 import os
 
@@ -15,88 +23,131 @@ sys.path.insert(0, parent_dir)
 
 from src.camera_handler import CameraHandler
 from src.object_detector import ObjectDetector
-from src.face_detector import FaceDetector
+from src.face_detector_pool import FaceDetectorPool
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def combined_detection_demo():
-    """Run combined object and face detection demo."""
-    logger.info("Starting combined detection demo...")
-    
-    # Initialize components
-    camera = CameraHandler(camera_id=0)
+def camera_worker(camera_id, face_pool, latest, stop_event):
+    """Capture, detect and annotate frames of one camera until stopped."""
+    camera = CameraHandler(camera_id=camera_id)
     object_detector = ObjectDetector(model_path="yolov8n.pt", confidence_threshold=0.5)
-    face_detector = FaceDetector()
-    
+
     # Initialize camera
     if not camera.initialize_camera():
-        logger.error("Failed to initialize camera")
+        logger.error(f"Failed to initialize camera {camera_id}")
         return
-    
-    # Load YOLO model
+
+    # Load YOLO model (one per camera; the YOLO model is not shared)
     if not object_detector.load_model():
         logger.error("Failed to load YOLO model")
         camera.release()
         return
-    
-    logger.info("Combined detection demo initialized successfully. Press 'q' to quit.")
-    
+
     try:
         frame_count = 0
-        while True:
+        while not stop_event.is_set():
             # Read frame from camera
             ret, frame = camera.read_frame()
             if not ret:
-                logger.warning("Failed to read frame from camera")
+                logger.warning(f"Failed to read frame from camera {camera_id}")
                 break
-            
+
             # Detect objects with YOLO (every 5 frames for performance)
             objects = []
             if frame_count % 5 == 0:
                 objects = object_detector.detect_objects(frame)
                 if objects:
                     frame = object_detector.draw_detections(frame, objects)
-            
-            # Detect faces (every frame for responsiveness)
-            faces = face_detector.detect_faces(frame)
+
+            # Detect faces (every frame for responsiveness) on a pooled cascade
+            faces = face_pool.detect_faces(frame)
             if faces:
-                frame = face_detector.draw_faces(frame, faces)
-            
+                frame = face_pool.draw_faces(frame, faces)
+
             # Add statistics
             stats_y = 30
-            cv2.putText(frame, f'Objects: {len(objects)}', (10, stats_y), 
+            cv2.putText(frame, f'Objects: {len(objects)}', (10, stats_y),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-            cv2.putText(frame, f'Faces: {len(faces)}', (10, stats_y + 25), 
+            cv2.putText(frame, f'Faces: {len(faces)}', (10, stats_y + 25),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 0), 2)
-            cv2.putText(frame, 'Press Q to quit', (10, frame.shape[0] - 20), 
+            cv2.putText(frame, 'Press Q to quit', (10, frame.shape[0] - 20),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-            
-            # Display frame
-            cv2.imshow('Combined Detection Demo', frame)
-            
-            # Check for quit
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord('q') or key == 27:  # 'q' or ESC
-                break
-            
+
+            # Windows are shown by the main thread
+            latest[camera_id] = frame
             frame_count += 1
-            
+
             # Log status every 30 frames
             if frame_count % 30 == 0:
-                logger.info(f"Frame {frame_count}: {len(objects)} objects, {len(faces)} faces")
-    
+                logger.info(f"Camera {camera_id} frame {frame_count}: "
+                            f"{len(objects)} objects, {len(faces)} faces")
+
+    finally:
+        camera.release()
+
+
+def combined_detection_demo(camera_ids, pool_size=None, bands=1):
+    """Run combined object and face detection demo."""
+    logger.info("Starting combined detection demo...")
+
+    # One cascade per camera by default; they are never shared between threads
+    face_pool = FaceDetectorPool(size=pool_size or len(camera_ids), bands=bands)
+    latest = {}
+    stop_event = threading.Event()
+    workers = [
+        threading.Thread(target=camera_worker,
+                         args=(camera_id, face_pool, latest, stop_event),
+                         daemon=True)
+        for camera_id in camera_ids
+    ]
+    for worker in workers:
+        worker.start()
+
+    logger.info("Combined detection demo initialized successfully. Press 'q' to quit.")
+
+    try:
+        while any(worker.is_alive() for worker in workers):
+            # Display the newest frame of every camera
+            for camera_id, frame in list(latest.items()):
+                cv2.imshow(f'Combined Detection Demo - camera {camera_id}', frame)
+
+            # Check for quit
+            key = cv2.waitKey(10) & 0xFF
+            if key == ord('q') or key == 27:  # 'q' or ESC
+                break
+
     except KeyboardInterrupt:
         logger.info("Demo interrupted by user")
-    
+
     finally:
         # Cleanup
-        camera.release()
+        stop_event.set()
+        for worker in workers:
+            worker.join(timeout=5)
+        face_pool.close()
         cv2.destroyAllWindows()
-        logger.info("Combined detection demo finished")
+        logger.info(f"Combined detection demo finished: {face_pool.stats()}")
+
+
+def main():
+    """Parse arguments and run the demo."""
+    parser = argparse.ArgumentParser(description="Combined object and face detection")
+    parser.add_argument("--cameras", default="0",
+                        help="Comma-separated camera IDs (default: 0)")
+    parser.add_argument("--pool-size", type=int,
+                        help="Face cascades shared by the cameras "
+                             "(default: one per camera)")
+    parser.add_argument("--bands", type=int, default=1,
+                        help="Split frames into this many overlapping bands "
+                             "for face detection (default: 1)")
+    args = parser.parse_args()
+
+    camera_ids = [int(value) for value in args.cameras.split(",")]
+    combined_detection_demo(camera_ids, args.pool_size, args.bands)
 
 
 if __name__ == "__main__":
-    combined_detection_demo()
+    main()
@@ -37,10 +37,8 @@ def test_model_performance(model_path: str, test_frames: int = 100):
     
     # Warm up (first few predictions are slower)
     print("🔥 Warming up model...")
-    for _ in range(5):
-        ret, frame = camera.read_frame()
-        if ret:
-            detector.detect_objects(frame)
+    camera_info = camera.get_camera_info()
+    detector.warmup((camera_info.get("width", 640), camera_info.get("height", 480)), 5)
     
     # Performance test
     print(f"⏱️ Testing performance over {test_frames} frames...")
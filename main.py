@@ -11,7 +11,19 @@ import os
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
 
-from src.smart_detection_app import SmartDetectionApp
+from config.settings import (
+    ANALYTICS_SETTINGS,
+    CAMERA_SETTINGS,
+    HEATMAP_SETTINGS,
+    MODEL_SETTINGS,
+    REDACTION_SETTINGS,
+    SNAPSHOT_SETTINGS,
+    STATS_SETTINGS,
+    STREAM_SETTINGS,
+    TILING_SETTINGS,
+)
+from src.profiling import SignalProfiler, TraceRecorder
+from src.result_sinks import create_sink
 
 
 def setup_logging(log_level: str = "INFO"):
@@ -29,6 +41,52 @@ def main():
     parser.add_argument(
         "--camera-id", type=int, default=0, help="Camera device ID (default: 0)"
     )
+    parser.add_argument(
+        "--width",
+        type=int,
+        default=CAMERA_SETTINGS["frame_width"],
+        help=f"Capture width (default: {CAMERA_SETTINGS['frame_width']})",
+    )
+    parser.add_argument(
+        "--height",
+        type=int,
+        default=CAMERA_SETTINGS["frame_height"],
+        help=f"Capture height (default: {CAMERA_SETTINGS['frame_height']})",
+    )
+    parser.add_argument(
+        "--fps",
+        type=int,
+        default=CAMERA_SETTINGS["fps"],
+        help=f"Capture frame rate (default: {CAMERA_SETTINGS['fps']})",
+    )
+    parser.add_argument(
+        "--fourcc",
+        type=str,
+        default=CAMERA_SETTINGS["fourcc"],
+        choices=["MJPG", "YUYV"],
+        help="Camera pixel format; MJPG allows higher resolutions and rates "
+        "over USB (default: driver choice)",
+    )
+    parser.add_argument(
+        "--buffer-size",
+        type=int,
+        default=CAMERA_SETTINGS["buffer_size"],
+        help="Frames buffered by the camera driver; 1 minimises latency",
+    )
+    parser.add_argument(
+        "--process-every",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Detect on every Nth frame; skipped frames are not decoded "
+        "(default: 1)",
+    )
+    parser.add_argument(
+        "--reconnect-timeout",
+        type=float,
+        help="Seconds to keep trying to reopen a lost camera before exiting "
+        "(default: retry until stopped)",
+    )
     parser.add_argument(
         "--model-path",
         type=str,
@@ -45,6 +103,254 @@ def main():
         "--no-display", action="store_true", help="Run without displaying video window"
     )
     parser.add_argument("--save-output", type=str, help="Path to save output video")
+    parser.add_argument(
+        "--backend",
+        type=str,
+        default=MODEL_SETTINGS["backend"],
+        choices=["pytorch", "torchscript", "onnx"],
+        help="Inference backend; exported backends are cached on disk "
+        f"(default: {MODEL_SETTINGS['backend']})",
+    )
+    parser.add_argument(
+        "--imgsz",
+        type=int,
+        default=MODEL_SETTINGS["imgsz"],
+        help=f"Inference input size (default: {MODEL_SETTINGS['imgsz']})",
+    )
+    parser.add_argument(
+        "--half", action="store_true", help="Use FP16 exported models on GPU"
+    )
+    parser.add_argument(
+        "--model-cache-dir",
+        type=str,
+        default=MODEL_SETTINGS["cache_dir"],
+        help="Directory for prepared model artifacts",
+    )
+    parser.add_argument(
+        "--detection-cache",
+        type=str,
+        default=MODEL_SETTINGS["detection_cache"],
+        metavar="PATH",
+        help="SQLite file caching detections per frame content and settings, "
+        "for re-processing recordings",
+    )
+    parser.add_argument(
+        "--quantize",
+        type=str,
+        default=MODEL_SETTINGS["quantization"],
+        choices=["dynamic", "static"],
+        help="Run an INT8-quantized ONNX model on CPU (static needs "
+        "--calibration-dir)",
+    )
+    parser.add_argument(
+        "--calibration-dir",
+        type=str,
+        default=MODEL_SETTINGS["calibration_dir"],
+        help="Folder of sample frames for static INT8 calibration",
+    )
+    parser.add_argument(
+        "--classes",
+        type=str,
+        metavar="NAMES",
+        help="Comma-separated classes to detect, by name or id (default: all)",
+    )
+    parser.add_argument(
+        "--exclude-classes",
+        type=str,
+        metavar="NAMES",
+        help="Comma-separated classes never to report, by name or id",
+    )
+    parser.add_argument(
+        "--class-conf",
+        type=str,
+        metavar="CLASS=CONF,...",
+        help="Per-class confidence thresholds, e.g. person=0.6,car=0.4",
+    )
+    parser.add_argument(
+        "--tile",
+        action="store_true",
+        help="Detect on overlapping tiles, for small objects in large frames",
+    )
+    parser.add_argument(
+        "--tile-size",
+        type=int,
+        default=TILING_SETTINGS["tile_size"],
+        help=f"Tile side in pixels (default: {TILING_SETTINGS['tile_size']})",
+    )
+    parser.add_argument(
+        "--tile-overlap",
+        type=float,
+        default=TILING_SETTINGS["overlap"],
+        help=f"Minimum tile overlap fraction (default: {TILING_SETTINGS['overlap']})",
+    )
+    parser.add_argument(
+        "--tile-motion",
+        action="store_true",
+        help="Skip tiles without motion and reuse their previous detections",
+    )
+    parser.add_argument(
+        "--tile-full-frame",
+        action="store_true",
+        help="Also detect on the whole frame, for objects larger than a tile",
+    )
+    parser.add_argument(
+        "--cascade-model",
+        type=str,
+        help="Accurate model to cascade with --model-path: switch to the fast "
+        "model when over the frame budget and back when there is headroom",
+    )
+    parser.add_argument(
+        "--frame-budget-ms",
+        type=float,
+        help="Detection time budget per frame for the cascade "
+        "(default: 1000 / camera FPS)",
+    )
+    parser.add_argument(
+        "--refine-band",
+        type=str,
+        metavar="LOW,HIGH",
+        help="Re-check fast-model boxes with confidence in [LOW, HIGH) using "
+        "the cascade model, e.g. 0.3,0.6",
+    )
+    parser.add_argument(
+        "--warmup-frames",
+        type=int,
+        default=2,
+        help="Dummy inferences run at startup before the first frame (default: 2)",
+    )
+    parser.add_argument(
+        "--analytics",
+        type=str,
+        default=ANALYTICS_SETTINGS["config"],
+        metavar="PATH",
+        help="JSON file of zones and tripwires; counts occupancy, entries, "
+        "exits and line crossings",
+    )
+    parser.add_argument(
+        "--zone-anchor",
+        type=str,
+        default=ANALYTICS_SETTINGS["anchor"],
+        choices=["bottom", "center"],
+        help="Box point tested against zones and lines (default: "
+        f"{ANALYTICS_SETTINGS['anchor']})",
+    )
+    parser.add_argument(
+        "--heatmap",
+        type=str,
+        metavar="PATH",
+        help="Accumulate where objects spend time and snapshot it here "
+        "(.npy for raw seconds, .png/.jpg for an image)",
+    )
+    parser.add_argument(
+        "--heatmap-overlay",
+        action="store_true",
+        help="Draw the heatmap over the displayed and streamed frames",
+    )
+    parser.add_argument(
+        "--stats-interval",
+        type=float,
+        default=STATS_SETTINGS["log_interval"],
+        metavar="SECONDS",
+        help="Log per-class counts, confidence and peaks over the last 1m/5m/1h, "
+        "and frame ages at each output, this often; 0 disables "
+        f"(default: {STATS_SETTINGS['log_interval']:g})",
+    )
+    parser.add_argument(
+        "--latency-target",
+        type=float,
+        metavar="MS",
+        help="Count frames older than this many milliseconds (from capture) "
+        "when they reach an output",
+    )
+    parser.add_argument(
+        "--redact",
+        type=str,
+        choices=["pixelate", "blur"],
+        help="Obscure people's heads in displayed, streamed and recorded frames",
+    )
+    parser.add_argument(
+        "--redact-faces",
+        action="store_true",
+        help="Also redact faces found by the OpenCV face detector (implies "
+        "--redact pixelate)",
+    )
+    parser.add_argument(
+        "--snapshots",
+        type=str,
+        metavar="DIR",
+        help="Store JPEG thumbnails of significant detections and an index in "
+        "this directory, capped at "
+        f"{SNAPSHOT_SETTINGS['max_mb']} MB (default: off)",
+    )
+    parser.add_argument(
+        "--stream-port",
+        type=int,
+        help="Serve annotated frames as an MJPEG live view on this port "
+        "(default: off)",
+    )
+    parser.add_argument(
+        "--stream-host",
+        type=str,
+        default=STREAM_SETTINGS["host"],
+        help=f"Interface for the live view (default: {STREAM_SETTINGS['host']})",
+    )
+    parser.add_argument(
+        "--stream-quality",
+        type=int,
+        default=STREAM_SETTINGS["jpeg_quality"],
+        help=f"Live view JPEG quality (default: {STREAM_SETTINGS['jpeg_quality']})",
+    )
+    parser.add_argument(
+        "--stream-scale",
+        type=float,
+        default=STREAM_SETTINGS["scale"],
+        help="Live view size relative to the frame, e.g. 0.5 "
+        f"(default: {STREAM_SETTINGS['scale']})",
+    )
+    parser.add_argument(
+        "--stream-max-fps",
+        type=float,
+        default=STREAM_SETTINGS["max_fps"],
+        help="Encode at most this many live view frames per second",
+    )
+    parser.add_argument(
+        "--sink",
+        action="append",
+        default=[],
+        metavar="KIND:TARGET",
+        help="Publish detections: jsonl:- (stdout), jsonl:FILE, msgpack:FILE, "
+        "unix:SOCKET or unix+msgpack:SOCKET; repeatable",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve Prometheus metrics on this port at /metrics (default: off)",
+    )
+    parser.add_argument(
+        "--metrics-host",
+        type=str,
+        default="127.0.0.1",
+        help="Interface for the metrics endpoint (default: 127.0.0.1)",
+    )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        metavar="TRACE_JSON",
+        help="Record per-frame stage spans and write a Chrome/Perfetto trace here",
+    )
+    parser.add_argument(
+        "--profile-window",
+        type=float,
+        metavar="SECONDS",
+        help="Profile for this many seconds whenever the process gets SIGUSR1",
+    )
+    parser.add_argument(
+        "--profile-mode",
+        type=str,
+        default="sample",
+        choices=SignalProfiler.MODES,
+        help="Signal profiler: stack sampling (py-spy folded) or cProfile",
+    )
     parser.add_argument(
         "--log-level",
         type=str,
@@ -54,22 +360,220 @@ def main():
     )
 
     args = parser.parse_args()
+    try:
+        sinks = [create_sink(spec) for spec in args.sink]
+    except ValueError as e:
+        parser.error(str(e))
+
+    cascade_options = {}
+    if args.frame_budget_ms:
+        cascade_options["frame_budget"] = args.frame_budget_ms / 1000.0
+    if args.refine_band:
+        try:
+            low, high = (float(value) for value in args.refine_band.split(","))
+        except ValueError:
+            parser.error(
+                f"--refine-band expects two numbers LOW,HIGH, got {args.refine_band}"
+            )
+        if not low < high:
+            parser.error(
+                f"--refine-band LOW must be below HIGH, got {args.refine_band}"
+            )
+        cascade_options["refine_band"] = (low, high)
+
+    classes = MODEL_SETTINGS["classes"]
+    if args.classes:
+        classes = [name.strip() for name in args.classes.split(",")]
+    exclude_classes = list(MODEL_SETTINGS["exclude_classes"])
+    if args.exclude_classes:
+        exclude_classes += [name.strip() for name in args.exclude_classes.split(",")]
+    class_thresholds = dict(MODEL_SETTINGS["class_thresholds"])
+    if args.class_conf:
+        for item in args.class_conf.split(","):
+            name, _, value = item.partition("=")
+            try:
+                if not name.strip():
+                    raise ValueError
+                class_thresholds[name.strip()] = float(value)
+            except ValueError:
+                parser.error(f"--class-conf expects NAME=VALUE items, got {item!r}")
+
+    if args.analytics:
+        from src.analytics import load_analytics_config
+
+        try:
+            zones, tripwires = load_analytics_config(
+                args.analytics, str(args.camera_id)
+            )
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f"Invalid analytics config {args.analytics}: {e}")
 
     # Setup logging
     setup_logging(args.log_level)
     logger = logging.getLogger(__name__)
 
     logger.info("Starting Webcam Smart Detection Application")
-    logger.info(f"Camera ID: {args.camera_id}")
-    logger.info(f"Model: {args.model_path}")
+    logger.info(f"Camera ID: {args.camera_id} ({args.width}x{args.height})")
+    logger.info(f"Model: {args.model_path} ({args.backend}, imgsz={args.imgsz})")
     logger.info(f"Confidence threshold: {args.confidence}")
 
+    tile_options = None
+    if args.tile:
+        tile_options = {
+            "tile_size": args.tile_size,
+            "overlap": args.tile_overlap,
+            "full_frame": args.tile_full_frame,
+        }
+        if args.tile_motion:
+            tile_options["motion"] = {
+                "threshold": TILING_SETTINGS["motion_threshold"],
+                "min_changed": TILING_SETTINGS["min_changed_fraction"],
+                "refresh_interval": TILING_SETTINGS["refresh_interval"],
+            }
+
+    detection_cache = None
+    if args.detection_cache:
+        from src.detection_cache import DetectionCache
+
+        detection_cache = DetectionCache(args.detection_cache)
+
+    analytics = None
+    if args.analytics:
+        from src.analytics import ZoneAnalytics
+
+        analytics = ZoneAnalytics(
+            zones,
+            tripwires,
+            anchor=args.zone_anchor,
+            max_distance=ANALYTICS_SETTINGS["max_distance"],
+            max_missed=ANALYTICS_SETTINGS["max_missed"],
+        )
+        logger.info(f"Analytics: {len(zones)} zones, {len(tripwires)} tripwires")
+
+    heatmap = None
+    if args.heatmap or args.heatmap_overlay:
+        from src.heatmap import OccupancyHeatmap
+
+        heatmap = OccupancyHeatmap(
+            cell_size=HEATMAP_SETTINGS["cell_size"],
+            half_life=HEATMAP_SETTINGS["half_life"],
+            classes=HEATMAP_SETTINGS["classes"],
+            snapshot_path=args.heatmap,
+            snapshot_interval=HEATMAP_SETTINGS["snapshot_interval"],
+        )
+
+    redactor = None
+    if args.redact or args.redact_faces:
+        from src.redaction import Redactor
+
+        face_detector = None
+        if args.redact_faces:
+            from src.face_detector import FaceDetector
+
+            face_detector = FaceDetector()
+        redactor = Redactor(
+            args.redact or "pixelate",
+            classes=REDACTION_SETTINGS["classes"],
+            head_fraction=REDACTION_SETTINGS["head_fraction"],
+            margin=REDACTION_SETTINGS["margin"],
+            cells=REDACTION_SETTINGS["cells"],
+            hold_frames=REDACTION_SETTINGS["hold_frames"],
+            face_detector=face_detector,
+        )
+
+    rolling_stats = None
+    if args.stats_interval > 0:
+        from src.rolling_stats import RollingStats
+
+        rolling_stats = RollingStats(
+            STATS_SETTINGS["windows"], STATS_SETTINGS["buckets"]
+        )
+
+    snapshot_store = None
+    if args.snapshots:
+        from src.snapshot_store import SnapshotStore
+
+        snapshot_store = SnapshotStore(
+            args.snapshots,
+            min_confidence=SNAPSHOT_SETTINGS["min_confidence"],
+            min_size=SNAPSHOT_SETTINGS["min_size"],
+            max_side=SNAPSHOT_SETTINGS["max_side"],
+            quality=SNAPSHOT_SETTINGS["quality"],
+            workers=SNAPSHOT_SETTINGS["workers"],
+            max_queue_bytes=SNAPSHOT_SETTINGS["max_queue_mb"] << 20,
+            max_bytes=SNAPSHOT_SETTINGS["max_mb"] << 20,
+            dedup_distance=SNAPSHOT_SETTINGS["dedup_distance"],
+            dedup_window=SNAPSHOT_SETTINGS["dedup_window"],
+        )
+
+    tracer = TraceRecorder() if args.profile else None
+    if args.profile_window:
+        profile_dir = (
+            os.path.dirname(os.path.abspath(args.profile))
+            if args.profile
+            else os.getcwd()
+        )
+        SignalProfiler(
+            duration=args.profile_window, output_dir=profile_dir, mode=args.profile_mode
+        ).install()
+
     try:
+        # Imported here so --help and argument errors return immediately
+        from src.smart_detection_app import SmartDetectionApp
+
         # Create and run the application
         app = SmartDetectionApp(
             camera_id=args.camera_id,
             model_path=args.model_path,
             confidence_threshold=args.confidence,
+            metrics_port=args.metrics_port,
+            metrics_host=args.metrics_host,
+            tracer=tracer,
+            warmup_frames=args.warmup_frames,
+            detector_options={
+                "backend": args.backend,
+                "imgsz": args.imgsz,
+                "half": args.half,
+                "cache_dir": args.model_cache_dir,
+                "quantization": args.quantize,
+                "calibration_dir": args.calibration_dir,
+                "classes": classes,
+                "exclude_classes": exclude_classes,
+                "class_thresholds": class_thresholds,
+                "detection_cache": detection_cache,
+            },
+            cascade_model_path=args.cascade_model,
+            cascade_options=cascade_options,
+            camera_options={
+                "frame_width": args.width,
+                "frame_height": args.height,
+                "fps": args.fps,
+                "fourcc": args.fourcc,
+                "buffer_size": args.buffer_size,
+            },
+            tile_options=tile_options,
+            reconnect_timeout=args.reconnect_timeout,
+            process_every=args.process_every,
+            stream_port=args.stream_port,
+            stream_host=args.stream_host,
+            sinks=sinks,
+            analytics=analytics,
+            heatmap=heatmap,
+            rolling_stats=rolling_stats,
+            redactor=redactor,
+            snapshot_store=snapshot_store,
+            stats_interval=args.stats_interval,
+            latency_target=(
+                args.latency_target / 1000.0 if args.latency_target else None
+            ),
+            heatmap_overlay=(
+                HEATMAP_SETTINGS["overlay_alpha"] if args.heatmap_overlay else None
+            ),
+            stream_options={
+                "quality": args.stream_quality,
+                "scale": args.stream_scale,
+                "max_fps": args.stream_max_fps,
+            },
         )
 
         app.run(
@@ -82,6 +586,12 @@ def main():
         logger.error(f"Application error: {e}")
         sys.exit(1)
 
+    finally:
+        if tracer is not None:
+            tracer.export(args.profile)
+        if detection_cache is not None:
+            detection_cache.close()
+
     logger.info("Application finished")
 
 
@@ -0,0 +1,550 @@
+import json
+import cv2
+import numpy as np
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import logging
+from .geometry import boxes_from_detections
+
+logger = logging.getLogger(__name__)
+
+# Point of each box tested against zones and tripwires
+ANCHORS = ("bottom", "center")
+
+# Crossing directions; "in" is from the right to the left of start -> end
+DIRECTIONS = ("in", "out")
+
+Point = Tuple[float, float]
+
+
+class Zone:
+    """A named polygon counting the objects inside it."""
+
+    def __init__(
+        self,
+        name: str,
+        polygon: Sequence[Point],
+        classes: Optional[Iterable[str]] = None,
+    ):
+        """Initialize the zone.
+
+        Args:
+            name: Zone name used in counters and events
+            polygon: Three or more (x, y) vertices in frame coordinates
+            classes: Only count these class names (default: all)
+        """
+        if len(polygon) < 3:
+            raise ValueError(f"Zone {name!r} needs at least 3 vertices")
+        self.name = name
+        self.polygon = np.asarray(polygon, dtype=np.float32).reshape(-1, 2)
+        self.classes = set(classes) if classes is not None else None
+
+
+class Tripwire:
+    """A named line segment counting objects that cross it."""
+
+    def __init__(
+        self,
+        name: str,
+        start: Point,
+        end: Point,
+        classes: Optional[Iterable[str]] = None,
+    ):
+        """Initialize the tripwire.
+
+        Args:
+            name: Line name used in counters and events
+            start: (x, y) start of the line in frame coordinates
+            end: (x, y) end of the line
+            classes: Only count these class names (default: all)
+        """
+        self.name = name
+        self.start = np.asarray(start, dtype=np.float32)
+        self.end = np.asarray(end, dtype=np.float32)
+        self.classes = set(classes) if classes is not None else None
+
+
+def load_analytics_config(
+    path: str, camera: Optional[str] = None
+) -> Tuple[List[Zone], List[Tripwire]]:
+    """Read zones and tripwires from a JSON file.
+
+    The file holds ``{"zones": [...], "tripwires": [...]}``, or one such
+    object per camera under ``"cameras"``. Zones are
+    ``{"name", "polygon": [[x, y], ...], "classes"}`` and tripwires
+    ``{"name", "line": [[x1, y1], [x2, y2]], "classes"}``; ``classes`` is
+    optional.
+
+    Args:
+        path: JSON file
+        camera: Camera name to pick from a per-camera file
+
+    Returns:
+        (zones, tripwires)
+    """
+    with open(path) as f:
+        config = json.load(f)
+    if "cameras" in config:
+        config = config["cameras"].get(str(camera), {})
+    zones = [
+        Zone(item["name"], item["polygon"], item.get("classes"))
+        for item in config.get("zones", [])
+    ]
+    tripwires = [
+        Tripwire(item["name"], *item["line"], classes=item.get("classes"))
+        for item in config.get("tripwires", [])
+    ]
+    return zones, tripwires
+
+
+class ZoneMask:
+    """Per-pixel bit mask of zone membership.
+
+    Each zone is rasterized once into its own bit of an integer mask
+    covering the zones' extent. Testing N points against every zone is then
+    a single gather of N mask values plus a shift, independent of the
+    number of zones or polygon vertices. Membership is exact to the pixel.
+    """
+
+    def __init__(self, zones: Sequence[Zone]):
+        """Rasterize the zones.
+
+        Args:
+            zones: Zones, one bit each in order
+        """
+        count = len(zones)
+        self.bits = next((bits for bits in (8, 16, 32) if count <= bits), 64)
+        dtype = np.dtype(f"uint{self.bits}")
+        words = max(1, -(-count // self.bits))
+        extent = (
+            np.concatenate([zone.polygon for zone in zones]).max(axis=0)
+            if zones
+            else np.zeros(2)
+        )
+        width, height = (np.ceil(extent).astype(int) + 1).tolist()
+        self.mask = np.zeros((height, width, words), dtype=dtype)
+        self.word, bit = np.divmod(np.arange(count), self.bits)
+        self.bit = bit.astype(dtype)
+
+        for index, zone in enumerate(zones):
+            polygon = np.round(zone.polygon).astype(np.int32)
+            x1, y1 = np.clip(polygon.min(axis=0), 0, None).tolist()
+            x2, y2 = (polygon.max(axis=0) + 1).tolist()
+            if x2 <= x1 or y2 <= y1:
+                continue
+            local = np.zeros((y2 - y1, x2 - x1), dtype=np.uint8)
+            cv2.fillPoly(local, [polygon - [x1, y1]], 1)
+            region = self.mask[y1:y2, x1:x2, self.word[index]]
+            region |= local.astype(dtype) << self.bit[index]
+
+    def lookup(self, points: np.ndarray) -> np.ndarray:
+        """Zone membership of (N, 2) points as an (N, Z) bool array."""
+        height, width = self.mask.shape[:2]
+        xs = np.round(points[:, 0]).astype(np.intp)
+        ys = np.round(points[:, 1]).astype(np.intp)
+        visible = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+        cells = self.mask[np.where(visible, ys, 0), np.where(visible, xs, 0)]
+        cells[~visible] = 0
+        return ((cells[:, self.word] >> self.bit) & 1).astype(bool)
+
+
+def _orientation(a: np.ndarray, b: np.ndarray, p: np.ndarray) -> np.ndarray:
+    """Cross product (b - a) x (p - a), broadcast over leading axes."""
+    return (b[..., 0] - a[..., 0]) * (p[..., 1] - a[..., 1]) - (
+        b[..., 1] - a[..., 1]
+    ) * (p[..., 0] - a[..., 0])
+
+
+def segment_crossings(
+    before: np.ndarray, after: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Which movements cross which lines, and in which direction.
+
+    Args:
+        before: (M, 2) previous positions
+        after: (M, 2) current positions
+        starts: (W, 2) line starts
+        ends: (W, 2) line ends
+
+    Returns:
+        (crossed (M, W) bool, inward (M, W) bool); inward means the object
+        ended up on the left of start -> end as seen in the image
+    """
+    p0, p1 = before[:, None, :], after[:, None, :]
+    a, b = starts[None, :, :], ends[None, :, :]
+    side_before = _orientation(a, b, p0)
+    side_after = _orientation(a, b, p1)
+    # Image y points down, so a negative cross product is on the left
+    inward = side_after < 0
+    changed_side = (side_before < 0) != inward
+    within_line = _orientation(p0, p1, a) * _orientation(p0, p1, b) <= 0
+    return changed_side & within_line, inward
+
+
+class ZoneAnalytics:
+    """Occupancy, entry/exit and line-crossing counts for one camera.
+
+    Each frame, detections are reduced to an anchor point (bottom centre of
+    the box by default, roughly where a person stands) and tested against
+    every zone and tripwire in a handful of array operations. A centroid
+    tracker links detections to the previous frame's objects, so crossings
+    and zone entries are counted once per object instead of per frame.
+    Detections gain a ``track_id`` key.
+
+    An object first seen inside a zone counts as entering it, and one lost
+    while inside counts as leaving it once it has been missing for more than
+    ``max_missed`` frames, so entries minus exits is the number of tracked
+    objects inside each zone.
+    """
+
+    def __init__(
+        self,
+        zones: Sequence[Zone] = (),
+        tripwires: Sequence[Tripwire] = (),
+        anchor: str = "bottom",
+        max_distance: float = 80.0,
+        max_missed: int = 5,
+    ):
+        """Initialize the engine.
+
+        Args:
+            zones: Polygon zones
+            tripwires: Counting lines
+            anchor: "bottom" (bottom centre of the box) or "center"
+            max_distance: Furthest an object may move between frames, in
+                pixels, and still be linked to its previous position
+            max_missed: Frames an unmatched object is remembered
+        """
+        if anchor not in ANCHORS:
+            raise ValueError(f"Unknown anchor {anchor!r}, expected one of {ANCHORS}")
+        self.zones = list(zones)
+        self.tripwires = list(tripwires)
+        self.anchor = anchor
+        self.max_distance = max_distance
+        self.max_missed = max_missed
+
+        self._zone_mask = ZoneMask(self.zones)
+        self._wire_starts = np.array(
+            [wire.start for wire in self.tripwires], dtype=np.float32
+        ).reshape(-1, 2)
+        self._wire_ends = np.array(
+            [wire.end for wire in self.tripwires], dtype=np.float32
+        ).reshape(-1, 2)
+        # Class filters as (zones or wires) x known class names tables
+        self._class_index: Dict[str, int] = {}
+        self._zone_classes = np.zeros((len(self.zones), 0), dtype=bool)
+        self._wire_classes = np.zeros((len(self.tripwires), 0), dtype=bool)
+
+        self.entries = np.zeros(len(self.zones), dtype=np.int64)
+        self.exits = np.zeros(len(self.zones), dtype=np.int64)
+        self.occupancy = np.zeros(len(self.zones), dtype=np.int64)
+        self.crossings = np.zeros((len(self.tripwires), 2), dtype=np.int64)
+
+        self._next_id = 0
+        self._track_ids = np.zeros(0, dtype=np.int64)
+        self._track_points = np.zeros((0, 2), dtype=np.float32)
+        self._track_classes = np.zeros(0, dtype=np.int64)
+        self._track_missed = np.zeros(0, dtype=np.int64)
+        self._track_inside = np.zeros((0, len(self.zones)), dtype=bool)
+
+    def _classes_of(self, names: List[str]) -> np.ndarray:
+        """Map class names to column indices of the class filter tables."""
+        index = self._class_index
+        missing = [name for name in dict.fromkeys(names) if name not in index]
+        if missing:
+            for name in missing:
+                index[name] = len(index)
+            self._zone_classes = self._filter_table(self.zones)
+            self._wire_classes = self._filter_table(self.tripwires)
+        return np.array([index[name] for name in names], dtype=np.int64)
+
+    def _filter_table(self, items) -> np.ndarray:
+        table = np.ones((len(items), len(self._class_index)), dtype=bool)
+        for row, item in enumerate(items):
+            if item.classes is not None:
+                for name, column in self._class_index.items():
+                    table[row, column] = name in item.classes
+        return table
+
+    def _anchors(self, boxes: np.ndarray) -> np.ndarray:
+        x = (boxes[:, 0] + boxes[:, 2]) * 0.5
+        if self.anchor == "bottom":
+            y = boxes[:, 3]
+        else:
+            y = (boxes[:, 1] + boxes[:, 3]) * 0.5
+        return np.stack([x, y], axis=1)
+
+    def _associate(self, points: np.ndarray, classes: np.ndarray) -> np.ndarray:
+        """Greedy nearest-first matching of detections to known objects.
+
+        Returns:
+            (N,) index into the track arrays, or -1 for a new object
+        """
+        matched = np.full(len(points), -1, dtype=np.int64)
+        if not len(points) or not len(self._track_ids):
+            return matched
+        rows, cols, distance = self._candidate_pairs(points, classes)
+        order = np.argsort(distance, kind="stable")
+        rows, cols = rows[order], cols[order]
+
+        # A pair that is the nearest for both its detection and its object
+        # is what greedy matching picks; settle those at once and loop only
+        # over the contested rest
+        best_for_row = np.zeros(len(rows), dtype=bool)
+        best_for_row[np.unique(rows, return_index=True)[1]] = True
+        best_for_col = np.zeros(len(cols), dtype=bool)
+        best_for_col[np.unique(cols, return_index=True)[1]] = True
+        mutual = best_for_row & best_for_col
+        matched[rows[mutual]] = cols[mutual]
+        taken = np.zeros(len(self._track_ids), dtype=bool)
+        taken[cols[mutual]] = True
+
+        rest = (matched[rows] < 0) & ~taken[cols]
+        for row, col in zip(rows[rest].tolist(), cols[rest].tolist()):
+            if matched[row] < 0 and not taken[col]:
+                matched[row] = col
+                taken[col] = True
+        return matched
+
+    def _candidate_pairs(
+        self, points: np.ndarray, classes: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Same-class (detection, object) pairs within ``max_distance``.
+
+        Objects are swept in x order, so only pairs within ``max_distance``
+        horizontally are ever formed instead of the full N x M matrix.
+
+        Returns:
+            (detection rows, track columns, squared distances)
+        """
+        # Per-coordinate columns; gathering rows of (N, 2) arrays is slow
+        x, y = np.ascontiguousarray(points.T)
+        track_x, track_y = np.ascontiguousarray(self._track_points.T)
+        by_x = np.argsort(track_x, kind="stable")
+        sorted_x = track_x[by_x]
+        low = np.searchsorted(sorted_x, x - self.max_distance)
+        high = np.searchsorted(sorted_x, x + self.max_distance, "right")
+        counts = high - low
+        rows = np.repeat(np.arange(len(points)), counts)
+        offsets = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+        cols = by_x[low[rows] + offsets]
+
+        dx = x[rows] - track_x[cols]
+        dy = y[rows] - track_y[cols]
+        distance = dx * dx + dy * dy
+        valid = (distance <= self.max_distance**2) & (
+            classes[rows] == self._track_classes[cols]
+        )
+        return rows[valid], cols[valid], distance[valid]
+
+    def update(self, detections: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Process one frame of detections.
+
+        Call for every processed frame, including frames without
+        detections, so objects that left are forgotten.
+
+        Args:
+            detections: Detections of the frame; each gains ``track_id``
+
+        Returns:
+            dict: ``occupancy`` per zone and this frame's ``events``
+            (zone enter/exit and line crossings)
+        """
+        points = self._anchors(boxes_from_detections(detections))
+        classes = self._classes_of([d["class_name"] for d in detections])
+        matched = self._associate(points, classes)
+        known = matched >= 0
+        tracks = matched[known]
+
+        if self.zones and len(points):
+            inside = self._zone_mask.lookup(points)
+            inside &= self._zone_classes[:, classes].T
+        else:
+            inside = np.zeros((len(points), len(self.zones)), dtype=bool)
+        self.occupancy = inside.sum(axis=0)
+
+        events = []
+        if len(tracks):
+            # Row i of the per-track masks belongs to detection rows[i]
+            rows = np.flatnonzero(known)
+            was_inside = self._track_inside[tracks]
+            entered = inside[known] & ~was_inside
+            exited = was_inside & ~inside[known]
+            self.entries += entered.sum(axis=0)
+            self.exits += exited.sum(axis=0)
+            events += self._zone_events(entered, exited, self._track_ids[tracks], rows)
+            if self.tripwires:
+                crossed, inward = segment_crossings(
+                    self._track_points[tracks],
+                    points[known],
+                    self._wire_starts,
+                    self._wire_ends,
+                )
+                crossed &= self._wire_classes[:, classes[known]].T
+                self.crossings[:, 0] += (crossed & inward).sum(axis=0)
+                self.crossings[:, 1] += (crossed & ~inward).sum(axis=0)
+                events += self._crossing_events(crossed, inward, tracks, rows)
+
+        track_ids, lost_events = self._update_tracks(matched, points, classes, inside)
+        for detection, track_id in zip(detections, track_ids.tolist()):
+            detection["track_id"] = track_id
+
+        # New objects already inside a zone entered it unseen
+        new = np.flatnonzero(~known)
+        if len(new) and self.zones:
+            entered = inside[new]
+            self.entries += entered.sum(axis=0)
+            events += self._zone_events(
+                entered, np.zeros_like(entered), track_ids[new], new
+            )
+        for event in events:
+            event["class_name"] = detections[event.pop("detection")]["class_name"]
+        events += lost_events
+        return {
+            "occupancy": dict(
+                zip((zone.name for zone in self.zones), self.occupancy.tolist())
+            ),
+            "events": events,
+        }
+
+    def _zone_events(self, entered, exited, ids, rows) -> List[Dict[str, Any]]:
+        """Events for the (rare) set entries of the enter/exit masks.
+
+        Row i of the masks belongs to track id ids[i] and detection rows[i].
+        """
+        events = []
+        for kind, mask in (("enter", entered), ("exit", exited)):
+            for row, zone in zip(*np.nonzero(mask)):
+                events.append(
+                    {
+                        "type": kind,
+                        "zone": self.zones[zone].name,
+                        "track_id": int(ids[row]),
+                        "detection": int(rows[row]),
+                    }
+                )
+        return events
+
+    def _crossing_events(self, crossed, inward, tracks, rows) -> List[Dict[str, Any]]:
+        """Events for the set entries of the crossing mask."""
+        events = []
+        for row, wire in zip(*np.nonzero(crossed)):
+            events.append(
+                {
+                    "type": "cross",
+                    "line": self.tripwires[wire].name,
+                    "direction": DIRECTIONS[0 if inward[row, wire] else 1],
+                    "track_id": int(self._track_ids[tracks[row]]),
+                    "detection": int(rows[row]),
+                }
+            )
+        return events
+
+    def _update_tracks(self, matched, points, classes, inside) -> np.ndarray:
+        """Move matched objects, add new ones and forget stale ones.
+
+        Stale objects that were inside a zone count as leaving it.
+
+        Returns:
+            ((N,) track id of every detection, exit events of stale objects)
+        """
+        known = matched >= 0
+        tracks = matched[known]
+        self._track_missed += 1
+        self._track_missed[tracks] = 0
+        self._track_points[tracks] = points[known]
+        self._track_inside[tracks] = inside[known]
+
+        new = np.flatnonzero(~known)
+        new_ids = np.arange(self._next_id, self._next_id + len(new))
+        self._next_id += len(new)
+        ids = np.empty(len(points), dtype=np.int64)
+        ids[known] = self._track_ids[tracks]
+        ids[new] = new_ids
+
+        alive = self._track_missed <= self.max_missed
+        lost_events = self._lost_events(~alive)
+
+        self._track_ids = np.concatenate([self._track_ids[alive], new_ids])
+        self._track_points = np.concatenate(
+            [self._track_points[alive], points[new].astype(np.float32)]
+        )
+        self._track_classes = np.concatenate([self._track_classes[alive], classes[new]])
+        self._track_missed = np.concatenate(
+            [self._track_missed[alive], np.zeros(len(new), dtype=np.int64)]
+        )
+        self._track_inside = np.concatenate([self._track_inside[alive], inside[new]])
+        return ids, lost_events
+
+    def _lost_events(self, lost: np.ndarray) -> List[Dict[str, Any]]:
+        """Count exits of forgotten objects that were still inside a zone."""
+        was_inside = self._track_inside[lost]
+        if not was_inside.any():
+            return []
+        self.exits += was_inside.sum(axis=0)
+        class_names = list(self._class_index)
+        ids = self._track_ids[lost]
+        classes = self._track_classes[lost]
+        return [
+            {
+                "type": "exit",
+                "zone": self.zones[zone].name,
+                "track_id": int(ids[row]),
+                "class_name": class_names[classes[row]],
+                "lost": True,
+            }
+            for row, zone in zip(*np.nonzero(was_inside))
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get current occupancy and cumulative counts per zone and line."""
+        return {
+            "zones": {
+                zone.name: {
+                    "occupancy": int(self.occupancy[index]),
+                    "entries": int(self.entries[index]),
+                    "exits": int(self.exits[index]),
+                }
+                for index, zone in enumerate(self.zones)
+            },
+            "lines": {
+                wire.name: {
+                    "in": int(self.crossings[index, 0]),
+                    "out": int(self.crossings[index, 1]),
+                }
+                for index, wire in enumerate(self.tripwires)
+            },
+            "tracked": len(self._track_ids),
+        }
+
+    def draw(self, frame: np.ndarray) -> np.ndarray:
+        """Draw zones and lines with their current counts."""
+        for index, zone in enumerate(self.zones):
+            polygon = zone.polygon.astype(np.int32)
+            cv2.polylines(frame, [polygon], True, (0, 200, 255), 2)
+            x, y = polygon.min(axis=0).tolist()
+            label = f"{zone.name}: {int(self.occupancy[index])}"
+            cv2.putText(
+                frame,
+                label,
+                (x + 4, y + 18),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.5,
+                (0, 200, 255),
+                2,
+            )
+        for index, wire in enumerate(self.tripwires):
+            start = tuple(int(v) for v in wire.start)
+            end = tuple(int(v) for v in wire.end)
+            cv2.line(frame, start, end, (255, 0, 255), 2)
+            counts = self.crossings[index]
+            label = f"{wire.name}: in {counts[0]} out {counts[1]}"
+            cv2.putText(
+                frame,
+                label,
+                (start[0] + 4, start[1] - 6),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.5,
+                (255, 0, 255),
+                2,
+            )
+        return frame
@@ -0,0 +1,274 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Mapping, Optional, Union
+import logging
+from .camera_handler import CameraHandler
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stream in a queue
+_END = object()
+
+
+class AsyncDetector:
+    """Asyncio front end for a blocking detector.
+
+    ``async for result in detector.stream(source)`` yields one result per
+    frame. Camera reads block for up to a frame interval, so they run on an
+    I/O thread pool that grows to one thread per live camera stream;
+    inference runs on a single thread that all streams take turns on.
+    Async iterable sources need no I/O thread.
+
+    Each stream buffers at most ``queue_size`` captured frames. When the
+    consumer falls behind, the oldest buffered frame is dropped (live
+    cameras should report the newest frame), or with ``drop_oldest=False``
+    capture waits for room (for files, where every frame matters).
+
+    Results are dicts with ``source``, ``frame_index``, ``timestamp``
+    (time.monotonic() at capture, from the camera's frame timestamp where
+    it has one), ``detections`` and, unless disabled, ``frame``. Results
+    from a CameraHandler also carry the camera's frame ``sequence``, so
+    gaps show frames dropped along the way.
+    """
+
+    def __init__(
+        self,
+        detector,
+        queue_size: int = 2,
+        drop_oldest: bool = True,
+        io_workers: int = 4,
+        inference_executor: Optional[Executor] = None,
+    ):
+        """Initialize the async detector.
+
+        Args:
+            detector: Blocking detector, e.g. ObjectDetector or ModelCascade
+            queue_size: Captured frames buffered per stream
+            drop_oldest: Drop the oldest buffered frame when a stream's
+                buffer is full instead of pausing capture
+            io_workers: Initial camera I/O threads; the pool grows when more
+                camera streams are live at once
+            inference_executor: Executor for detector calls (default: one
+                dedicated thread, since models are not thread-safe)
+        """
+        self.detector = detector
+        self.queue_size = queue_size
+        self.drop_oldest = drop_oldest
+        self._io_size = io_workers
+        self._io = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="io")
+        self._io_streams = 0
+        self._owns_inference = inference_executor is None
+        self._inference = inference_executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="inference"
+        )
+        self.dropped: Dict[str, int] = {}
+        self._streams = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shut down the executors; running streams should be closed first."""
+        self._io.shutdown(wait=False)
+        if self._owns_inference:
+            self._inference.shutdown(wait=False)
+
+    async def load_model(self) -> bool:
+        """Load the detector's model without blocking the event loop.
+
+        Returns:
+            bool: True if the model loaded, False otherwise
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._inference, self.detector.load_model)
+
+    async def detect(self, frame):
+        """Run detection on one frame in the inference executor.
+
+        Returns:
+            List of detection dictionaries
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._inference, self.detector.detect_objects, frame
+        )
+
+    async def stream(
+        self,
+        source: Union[int, str, CameraHandler, AsyncIterator],
+        name: Optional[str] = None,
+        include_frames: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Detect objects in every frame of a source.
+
+        Breaking out of the loop or cancelling the consuming task stops
+        capture; cameras opened by the stream are released. Call
+        ``aclose()`` on the generator (or use ``contextlib.aclosing()``) to
+        release them immediately rather than when it is garbage collected.
+
+        Args:
+            source: Camera id or video path, a CameraHandler, or an async
+                iterable of frames
+            name: Source name in results (default: derived from source)
+            include_frames: Include the frame in each result
+
+        Yields:
+            dict: Per-frame result
+        """
+        self._streams += 1
+        if name is None:
+            name = str(source) if isinstance(source, (int, str)) else f"{self._streams}"
+        self.dropped.setdefault(name, 0)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        producer = asyncio.create_task(
+            self._produce(source, name, queue), name=f"capture-{name}"
+        )
+        try:
+            while True:
+                item = await queue.get()
+                if item is _END:
+                    break
+                index, timestamp, frame, info = item
+                detections = await self.detect(frame)
+                result = {
+                    "source": name,
+                    "frame_index": index,
+                    "timestamp": timestamp,
+                    "detections": detections,
+                }
+                if info is not None:
+                    result["sequence"] = info.sequence
+                if include_frames:
+                    result["frame"] = frame
+                yield result
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+    async def multiplex(
+        self,
+        sources: Mapping[str, Union[int, str, CameraHandler, AsyncIterator]],
+        include_frames: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Detect on several sources at once, yielding results as they come.
+
+        Inference requests from the streams are served in arrival order by
+        the shared inference executor, so cameras take turns on the model.
+
+        Args:
+            sources: Source name -> source, as accepted by stream()
+            include_frames: Include the frame in each result
+
+        Yields:
+            dict: Per-frame result; ``source`` tells the streams apart
+        """
+        merged: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size * len(sources))
+
+        async def pump(name, source):
+            results = self.stream(source, name, include_frames)
+            try:
+                async for result in results:
+                    await merged.put(result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Stream {name} failed: {e}")
+            finally:
+                await results.aclose()
+            # The consumer keeps draining until every stream has ended
+            await merged.put(_END)
+
+        tasks = [
+            asyncio.create_task(pump(name, source), name=f"stream-{name}")
+            for name, source in sources.items()
+        ]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                item = await merged.get()
+                if item is _END:
+                    remaining -= 1
+                    continue
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _produce(self, source, name: str, queue: asyncio.Queue):
+        """Capture frames into a stream's queue until the source ends."""
+        frames = self._frames(source)
+        index = 0
+        try:
+            async for frame, info in frames:
+                timestamp = time.monotonic() if info is None else info.timestamp
+                item = (index, timestamp, frame, info)
+                index += 1
+                if not self.drop_oldest:
+                    await queue.put(item)
+                    continue
+                while queue.full():
+                    queue.get_nowait()
+                    self.dropped[name] += 1
+                queue.put_nowait(item)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error reading stream {name}: {e}")
+        finally:
+            await frames.aclose()
+        # Only reached when the source ends on its own
+        await queue.put(_END)
+
+    async def _frames(self, source):
+        """Iterate (frame, FrameInfo or None) pairs of any supported source."""
+        if hasattr(source, "__aiter__"):
+            async for frame in source:
+                yield frame, None
+            return
+
+        owned = isinstance(source, (int, str))
+        camera = CameraHandler(source) if owned else source
+        loop = asyncio.get_running_loop()
+        pending = None
+        self._reserve_io()
+        try:
+            if not camera.is_opened:
+                pending = loop.run_in_executor(self._io, camera.initialize_camera)
+                if not await asyncio.shield(pending):
+                    return
+            while True:
+                pending = loop.run_in_executor(self._io, camera.read_frame)
+                ret, frame = await asyncio.shield(pending)
+                if not ret:
+                    return
+                yield frame, getattr(camera, "last_frame_info", None)
+        finally:
+            # A cancelled read keeps running in its thread; let it finish
+            # before the capture is released underneath it
+            if pending is not None and not pending.done():
+                await asyncio.wait([pending])
+            if owned:
+                await loop.run_in_executor(self._io, camera.release)
+            self._io_streams -= 1
+
+    def _reserve_io(self):
+        """Make sure every live camera stream has an I/O thread of its own.
+
+        A ThreadPoolExecutor cannot grow, so it is replaced by a larger one;
+        reads already queued on the old pool still finish there.
+        """
+        self._io_streams += 1
+        if self._io_streams <= self._io_size:
+            return
+        self._io_size = self._io_streams
+        previous = self._io
+        self._io = ThreadPoolExecutor(
+            max_workers=self._io_size, thread_name_prefix="io"
+        )
+        previous.shutdown(wait=False)
+        logger.debug(f"Camera I/O pool grown to {self._io_size} threads")
@@ -1,23 +1,104 @@
+import os
+import threading
+import time
 import cv2
 import numpy as np
-from typing import Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 import logging
+from .frame_latency import FrameInfo
+from .frame_pool import FramePool, PooledFrame
 
 logger = logging.getLogger(__name__)
 
+# Pixel formats worth negotiating with USB cameras: MJPG saves bus bandwidth
+# at high resolutions (but must be decoded), YUYV is uncompressed
+CAPTURE_FORMATS = ("MJPG", "YUYV")
+
+
+def fourcc_to_str(code) -> str:
+    """Convert a numeric FOURCC as reported by OpenCV into text, e.g. "MJPG"."""
+    code = int(code)
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+
 
 class CameraHandler:
     """Handle webcam operations and video streaming."""
 
-    def __init__(self, camera_id: int = 0):
+    def __init__(
+        self,
+        camera_id: int = 0,
+        frame_pool_size: int = 4,
+        frame_width: int = 640,
+        frame_height: int = 480,
+        fps: int = 30,
+        max_failed_reads: int = 5,
+        stall_timeout: float = 3.0,
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 10.0,
+        fourcc: Optional[str] = None,
+        buffer_size: Optional[int] = None,
+        max_timestamp_skew: float = 5.0,
+    ):
         """Initialize camera handler.
 
         Args:
             camera_id: Camera device ID (default: 0 for default camera)
+            frame_pool_size: Number of reusable buffers for read_pooled_frame()
+            frame_width: Requested capture width, e.g. 3840 for 4K
+            frame_height: Requested capture height, e.g. 2160 for 4K
+            fps: Requested capture frame rate
+            max_failed_reads: Consecutive failed reads after which the
+                camera is considered lost
+            stall_timeout: Seconds the frame timestamp may stay unchanged
+                before the stream is considered stalled
+            reconnect_delay: First delay between reconnection attempts;
+                doubled after every failure
+            max_reconnect_delay: Upper bound for the reconnection delay
+            fourcc: Pixel format to request, e.g. "MJPG" or "YUYV"
+                (default: whatever the driver picks)
+            buffer_size: Frames buffered by the driver; 1 keeps latency low
+                by always delivering the newest frame
+            max_timestamp_skew: Seconds a driver timestamp may precede the
+                read and still be trusted as the capture time
         """
+        if fourcc is not None and len(fourcc) != 4:
+            raise ValueError(f"FOURCC must be 4 characters, got {fourcc!r}")
         self.camera_id = camera_id
         self.cap = None
         self.is_opened = False
+        self.frame_pool_size = frame_pool_size
+        self.frame_width = frame_width
+        self.frame_height = frame_height
+        self.fps = fps
+        self.fourcc = fourcc
+        self.buffer_size = buffer_size
+        self.negotiated: Dict[str, Any] = {}
+        self.frame_pool: Optional[FramePool] = None
+
+        self.max_failed_reads = max_failed_reads
+        self.stall_timeout = stall_timeout
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.reconnects = 0
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        self._state = "closed"
+        self._last_frame_time: Optional[float] = None
+        self._last_position: Optional[float] = None
+        self._position_changed: Optional[float] = None
+        self._interrupt = threading.Event()
+
+        # Every good read or grab gets the next sequence number, so frames
+        # that were skipped or lost downstream show up as gaps
+        self.max_timestamp_skew = max_timestamp_skew
+        self.sequence = 0
+        self.last_frame_info: Optional[FrameInfo] = None
+        self._live = self.is_live
+
+    @property
+    def is_live(self) -> bool:
+        """False for video files, which end instead of reconnecting."""
+        return not (isinstance(self.camera_id, str) and os.path.isfile(self.camera_id))
 
     def initialize_camera(self) -> bool:
         """Initialize the webcam connection.
@@ -29,21 +110,73 @@ class CameraHandler:
             self.cap = cv2.VideoCapture(self.camera_id)
             if not self.cap.isOpened():
                 logger.error(f"Cannot open camera {self.camera_id}")
+                self.last_error = "open failed"
                 return False
 
-            # Set camera properties for better performance
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-            self.cap.set(cv2.CAP_PROP_FPS, 30)
+            # Set camera properties for better performance; the format goes
+            # first because it decides which resolutions and rates exist
+            if self.fourcc:
+                self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc))
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.frame_width)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.frame_height)
+            self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+            if self.buffer_size is not None:
+                self.cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
+            if self.fourcc or self.buffer_size is not None:
+                self.negotiated = self.verify_settings()
 
             self.is_opened = True
+            self._state = "ok"
+            self.consecutive_failures = 0
+            self._last_position = None
+            self._position_changed = None
             logger.info(f"Camera {self.camera_id} initialized successfully")
             return True
 
         except Exception as e:
             logger.error(f"Error initializing camera: {e}")
+            self.last_error = str(e)
             return False
 
+    def verify_settings(self) -> Dict[str, Any]:
+        """Read back the capture settings and warn about any not applied.
+
+        Drivers silently fall back to the nearest supported mode, so the
+        requested format, size, rate and buffer size are compared with what
+        the backend reports.
+
+        Returns:
+            dict: Actual settings plus ``mismatched``, the names of
+            settings that differ from the request
+        """
+        actual = {
+            "fourcc": fourcc_to_str(self.cap.get(cv2.CAP_PROP_FOURCC)),
+            "width": int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "fps": float(self.cap.get(cv2.CAP_PROP_FPS)),
+            "buffer_size": int(self.cap.get(cv2.CAP_PROP_BUFFERSIZE)),
+        }
+        requested = {
+            "fourcc": self.fourcc,
+            "width": self.frame_width,
+            "height": self.frame_height,
+            "fps": self.fps,
+            "buffer_size": self.buffer_size,
+        }
+        mismatched = [
+            name
+            for name, value in requested.items()
+            if value is not None and actual[name] != value
+        ]
+        for name in mismatched:
+            logger.warning(
+                f"Camera {self.camera_id} {name}: requested {requested[name]}, "
+                f"got {actual[name]}"
+            )
+        if not mismatched:
+            logger.info(f"Camera {self.camera_id} capture settings applied: {actual}")
+        return dict(actual, mismatched=mismatched)
+
     def read_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
         """Read a frame from the camera.
 
@@ -54,13 +187,261 @@ class CameraHandler:
             return False, None
 
         ret, frame = self.cap.read()
+        if not self._record_read(ret and frame is not None):
+            return False, None
         return ret, frame
 
+    def read_timestamped_frame(
+        self,
+    ) -> Tuple[bool, Optional[np.ndarray], Optional[FrameInfo]]:
+        """Read a frame together with its capture timestamp and sequence.
+
+        Returns:
+            Tuple of (success_flag, frame_array, frame_info)
+        """
+        ret, frame = self.read_frame()
+        if not ret:
+            return False, None, None
+        return True, frame, self.last_frame_info
+
+    def read_pooled_frame(self) -> Tuple[bool, Optional[PooledFrame]]:
+        """Read a frame into a reusable buffer from the frame pool.
+
+        The pool is sized from the first frame the camera delivers. Callers
+        must call ``release()`` on the returned frame (or use it as a
+        context manager) once every consumer is done with it.
+
+        Returns:
+            Tuple of (success_flag, pooled_frame)
+        """
+        if not self.is_opened or self.cap is None:
+            return False, None
+
+        if self.frame_pool is None:
+            ret, frame = self.cap.read()
+            if not self._record_read(ret and frame is not None):
+                return False, None
+            pooled = self._first_pooled_frame(frame)
+            pooled.info = self.last_frame_info
+            return True, pooled
+
+        pooled = self.frame_pool.acquire(timeout=1.0)
+        if pooled is None:
+            return False, None
+
+        ret, frame = self.cap.read(image=pooled.array)
+        if not self._record_read(ret and frame is not None):
+            pooled.release()
+            return False, None
+
+        if frame is not pooled.array:
+            # Backend could not decode in place (e.g. resolution changed)
+            pooled.array = frame
+        pooled.info = self.last_frame_info
+        return True, pooled
+
+    def _first_pooled_frame(self, frame: np.ndarray) -> PooledFrame:
+        """Create the frame pool from the first frame and store it there."""
+        height, width = frame.shape[:2]
+        if (width, height) != (self.frame_width, self.frame_height):
+            # Cameras fall back to a supported mode instead of failing
+            logger.warning(
+                f"Camera {self.camera_id} delivers {width}x{height} instead "
+                f"of the requested {self.frame_width}x{self.frame_height}"
+            )
+        self.frame_pool = FramePool(frame.shape, frame.dtype, size=self.frame_pool_size)
+        pooled = self.frame_pool.acquire()
+        np.copyto(pooled.array, frame)
+        return pooled
+
+    def grab_frame(self) -> bool:
+        """Advance to the next frame without decoding it.
+
+        With compressed formats such as MJPG, decoding is most of the
+        capture cost; grabbing keeps the stream current while only the
+        frames passed to retrieve_pooled_frame() are decoded.
+
+        Returns:
+            bool: True if a frame was grabbed
+        """
+        if not self.is_opened or self.cap is None:
+            return False
+        return self._record_read(bool(self.cap.grab()))
+
+    def retrieve_pooled_frame(self) -> Tuple[bool, Optional[PooledFrame]]:
+        """Decode the last grabbed frame into a pooled buffer.
+
+        The frame keeps the timestamp and sequence number of its grab.
+
+        Returns:
+            Tuple of (success_flag, pooled_frame)
+        """
+        if not self.is_opened or self.cap is None:
+            return False, None
+
+        if self.frame_pool is None:
+            ret, frame = self.cap.retrieve()
+            if not ret or frame is None:
+                return False, None
+            pooled = self._first_pooled_frame(frame)
+            pooled.info = self.last_frame_info
+            return True, pooled
+
+        pooled = self.frame_pool.acquire(timeout=1.0)
+        if pooled is None:
+            return False, None
+        ret, frame = self.cap.retrieve(image=pooled.array)
+        if not ret or frame is None:
+            pooled.release()
+            return False, None
+        if frame is not pooled.array:
+            pooled.array = frame
+        pooled.info = self.last_frame_info
+        return True, pooled
+
+    def _record_read(self, ok: bool) -> bool:
+        """Track read failures and frozen streams.
+
+        A read that returns the same stream position for longer than
+        stall_timeout counts as failed: the backend is repeating a stale
+        frame (common with dropped RTSP sessions).
+
+        Good reads are stamped into ``last_frame_info``.
+
+        Returns:
+            bool: Whether the frame should be used
+        """
+        now = time.monotonic()
+        position = None
+        if ok:
+            position = self.cap.get(cv2.CAP_PROP_POS_MSEC)
+            # Some backends do not report a position; stalls cannot be seen there
+            if not isinstance(position, (int, float)) or position <= 0:
+                position = None
+            elif position != self._last_position:
+                self._last_position = position
+                self._position_changed = now
+            elif now - self._position_changed > self.stall_timeout:
+                ok = False
+                if self._state != "stalled":
+                    logger.warning(
+                        f"Camera {self.camera_id} stalled: no new frame "
+                        f"for {now - self._position_changed:.1f}s"
+                    )
+                self._state = "stalled"
+                self.last_error = "stalled"
+
+        if ok:
+            self.consecutive_failures = 0
+            self._last_frame_time = now
+            self._state = "ok"
+            self.last_frame_info = self._stamp(now, position)
+        else:
+            self.consecutive_failures += 1
+            if self._state == "ok":
+                self._state = "degraded"
+            if self._state != "stalled":
+                self.last_error = "read failed"
+        return ok
+
+    def _stamp(self, now: float, position: Optional[float]) -> FrameInfo:
+        """Timestamp and number a frame that was just read.
+
+        V4L2 reports the driver's capture time on the monotonic clock as
+        the stream position, which also counts the time the frame spent in
+        driver buffers. Files report the position in the video instead, and
+        other backends nothing useful, so the read time is used there.
+        """
+        self.sequence += 1
+        timestamp, clock = now, "monotonic"
+        if position is not None and self._live:
+            driver_time = position / 1000.0
+            if 0.0 <= now - driver_time <= self.max_timestamp_skew:
+                timestamp, clock = driver_time, "driver"
+        return FrameInfo(str(self.camera_id), self.sequence, timestamp, clock, position)
+
+    def needs_reconnect(self) -> bool:
+        """Whether the camera is lost or stalled and should be reopened."""
+        return (
+            not self.is_opened
+            or self._state == "stalled"
+            or self.consecutive_failures >= self.max_failed_reads
+        )
+
+    def reconnect(self, max_wait: Optional[float] = None) -> bool:
+        """Reopen the camera, retrying with exponential backoff.
+
+        The frame pool is kept, so buffers already handed downstream stay
+        valid and capture resumes without reallocating.
+
+        Args:
+            max_wait: Give up after this many seconds (default: keep trying
+                until interrupt() is called)
+
+        Returns:
+            bool: True if the camera is open again, False otherwise
+        """
+        self._interrupt.clear()
+        self._state = "reconnecting"
+        deadline = None if max_wait is None else time.monotonic() + max_wait
+        delay = self.reconnect_delay
+        attempt = 0
+        while True:
+            if self.cap is not None:
+                self.cap.release()
+                self.cap = None
+            self.is_opened = False
+            attempt += 1
+            logger.info(f"Reconnecting camera {self.camera_id} (attempt {attempt})")
+            if self.initialize_camera():
+                self.reconnects += 1
+                logger.info(
+                    f"Camera {self.camera_id} reconnected after {attempt} attempt(s)"
+                )
+                return True
+
+            self._state = "reconnecting"
+            wait = delay
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+            if wait <= 0 or self._interrupt.wait(wait):
+                self._state = "disconnected"
+                logger.error(f"Giving up reconnecting camera {self.camera_id}")
+                return False
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def interrupt(self):
+        """Abort a reconnect() running in another thread."""
+        self._interrupt.set()
+
+    def health(self) -> Dict[str, Any]:
+        """Get the capture health status.
+
+        Returns:
+            dict: state ("ok", "degraded", "stalled", "reconnecting",
+            "disconnected" or "closed"), consecutive failures, reconnect
+            count, seconds since the last good frame and the last error
+        """
+        age = None
+        if self._last_frame_time is not None:
+            age = time.monotonic() - self._last_frame_time
+        return {
+            "state": self._state,
+            "connected": self.is_opened,
+            "consecutive_failures": self.consecutive_failures,
+            "reconnects": self.reconnects,
+            "last_frame_age": age,
+            "last_error": self.last_error,
+        }
+
     def release(self):
         """Release the camera resources."""
+        self.interrupt()
         if self.cap is not None:
             self.cap.release()
             self.is_opened = False
+            self.frame_pool = None
+            self._state = "closed"
             logger.info("Camera released")
 
     def get_camera_info(self) -> dict:
@@ -77,4 +458,5 @@ class CameraHandler:
             "height": int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
             "fps": int(self.cap.get(cv2.CAP_PROP_FPS)),
             "fourcc": int(self.cap.get(cv2.CAP_PROP_FOURCC)),
+            "format": fourcc_to_str(self.cap.get(cv2.CAP_PROP_FOURCC)),
         }
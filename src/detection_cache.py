@@ -0,0 +1,254 @@
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import threading
+from typing import Any, Dict, List, Optional
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "webcam-smartdet", "detections.sqlite"
+)
+
+# One fixed-size record per detection; class names are stored once per entry
+DETECTION_RECORD = np.dtype(
+    [
+        ("bbox", "<i4", (4,)),
+        ("confidence", "<f8"),
+        ("class_id", "<i4"),
+        ("name", "<u2"),
+    ]
+)
+COUNT_PREFIX = struct.Struct("<I")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS detections (
+    key BLOB PRIMARY KEY,
+    payload BLOB NOT NULL,
+    last_used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS detections_last_used ON detections (last_used);
+"""
+
+
+def namespace_digest(**fields) -> str:
+    """Fingerprint the settings that determine a detector's output.
+
+    Args:
+        **fields: JSON-serializable settings (model hash, input size,
+            thresholds, class filters, ...)
+
+    Returns:
+        str: Hex digest; changing any field changes every cache key
+    """
+    canonical = json.dumps(fields, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def encode_detections(detections: List[Dict[str, Any]]) -> bytes:
+    """Pack detections as a count, fixed-size records and a name table."""
+    names: Dict[str, int] = {}
+    records = np.zeros(len(detections), dtype=DETECTION_RECORD)
+    for record, detection in zip(records, detections):
+        record["bbox"] = detection["bbox"]
+        record["confidence"] = detection["confidence"]
+        record["class_id"] = detection["class_id"]
+        record["name"] = names.setdefault(detection["class_name"], len(names))
+    table = "\0".join(names).encode()
+    return COUNT_PREFIX.pack(len(detections)) + records.tobytes() + table
+
+
+def decode_detections(payload: bytes) -> List[Dict[str, Any]]:
+    """Inverse of encode_detections()."""
+    (count,) = COUNT_PREFIX.unpack_from(payload)
+    end = COUNT_PREFIX.size + count * DETECTION_RECORD.itemsize
+    records = np.frombuffer(
+        payload, dtype=DETECTION_RECORD, count=count, offset=COUNT_PREFIX.size
+    )
+    names = payload[end:].decode().split("\0")
+    return [
+        {
+            "bbox": bbox,
+            "confidence": confidence,
+            "class_id": class_id,
+            "class_name": names[name],
+        }
+        for bbox, confidence, class_id, name in zip(
+            records["bbox"].tolist(),
+            records["confidence"].tolist(),
+            records["class_id"].tolist(),
+            records["name"].tolist(),
+        )
+    ]
+
+
+class DetectionCache:
+    """Persistent cache of detections keyed by frame content and settings.
+
+    Keys hash the detector's namespace (see namespace_digest()) together
+    with the frame's pixels, shape and dtype, so re-processing an unchanged
+    clip or image folder with unchanged model settings skips inference.
+    Entries live in a single SQLite file and are evicted least recently
+    used first once ``max_entries`` or ``max_bytes`` is exceeded.
+
+    Writes are committed every ``commit_every`` changes and on close(), so
+    lookups and inserts do not each pay for a disk sync.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = 500_000,
+        max_bytes: int = 256 << 20,
+        commit_every: int = 64,
+    ):
+        """Initialize the cache.
+
+        Args:
+            path: SQLite file (default: ~/.cache/webcam-smartdet/
+                detections.sqlite), or ":memory:"
+            max_entries: Maximum cached frames
+            max_bytes: Maximum total payload size
+            commit_every: Uncommitted changes allowed before a commit
+        """
+        self.path = os.path.expanduser(path or DEFAULT_CACHE_PATH)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.commit_every = commit_every
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        entries, size, clock = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0), "
+            "COALESCE(MAX(last_used), 0) FROM detections"
+        ).fetchone()
+        self._entries = entries
+        self._bytes = size
+        # Logical clock for LRU order; avoids ties from coarse wall time
+        self._clock = clock
+        self._uncommitted = 0
+
+    @staticmethod
+    def key(namespace: str, frame: np.ndarray) -> bytes:
+        """Content address of a frame under a detector namespace.
+
+        Args:
+            namespace: Output of namespace_digest()
+            frame: Image frame
+
+        Returns:
+            bytes: 16-byte key
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(namespace.encode())
+        digest.update(f"{frame.shape}{frame.dtype}".encode())
+        digest.update(np.ascontiguousarray(frame).data)
+        return digest.digest()
+
+    def get(self, key: bytes) -> Optional[List[Dict[str, Any]]]:
+        """Look up cached detections.
+
+        Returns:
+            Detections, or None on a miss
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT payload FROM detections WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._clock += 1
+            self._db.execute(
+                "UPDATE detections SET last_used = ? WHERE key = ?", (self._clock, key)
+            )
+            self._changed()
+        return decode_detections(row[0])
+
+    def put(self, key: bytes, detections: List[Dict[str, Any]]):
+        """Store detections for a key, evicting old entries if needed."""
+        payload = encode_detections(detections)
+        with self._lock:
+            self._clock += 1
+            previous = self._db.execute(
+                "SELECT LENGTH(payload) FROM detections WHERE key = ?", (key,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO detections (key, payload, last_used) "
+                "VALUES (?, ?, ?)",
+                (key, payload, self._clock),
+            )
+            if previous is None:
+                self._entries += 1
+            else:
+                self._bytes -= previous[0]
+            self._bytes += len(payload)
+            self._evict()
+            self._changed()
+
+    def _evict(self):
+        """Drop least recently used entries until within both limits."""
+        while self._entries > self.max_entries or self._bytes > self.max_bytes:
+            # Evict in chunks so a full cache does not evict on every put
+            count = max(self._entries - self.max_entries, self.max_entries // 20, 1)
+            rows = self._db.execute(
+                "SELECT key, LENGTH(payload) FROM detections "
+                "ORDER BY last_used LIMIT ?",
+                (count,),
+            ).fetchall()
+            if not rows:
+                break
+            self._db.executemany(
+                "DELETE FROM detections WHERE key = ?", [(key,) for key, _ in rows]
+            )
+            self._entries -= len(rows)
+            self._bytes -= sum(size for _, size in rows)
+            self.evictions += len(rows)
+
+    def _changed(self):
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self._db.commit()
+            self._uncommitted = 0
+
+    def flush(self):
+        """Commit pending changes."""
+        with self._lock:
+            self._db.commit()
+            self._uncommitted = 0
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._db.execute("DELETE FROM detections")
+            self._db.commit()
+            self._entries = self._bytes = self._uncommitted = 0
+
+    def close(self):
+        """Commit and close the database."""
+        with self._lock:
+            self._db.commit()
+            self._db.close()
+        logger.info(f"Detection cache closed: {self.stats()}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit, miss, eviction and size counters."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": self._entries,
+            "bytes": self._bytes,
+            "evictions": self.evictions,
+        }
@@ -1,7 +1,8 @@
 import cv2
 import numpy as np
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 import logging
+from .detection_cache import DetectionCache, namespace_digest
 
 logger = logging.getLogger(__name__)
 
@@ -9,8 +10,19 @@ logger = logging.getLogger(__name__)
 class FaceDetector:
     """Face detection using OpenCV Haar Cascades."""
     
-    def __init__(self):
-        """Initialize the face detector."""
+    def __init__(self, detection_cache: Optional[DetectionCache] = None):
+        """
+        Initialize the face detector.
+        
+        Args:
+            detection_cache: Reuse detections for frames already processed
+        """
+        self.detection_cache = detection_cache
+        self.cache_namespace = namespace_digest(
+            detector="haar", cascade="haarcascade_frontalface_default.xml",
+            opencv=cv2.__version__, scale_factor=1.1, min_neighbors=5,
+            min_size=30
+        )
         try:
             # Load the face detection classifier
             self.face_cascade = cv2.CascadeClassifier(
@@ -40,35 +52,81 @@ class FaceDetector:
             return []
         
         try:
-            # Convert to grayscale for face detection
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            
-            # Detect faces
-            faces = self.face_cascade.detectMultiScale(
-                gray,
-                scaleFactor=1.1,
-                minNeighbors=5,
-                minSize=(30, 30),
-                flags=cv2.CASCADE_SCALE_IMAGE
-            )
-            
-            # Convert to our standard format
-            detections = []
-            for (x, y, w, h) in faces:
-                detection = {
-                    'bbox': [int(x), int(y), int(x + w), int(y + h)],
-                    'confidence': 0.9,  # Haar cascades don't provide confidence scores
-                    'class_id': 0,  # Face class
-                    'class_name': 'face'
-                }
-                detections.append(detection)
+            key = None
+            if self.detection_cache is not None:
+                key = self.detection_cache.key(self.cache_namespace, frame)
+                cached = self.detection_cache.get(key)
+                if cached is not None:
+                    return cached
             
+            gray = self.preprocess(frame)
+            faces = self.detect_faces_gray(gray)
+            detections = self.decode_faces(faces)
+            if key is not None:
+                self.detection_cache.put(key, detections)
             return detections
             
         except Exception as e:
             logger.error(f"Error during face detection: {e}")
             return []
     
+    def preprocess(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Convert a BGR frame to the grayscale image the cascade expects.
+        
+        Args:
+            frame: Input image frame
+            
+        Returns:
+            Grayscale image
+        """
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    
+    def detect_faces_gray(self, gray: np.ndarray,
+                          min_size: Tuple[int, int] = (30, 30),
+                          max_size: Optional[Tuple[int, int]] = None) -> np.ndarray:
+        """
+        Run the Haar cascade on a grayscale image.
+        
+        Args:
+            gray: Grayscale image from preprocess()
+            min_size: Smallest face searched for
+            max_size: Largest face searched for (default: no limit)
+            
+        Returns:
+            Raw (x, y, w, h) face rectangles
+        """
+        return self.face_cascade.detectMultiScale(
+            gray,
+            scaleFactor=1.1,
+            minNeighbors=5,
+            minSize=min_size,
+            maxSize=max_size or (0, 0),
+            flags=cv2.CASCADE_SCALE_IMAGE
+        )
+    
+    def decode_faces(self, faces: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Convert raw cascade rectangles to our standard detection format.
+        
+        Args:
+            faces: Raw (x, y, w, h) face rectangles
+            
+        Returns:
+            List of face detection dictionaries
+        """
+        detections = []
+        for (x, y, w, h) in faces:
+            detection = {
+                'bbox': [int(x), int(y), int(x + w), int(y + h)],
+                'confidence': 0.9,  # Haar cascades don't provide confidence scores
+                'class_id': 0,  # Face class
+                'class_name': 'face'
+            }
+            detections.append(detection)
+        
+        return detections
+    
     def draw_faces(self, frame: np.ndarray, faces: List[Dict[str, Any]]) -> np.ndarray:
         """
         Draw bounding boxes around detected faces.
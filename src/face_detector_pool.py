@@ -0,0 +1,167 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+import logging
+from .face_detector import FaceDetector
+from .geometry import batched_nms
+
+logger = logging.getLogger(__name__)
+
+
+class FaceDetectorPool:
+    """Share a fixed set of Haar cascades between camera threads.
+
+    A cv2.CascadeClassifier must not be used by two threads at once, so the
+    pool loads ``size`` FaceDetector instances up front and lends one to
+    each detectMultiScale call; callers block while all of them are busy.
+    detect_faces() is safe to call from any number of camera threads.
+
+    With ``bands`` > 1, tall frames are also split into horizontal bands
+    that are searched in parallel on the pool. Bands overlap by
+    ``overlap`` pixels and only look for faces up to that size, so every
+    such face lies wholly inside one band; larger faces come from one more
+    pass over the whole frame that starts the search at 2/3 of that size,
+    which skips the expensive fine scales. Faces found twice are merged
+    with NMS.
+
+    OpenCV also parallelizes a single detectMultiScale call internally;
+    with a pool sized to the cores, ``cv2.setNumThreads(1)`` avoids
+    oversubscribing them.
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        bands: int = 1,
+        overlap: int = 96,
+        detector_factory: Callable[[], FaceDetector] = FaceDetector,
+    ):
+        """Load the cascades.
+
+        Args:
+            size: Number of cascade instances (default: one per CPU)
+            bands: Horizontal bands per frame (1 disables splitting);
+                frames whose bands would be at most ``overlap`` pixels tall
+                are not split
+            overlap: Rows shared by neighbouring bands, and the largest
+                face searched for inside a band
+            detector_factory: Creates one FaceDetector per pool slot
+        """
+        self.size = max(1, size or os.cpu_count() or 1)
+        self.bands = max(1, bands)
+        self.overlap = max(1, overlap)
+        self._detectors = [detector_factory() for _ in range(self.size)]
+        self._free: queue.Queue = queue.Queue()
+        for detector in self._detectors:
+            self._free.put(detector)
+        self._executor = None
+        if self.bands > 1:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.size, thread_name_prefix="face-pool"
+            )
+        self._lock = threading.Lock()
+        self.frames = 0
+        self.faces = 0
+        self.searches = 0
+        self.wait_time = 0.0
+        logger.info(f"Face detector pool ready: {self.size} cascades")
+
+    def _search(
+        self,
+        gray: np.ndarray,
+        min_size: Tuple[int, int] = (30, 30),
+        max_size: Optional[Tuple[int, int]] = None,
+    ) -> np.ndarray:
+        """Run one detectMultiScale call on a borrowed cascade."""
+        start = time.perf_counter()
+        detector = self._free.get()
+        waited = time.perf_counter() - start
+        try:
+            faces = detector.detect_faces_gray(gray, min_size, max_size)
+        finally:
+            self._free.put(detector)
+        with self._lock:
+            self.searches += 1
+            self.wait_time += waited
+        return np.asarray(faces, dtype=np.int32).reshape(-1, 4)
+
+    def _search_bands(self, gray: np.ndarray) -> np.ndarray:
+        """Search overlapping bands and a coarse whole-frame pass in parallel."""
+        height = gray.shape[0]
+        edges = np.linspace(0, height, self.bands + 1).astype(int)
+        limit = (self.overlap, self.overlap)
+        jobs = []
+        for top, bottom in zip(edges[:-1].tolist(), edges[1:].tolist()):
+            bottom = min(height, bottom + self.overlap)
+            band = gray[top:bottom]
+            jobs.append(
+                (top, self._executor.submit(self._search, band, (30, 30), limit))
+            )
+        large = max(30, self.overlap * 2 // 3)
+        jobs.append((0, self._executor.submit(self._search, gray, (large, large))))
+
+        faces = np.concatenate(
+            [job.result() + np.array([0, top, 0, 0], np.int32) for top, job in jobs]
+        )
+        if len(faces) < 2:
+            return faces
+        boxes = np.concatenate([faces[:, :2], faces[:, :2] + faces[:, 2:]], axis=1)
+        # Larger faces first, so the most complete box of a face survives
+        keep = batched_nms(boxes.astype(np.float32), boxes[:, 2] - boxes[:, 0], None)
+        return faces[np.sort(keep)]
+
+    def detect_faces(self, frame: np.ndarray) -> List[Dict[str, Any]]:
+        """Detect faces in a frame; safe to call from several threads.
+
+        Args:
+            frame: BGR frame
+
+        Returns:
+            List of face detection dictionaries
+        """
+        if frame is None:
+            return []
+        try:
+            # Preprocessing and decoding do not touch the cascade
+            detector = self._detectors[0]
+            gray = detector.preprocess(frame)
+            if self._executor is None or gray.shape[0] // self.bands <= self.overlap:
+                faces = self._search(gray)
+            else:
+                faces = self._search_bands(gray)
+            detections = detector.decode_faces(faces)
+        except Exception as e:
+            logger.error(f"Error during pooled face detection: {e}")
+            return []
+        with self._lock:
+            self.frames += 1
+            self.faces += len(detections)
+        return detections
+
+    def draw_faces(self, frame: np.ndarray, faces: List[Dict[str, Any]]) -> np.ndarray:
+        """Draw face boxes, see FaceDetector.draw_faces()."""
+        return self._detectors[0].draw_faces(frame, faces)
+
+    def close(self):
+        """Stop the band workers."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get frame, face and search counts and the time spent waiting."""
+        with self._lock:
+            return {
+                "size": self.size,
+                "in_use": self.size - self._free.qsize(),
+                "frames": self.frames,
+                "faces": self.faces,
+                "searches": self.searches,
+                "mean_wait_ms": (
+                    self.wait_time / self.searches * 1000.0 if self.searches else 0.0
+                ),
+            }
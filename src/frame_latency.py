@@ -0,0 +1,198 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+import logging
+from .metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds for frame ages, from a fraction of a frame
+# interval to multi-second backlogs
+AGE_BUCKETS = (
+    0.01,
+    0.02,
+    0.033,
+    0.05,
+    0.075,
+    0.1,
+    0.15,
+    0.2,
+    0.3,
+    0.5,
+    0.75,
+    1.0,
+    2.0,
+    5.0,
+)
+
+
+class FrameInfo:
+    """Capture time and sequence number of one camera frame.
+
+    ``timestamp`` is on the time.monotonic() clock: the driver's capture
+    time when the camera reports one on that clock (V4L2 buffers do), else
+    the time the read returned. ``clock`` says which.
+    """
+
+    __slots__ = ("camera", "sequence", "timestamp", "clock", "position_ms")
+
+    def __init__(
+        self,
+        camera: str,
+        sequence: int,
+        timestamp: float,
+        clock: str = "monotonic",
+        position_ms: Optional[float] = None,
+    ):
+        self.camera = camera
+        self.sequence = sequence
+        self.timestamp = timestamp
+        self.clock = clock
+        self.position_ms = position_ms
+
+    def age(self, now: Optional[float] = None) -> float:
+        """Seconds since capture."""
+        return (time.monotonic() if now is None else now) - self.timestamp
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain fields for published results.
+
+        ``timestamp`` is only comparable with time.monotonic() on the same
+        host; ``captured_at`` is the equivalent Unix time.
+        """
+        return {
+            "sequence": self.sequence,
+            "timestamp": self.timestamp,
+            "captured_at": time.time() - self.age(),
+            "clock": self.clock,
+            "position_ms": self.position_ms,
+        }
+
+
+class LatencyTracker:
+    """Age of frames when their results reach each output, per camera.
+
+    Outputs (detections ready, each result sink, the live view, the
+    recording, the window) report the capture timestamp of the frame they
+    emitted. Ages go into the ``frame_age_seconds`` histogram labelled by
+    camera and output, so queueing, batching or frame skipping show up as a
+    shifted distribution rather than a stage time. With a ``target``, ages
+    above it are also counted in ``frame_age_over_target_total``.
+
+    observe() may be called from any thread.
+    """
+
+    def __init__(
+        self, metrics: Optional[MetricsRegistry] = None, target: Optional[float] = None
+    ):
+        """Initialize the tracker.
+
+        Args:
+            metrics: Registry to record into (default: a new one)
+            target: Age in seconds that outputs should stay under
+        """
+        self.metrics = metrics or MetricsRegistry()
+        self.target = target
+        self._ages = self.metrics.histogram(
+            "frame_age_seconds",
+            "Age of frames at each output, measured from capture",
+            ("camera", "output"),
+            AGE_BUCKETS,
+        )
+        self._over_target = self.metrics.counter(
+            "frame_age_over_target_total",
+            "Frames older than the latency target at an output",
+            ("camera", "output"),
+        )
+        # (camera, output) -> [histogram child, over-target child, max age]
+        self._series: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def _get_series(self, camera: str, output: str) -> list:
+        key = (camera, output)
+        series = self._series.get(key)
+        if series is None:
+            with self._lock:
+                series = self._series.get(key)
+                if series is None:
+                    series = [
+                        self._ages.labels(camera=camera, output=output),
+                        self._over_target.labels(camera=camera, output=output),
+                        0.0,
+                    ]
+                    self._series[key] = series
+        return series
+
+    def observe_timestamp(
+        self,
+        camera: str,
+        timestamp: float,
+        output: str,
+        now: Optional[float] = None,
+    ) -> float:
+        """Record the age of a frame captured at ``timestamp``.
+
+        Args:
+            camera: Camera label
+            timestamp: Capture time on the time.monotonic() clock
+            output: Output name, e.g. "display" or "sink:JsonLinesSink"
+            now: Time of output (default: time.monotonic())
+
+        Returns:
+            float: The age in seconds
+        """
+        age = (time.monotonic() if now is None else now) - timestamp
+        series = self._get_series(camera, output)
+        series[0].observe(age)
+        if self.target is not None and age > self.target:
+            series[1].inc()
+        if age > series[2]:
+            series[2] = age
+        return age
+
+    def observe(self, info: FrameInfo, output: str, now: Optional[float] = None):
+        """Record the age of a frame at an output, see observe_timestamp()."""
+        return self.observe_timestamp(info.camera, info.timestamp, output, now)
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Age distributions per camera and output.
+
+        Returns:
+            dict: camera -> output -> count, mean, max and p50/p95/p99
+            estimates in seconds, plus the count over the target
+        """
+        with self._lock:
+            items = list(self._series.items())
+        result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (camera, output), (ages, over_target, peak) in sorted(items):
+            stats = {
+                "count": ages.count,
+                "mean": ages.sum / ages.count if ages.count else None,
+                "max": peak,
+                "over_target": over_target.value,
+            }
+            for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+                # Interpolated inside buckets, so may overshoot the maximum
+                estimate = ages.quantile(q)
+                stats[name] = None if estimate is None else min(estimate, peak)
+            result.setdefault(camera, {})[output] = stats
+        return result
+
+    def format_summary(self) -> str:
+        """One log line per camera with the p50/p95/max age of each output."""
+        lines = []
+        for camera, outputs in self.summary().items():
+            parts = []
+            for output, stats in outputs.items():
+                if not stats["count"]:
+                    continue
+                part = (
+                    f"{output} p50 {stats['p50'] * 1000:.0f} ms, "
+                    f"p95 {stats['p95'] * 1000:.0f} ms, "
+                    f"max {stats['max'] * 1000:.0f} ms"
+                )
+                if self.target is not None:
+                    part += f", {stats['over_target']:.0f}/{stats['count']} late"
+                parts.append(part)
+            lines.append(f"Frame age camera {camera}: " + "; ".join(parts))
+        return "\n".join(lines)
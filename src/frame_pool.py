@@ -0,0 +1,161 @@
+import threading
+import numpy as np
+from typing import Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PooledFrame:
+    """A reference-counted frame buffer borrowed from a FramePool."""
+
+    def __init__(self, pool: "FramePool", array: np.ndarray):
+        """Wrap a pool buffer.
+
+        Args:
+            pool: Pool the buffer is returned to
+            array: Preallocated image buffer
+        """
+        self.pool = pool
+        self.array = array
+        # Capture timestamp and sequence number, set by the camera
+        self.info = None
+        self._refcount = 0
+        self._lock = threading.Lock()
+
+    @property
+    def refcount(self) -> int:
+        """Number of consumers currently holding the frame."""
+        return self._refcount
+
+    def retain(self) -> "PooledFrame":
+        """Register an additional consumer of the frame.
+
+        Returns:
+            PooledFrame: The same frame, for chaining
+        """
+        with self._lock:
+            if self._refcount <= 0:
+                raise RuntimeError(
+                    "Cannot retain a frame that was returned to the pool"
+                )
+            self._refcount += 1
+        return self
+
+    def release(self):
+        """Drop one reference; the buffer returns to the pool at zero."""
+        with self._lock:
+            if self._refcount <= 0:
+                raise RuntimeError("Frame released more times than retained")
+            self._refcount -= 1
+            returned = self._refcount == 0
+        if returned:
+            self.pool._return(self)
+
+    def __enter__(self) -> np.ndarray:
+        return self.array
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
+class FramePool:
+    """Pool of preallocated frame buffers reused across the capture pipeline.
+
+    Buffers are handed out with a reference count of one. Every extra
+    consumer (inference, renderer, writer) calls ``retain()`` and each one
+    calls ``release()`` when done; the buffer is reused once all of them
+    have released it, so steady-state capture performs no allocations.
+    """
+
+    def __init__(
+        self,
+        shape: Tuple[int, ...],
+        dtype=np.uint8,
+        size: int = 4,
+        max_size: Optional[int] = None,
+    ):
+        """Initialize the frame pool.
+
+        Args:
+            shape: Shape of each buffer, e.g. (height, width, 3)
+            dtype: Buffer dtype
+            size: Number of buffers allocated up front
+            max_size: Upper bound on buffers; acquire() blocks once reached
+                (default: same as size)
+        """
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.max_size = max(size, max_size or size)
+        self._free = [np.empty(self.shape, dtype=self.dtype) for _ in range(size)]
+        self._allocated = size
+        self._cond = threading.Condition()
+
+    @property
+    def allocated(self) -> int:
+        """Total number of buffers ever allocated by the pool."""
+        return self._allocated
+
+    @property
+    def available(self) -> int:
+        """Number of buffers currently free."""
+        return len(self._free)
+
+    @property
+    def in_use(self) -> int:
+        """Number of buffers currently held by consumers."""
+        return self._allocated - len(self._free)
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[PooledFrame]:
+        """Borrow a buffer from the pool.
+
+        Args:
+            timeout: Seconds to wait for a free buffer once the pool is
+                exhausted (None waits forever)
+
+        Returns:
+            PooledFrame with a reference count of one, or None on timeout
+        """
+        with self._cond:
+            if not self._free and self._allocated < self.max_size:
+                self._allocated += 1
+                logger.debug(f"Frame pool grew to {self._allocated} buffers")
+                array = np.empty(self.shape, dtype=self.dtype)
+            else:
+                if not self._cond.wait_for(lambda: self._free, timeout=timeout):
+                    logger.warning("Timed out waiting for a free frame buffer")
+                    return None
+                array = self._free.pop()
+
+        frame = PooledFrame(self, array)
+        frame._refcount = 1
+        return frame
+
+    def _return(self, frame: PooledFrame):
+        """Put a fully released buffer back on the free list."""
+        array = frame.array
+        frame.array = None
+        if array.shape != self.shape or array.dtype != self.dtype:
+            # The capture backend replaced the buffer; drop it instead of
+            # handing out a wrongly shaped frame.
+            with self._cond:
+                self._allocated -= 1
+                self._cond.notify()
+            return
+        with self._cond:
+            self._free.append(array)
+            self._cond.notify()
+
+    def stats(self) -> dict:
+        """Get pool usage statistics.
+
+        Returns:
+            dict: Allocation and usage counts
+        """
+        with self._cond:
+            return {
+                "allocated": self._allocated,
+                "available": len(self._free),
+                "in_use": self._allocated - len(self._free),
+                "max_size": self.max_size,
+            }
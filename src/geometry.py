@@ -0,0 +1,279 @@
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Overlap measures accepted by overlap_matrix() and batched_nms()
+OVERLAP_METRICS = ("iou", "ios")
+
+# A scale factor for both axes, or separate (x, y) factors
+Scale = Union[float, Tuple[float, float]]
+
+
+def boxes_from_detections(detections: Sequence[Dict[str, Any]]) -> np.ndarray:
+    """Stack the ``bbox`` of detection dictionaries into an (N, 4) array."""
+    if not detections:
+        return np.zeros((0, 4), dtype=np.float32)
+    return np.array([d["bbox"] for d in detections], dtype=np.float32)
+
+
+def box_areas(boxes: np.ndarray) -> np.ndarray:
+    """Areas of (N, 4) xyxy boxes; inverted boxes count as empty."""
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    return np.prod(np.clip(boxes[:, 2:] - boxes[:, :2], 0, None), axis=1)
+
+
+def overlap_matrix(
+    a: np.ndarray, b: Optional[np.ndarray] = None, metric: str = "iou"
+) -> np.ndarray:
+    """Pairwise overlap of two sets of xyxy boxes.
+
+    Args:
+        a: (N, 4) boxes
+        b: (M, 4) boxes (default: ``a`` against itself)
+        metric: "iou" (intersection over union) or "ios" (intersection over
+            the smaller box, which also matches a box cut off at a crop
+            edge with the complete box)
+
+    Returns:
+        (N, M) float32 array; pairs involving an empty box score 0
+    """
+    if metric not in OVERLAP_METRICS:
+        raise ValueError(f"Unknown overlap metric {metric!r}")
+    a = np.asarray(a, dtype=np.float32).reshape(-1, 4)
+    b = a if b is None else np.asarray(b, dtype=np.float32).reshape(-1, 4)
+    # Per-coordinate broadcasting keeps temporaries at (N, M), not (N, M, 2)
+    width = np.minimum(a[:, None, 2], b[None, :, 2]) - np.maximum(
+        a[:, None, 0], b[None, :, 0]
+    )
+    height = np.minimum(a[:, None, 3], b[None, :, 3]) - np.maximum(
+        a[:, None, 1], b[None, :, 1]
+    )
+    inter = np.clip(width, 0, None) * np.clip(height, 0, None)
+    area_a, area_b = box_areas(a), box_areas(b)
+    if metric == "ios":
+        denominator = np.minimum(area_a[:, None], area_b[None, :])
+    else:
+        denominator = area_a[:, None] + area_b[None, :] - inter
+    return inter / np.maximum(denominator, 1e-9)
+
+
+def iou_matrix(a: np.ndarray, b: Optional[np.ndarray] = None) -> np.ndarray:
+    """Pairwise intersection over union, see overlap_matrix()."""
+    return overlap_matrix(a, b, "iou")
+
+
+def _overlap_with(
+    index: int, others: np.ndarray, columns: Tuple[np.ndarray, ...], metric: str
+) -> np.ndarray:
+    """Overlap of box ``index`` with boxes ``others``.
+
+    ``columns`` holds precomputed x1, y1, x2, y2 and area arrays, which
+    keeps the per-step cost of greedy loops to a few small array ops.
+    """
+    x1, y1, x2, y2, area = columns
+    width = np.minimum(x2[index], x2[others]) - np.maximum(x1[index], x1[others])
+    height = np.minimum(y2[index], y2[others]) - np.maximum(y1[index], y1[others])
+    inter = np.clip(width, 0, None) * np.clip(height, 0, None)
+    if metric == "ios":
+        denominator = np.minimum(area[index], area[others])
+    else:
+        denominator = area[index] + area[others] - inter
+    return inter / np.maximum(denominator, 1e-9)
+
+
+def _columns(boxes: np.ndarray) -> Tuple[np.ndarray, ...]:
+    x1, y1, x2, y2 = (np.ascontiguousarray(column) for column in boxes.T)
+    return x1, y1, x2, y2, box_areas(boxes)
+
+
+def batched_nms(
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    class_ids: Optional[np.ndarray] = None,
+    iou_threshold: float = 0.5,
+    metric: str = "iou",
+) -> np.ndarray:
+    """Class-aware greedy non-maximum suppression.
+
+    Classes are suppressed independently, and each kept box is compared
+    against the remaining candidates of its class in one vectorized step,
+    so memory stays O(N) rather than the O(N^2) of a full overlap matrix.
+
+    Args:
+        boxes: (N, 4) xyxy boxes
+        scores: (N,) ranking scores, highest kept first
+        class_ids: (N,) class ids; only boxes of the same class suppress
+            each other (default: all one class)
+        iou_threshold: Overlap above which the lower-ranked box is dropped
+        metric: "iou" or "ios", see overlap_matrix()
+
+    Returns:
+        Indices of kept boxes, in decreasing score order
+    """
+    if metric not in OVERLAP_METRICS:
+        raise ValueError(f"Unknown overlap metric {metric!r}")
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    if len(boxes) == 0:
+        return np.zeros(0, dtype=int)
+    scores = np.asarray(scores).reshape(-1)
+    columns = _columns(boxes)
+    order = np.argsort(-scores, kind="stable")
+    if class_ids is None:
+        groups = [order]
+    else:
+        classes = np.asarray(class_ids).reshape(-1)[order]
+        # Stable sort by class keeps each group in decreasing score order
+        by_class = np.argsort(classes, kind="stable")
+        bounds = np.flatnonzero(np.diff(classes[by_class])) + 1
+        groups = np.split(order[by_class], bounds)
+
+    keep = []
+    for candidates in groups:
+        while candidates.size:
+            best, rest = candidates[0], candidates[1:]
+            keep.append(best)
+            overlap = _overlap_with(best, rest, columns, metric)
+            candidates = rest[overlap <= iou_threshold]
+    keep = np.array(keep, dtype=int)
+    # Back to overall score order (positions in ``order`` are ranks)
+    rank = np.empty(len(order), dtype=int)
+    rank[order] = np.arange(len(order))
+    return keep[np.argsort(rank[keep])]
+
+
+def weighted_box_fusion(
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    class_ids: Optional[np.ndarray] = None,
+    iou_threshold: float = 0.55,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Merge overlapping same-class boxes into score-weighted averages.
+
+    Unlike NMS, which keeps the best box of a cluster, fusion averages
+    every box of the cluster weighted by its score, which gives steadier
+    boxes when several crops, tiles or models report the same object.
+    Boxes are visited in decreasing score order and join the cluster of
+    their class whose fused box overlaps them most, if by more than
+    ``iou_threshold``.
+
+    Args:
+        boxes: (N, 4) xyxy boxes
+        scores: (N,) confidences
+        class_ids: (N,) class ids (default: all one class)
+        iou_threshold: IoU above which a box joins a cluster
+
+    Returns:
+        (fused boxes (K, 4), mean cluster scores (K,), class ids (K,)),
+        in decreasing order of each cluster's best score
+    """
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    scores = np.asarray(scores, dtype=np.float32).reshape(-1)
+    classes = (
+        np.zeros(len(boxes), dtype=np.int64)
+        if class_ids is None
+        else np.asarray(class_ids).reshape(-1)
+    )
+    count = len(boxes)
+    # Fused boxes as columns plus area, appended in place as clusters form
+    fused = np.zeros((5, count + 1), dtype=np.float32)
+    fused_classes = np.zeros(count, dtype=classes.dtype)
+    weighted_sum = np.zeros((count, 4), dtype=np.float64)
+    score_sum = np.zeros(count, dtype=np.float64)
+    members = np.zeros(count, dtype=np.int64)
+    areas = box_areas(boxes)
+    clusters = 0
+
+    for index in np.argsort(-scores, kind="stable").tolist():
+        target = -1
+        if clusters:
+            # The candidate goes into the spare last column of ``fused``
+            fused[:4, count] = boxes[index]
+            fused[4, count] = areas[index]
+            others = np.flatnonzero(fused_classes[:clusters] == classes[index])
+            if others.size:
+                overlap = _overlap_with(count, others, tuple(fused), "iou")
+                best = int(np.argmax(overlap))
+                if overlap[best] > iou_threshold:
+                    target = int(others[best])
+        if target < 0:
+            target = clusters
+            fused_classes[target] = classes[index]
+            clusters += 1
+        weighted_sum[target] += boxes[index] * scores[index]
+        score_sum[target] += scores[index]
+        members[target] += 1
+        box = weighted_sum[target] / max(score_sum[target], 1e-9)
+        fused[:4, target] = box
+        fused[4, target] = max(box[2] - box[0], 0) * max(box[3] - box[1], 0)
+
+    mean_scores = (score_sum[:clusters] / members[:clusters]).astype(np.float32)
+    return (
+        np.ascontiguousarray(fused[:4, :clusters].T),
+        mean_scores,
+        fused_classes[:clusters],
+    )
+
+
+def clip_boxes(boxes: np.ndarray, width: float, height: float) -> np.ndarray:
+    """Clip xyxy boxes to a ``width`` x ``height`` frame."""
+    boxes = np.asarray(boxes).reshape(-1, 4)
+    limits = np.array([width, height, width, height], dtype=boxes.dtype)
+    return np.clip(boxes, 0, limits)
+
+
+def expand_boxes(
+    boxes: np.ndarray, margin: float, width: float, height: float
+) -> np.ndarray:
+    """Grow boxes by ``margin`` of their size on every side, then clip."""
+    boxes = np.asarray(boxes).reshape(-1, 4)
+    size = boxes[:, 2:] - boxes[:, :2]
+    pad = (size * margin).astype(boxes.dtype)
+    grown = np.concatenate([boxes[:, :2] - pad, boxes[:, 2:] + pad], axis=1)
+    return clip_boxes(grown, width, height)
+
+
+def _scale_vector(scale: Scale) -> np.ndarray:
+    sx, sy = scale if isinstance(scale, (tuple, list)) else (scale, scale)
+    return np.array([sx, sy, sx, sy], dtype=np.float64)
+
+
+def crop_to_frame(
+    boxes: np.ndarray, crop: Sequence[float], scale: Scale = 1.0
+) -> np.ndarray:
+    """Map boxes from crop space into frame space.
+
+    Args:
+        boxes: (N, 4) boxes in the coordinates of a (possibly resized) crop
+        crop: x1, y1, x2, y2 of the crop in the frame
+        scale: Factor the crop was resized by before detection
+
+    Returns:
+        (N, 4) boxes in frame coordinates, same dtype as ``boxes``
+    """
+    boxes = np.asarray(boxes).reshape(-1, 4)
+    x1, y1 = crop[0], crop[1]
+    mapped = boxes / _scale_vector(scale) + np.array([x1, y1, x1, y1])
+    return mapped.astype(boxes.dtype)
+
+
+def frame_to_crop(
+    boxes: np.ndarray, crop: Sequence[float], scale: Scale = 1.0
+) -> np.ndarray:
+    """Map frame-space boxes into a crop's coordinates (inverse of
+    crop_to_frame()); boxes outside the crop are not clipped."""
+    boxes = np.asarray(boxes).reshape(-1, 4)
+    x1, y1 = crop[0], crop[1]
+    mapped = (boxes - np.array([x1, y1, x1, y1])) * _scale_vector(scale)
+    return mapped.astype(boxes.dtype)
+
+
+def with_boxes(
+    detections: Sequence[Dict[str, Any]], boxes: np.ndarray
+) -> List[Dict[str, Any]]:
+    """Copy detections with their ``bbox`` replaced by rows of ``boxes``."""
+    return [
+        dict(detection, bbox=bbox)
+        for detection, bbox in zip(detections, np.asarray(boxes).tolist())
+    ]
@@ -0,0 +1,263 @@
+import os
+import tempfile
+import time
+import cv2
+import numpy as np
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+from .geometry import boxes_from_detections
+
+logger = logging.getLogger(__name__)
+
+# Longest gap between updates credited as dwell time; longer gaps (camera
+# reconnects, stalls) would otherwise paint whatever was last seen
+MAX_UPDATE_INTERVAL = 1.0
+
+# Renormalize the lazily decayed grid before its scale underflows float32
+_MIN_SCALE = 1e-20
+
+
+class OccupancyHeatmap:
+    """Exponentially decaying dwell-time heatmap on a downsampled grid.
+
+    Every update adds the time since the previous update to the cells
+    covered by each box, so a cell's value is the object-seconds spent
+    there, with older time fading by half every ``half_life`` seconds. All
+    boxes of a frame are splatted at once through a summed-area table: four
+    corner increments per box, then one integral image over the grid.
+
+    Decay is applied lazily by growing the weight of new contributions
+    instead of rescaling the grid every frame, so memory is two grids and
+    the per-frame cost depends only on the grid size and box count, never on
+    how long the heatmap has been running.
+    """
+
+    def __init__(
+        self,
+        cell_size: int = 8,
+        half_life: Optional[float] = 300.0,
+        classes: Optional[Iterable[str]] = ("person",),
+        snapshot_path: Optional[str] = None,
+        snapshot_interval: float = 60.0,
+    ):
+        """Initialize the heatmap; the grid is sized on the first update.
+
+        Args:
+            cell_size: Frame pixels per grid cell along each axis
+            half_life: Seconds for accumulated time to fade by half (None:
+                never fade)
+            classes: Only count these class names (None: all)
+            snapshot_path: Write snapshots here; ``.npy`` stores the raw
+                grid, any image extension a colorized rendering
+            snapshot_interval: Seconds between snapshots
+        """
+        self.cell_size = max(1, int(cell_size))
+        self.half_life = half_life
+        self.classes = set(classes) if classes is not None else None
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+
+        self.frame_size: Optional[Tuple[int, int]] = None
+        self._grid: Optional[np.ndarray] = None
+        self._corners: Optional[np.ndarray] = None
+        # True heat is _grid * _scale
+        self._scale = 1.0
+        self._last_update: Optional[float] = None
+        self._last_snapshot: Optional[float] = None
+        self.updates = 0
+        self.snapshots = 0
+
+    @property
+    def grid_shape(self) -> Optional[Tuple[int, int]]:
+        """(rows, columns) of the grid, or None before the first update."""
+        return None if self._grid is None else self._grid.shape
+
+    def _allocate(self, frame_size: Tuple[int, int]):
+        width, height = frame_size
+        rows = -(-height // self.cell_size)
+        columns = -(-width // self.cell_size)
+        if self._grid is not None:
+            logger.warning(
+                f"Frame size changed from {self.frame_size} to {frame_size}, "
+                "resetting heatmap"
+            )
+        self.frame_size = (width, height)
+        self._grid = np.zeros((rows, columns), dtype=np.float32)
+        # Corner increments, one spare row and column for the far edges
+        self._corners = np.zeros((rows + 1, columns + 1), dtype=np.float32)
+        self._scale = 1.0
+
+    def _decay_factor(self, elapsed: float) -> float:
+        if not self.half_life or elapsed <= 0:
+            return 1.0
+        return 0.5 ** (elapsed / self.half_life)
+
+    def update(
+        self,
+        detections: List[Dict[str, Any]],
+        frame_size: Tuple[int, int],
+        timestamp: Optional[float] = None,
+    ) -> int:
+        """Add one frame of detections.
+
+        Call for every processed frame, including frames without
+        detections, so that time is credited correctly.
+
+        Args:
+            detections: Detections of the frame
+            frame_size: (width, height) of the frame
+            timestamp: Frame time in seconds (default: time.monotonic())
+
+        Returns:
+            int: Number of boxes added
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+        if self.frame_size != tuple(frame_size):
+            self._allocate(frame_size)
+        elapsed = 0.0
+        if self._last_update is not None:
+            elapsed = min(max(now - self._last_update, 0.0), MAX_UPDATE_INTERVAL)
+        self._last_update = now
+        self.updates += 1
+
+        self._scale *= self._decay_factor(elapsed)
+        if self._scale < _MIN_SCALE:
+            self._grid *= self._scale
+            self._scale = 1.0
+
+        if self.classes is not None:
+            detections = [d for d in detections if d["class_name"] in self.classes]
+        if detections and elapsed > 0:
+            self._splat(boxes_from_detections(detections), elapsed / self._scale)
+
+        if self.snapshot_path:
+            if self._last_snapshot is None:
+                self._last_snapshot = now
+            elif now - self._last_snapshot >= self.snapshot_interval:
+                self._last_snapshot = now
+                self.save(self.snapshot_path)
+        return len(detections)
+
+    def _splat(self, boxes: np.ndarray, weight: float):
+        """Add ``weight`` to every cell covered by each box."""
+        rows, columns = self._grid.shape
+        cells = boxes / self.cell_size
+        x1 = np.clip(np.floor(cells[:, 0]), 0, columns).astype(np.intp)
+        y1 = np.clip(np.floor(cells[:, 1]), 0, rows).astype(np.intp)
+        x2 = np.clip(np.ceil(cells[:, 2]), 0, columns).astype(np.intp)
+        y2 = np.clip(np.ceil(cells[:, 3]), 0, rows).astype(np.intp)
+        visible = (x2 > x1) & (y2 > y1)
+        x1, y1, x2, y2 = x1[visible], y1[visible], x2[visible], y2[visible]
+
+        stride = columns + 1
+        index = np.concatenate(
+            [y1 * stride + x1, y1 * stride + x2, y2 * stride + x1, y2 * stride + x2]
+        )
+        signs = np.repeat(np.array([1, -1, -1, 1], dtype=np.float32), len(x1))
+        self._corners.fill(0)
+        np.add.at(self._corners.reshape(-1), index, signs)
+        # Box counts per cell are small integers, exact in float32
+        table = cv2.integral(self._corners, sdepth=cv2.CV_32F)
+        self._grid += table[1:-1, 1:-1] * np.float32(weight)
+
+    def heat(self) -> np.ndarray:
+        """Current dwell time per cell in object-seconds, as a new array."""
+        if self._grid is None:
+            return np.zeros((0, 0), dtype=np.float32)
+        return self._grid * np.float32(self._scale)
+
+    def _levels(self) -> np.ndarray:
+        """Heat as uint8 levels relative to the hottest cell."""
+        heat = self.heat()
+        peak = float(heat.max()) if heat.size else 0.0
+        if peak <= 0:
+            return np.zeros(heat.shape, dtype=np.uint8)
+        return (heat * (255.0 / peak)).astype(np.uint8)
+
+    def render(self, size: Optional[Tuple[int, int]] = None) -> np.ndarray:
+        """Colorize the heatmap, normalized to its hottest cell.
+
+        Args:
+            size: (width, height) to resize to (default: the grid size)
+
+        Returns:
+            BGR uint8 image; cells never visited are black
+        """
+        if self._grid is None:
+            width, height = size or (1, 1)
+            return np.zeros((height, width, 3), dtype=np.uint8)
+        levels = self._levels()
+        image = cv2.applyColorMap(levels, cv2.COLORMAP_JET)
+        image[levels == 0] = 0
+        if size is not None:
+            image = cv2.resize(image, tuple(size), interpolation=cv2.INTER_LINEAR)
+        return image
+
+    def overlay(self, frame: np.ndarray, alpha: float = 0.4) -> np.ndarray:
+        """Blend the heatmap onto a frame in place; cold areas stay as is."""
+        if self._grid is None:
+            return frame
+        height, width = frame.shape[:2]
+        # Colorize and threshold at grid size; only the blend is full size
+        levels = self._levels()
+        colored = cv2.resize(
+            cv2.applyColorMap(levels, cv2.COLORMAP_JET),
+            (width, height),
+            interpolation=cv2.INTER_LINEAR,
+        )
+        hot = cv2.resize(
+            (levels > 0).view(np.uint8),
+            (width, height),
+            interpolation=cv2.INTER_NEAREST,
+        )
+        blended = cv2.addWeighted(frame, 1.0 - alpha, colored, alpha, 0)
+        cv2.copyTo(blended, hot, frame)
+        return frame
+
+    def save(self, path: str) -> bool:
+        """Write the heatmap atomically.
+
+        Args:
+            path: ``.npy`` for the raw float32 grid, otherwise an image
+                format cv2.imwrite() supports, rendered at frame size
+
+        Returns:
+            bool: True if written, False otherwise
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        extension = os.path.splitext(path)[1].lower()
+        staging = None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            # Write next to the destination so readers never see a partial file
+            fd, staging = tempfile.mkstemp(dir=directory, suffix=".partial" + extension)
+            os.close(fd)
+            if extension == ".npy":
+                np.save(staging, self.heat())
+            elif not cv2.imwrite(staging, self.render(self.frame_size)):
+                raise OSError(f"cannot encode {extension or 'image'}")
+            os.replace(staging, path)
+        except (OSError, cv2.error) as e:
+            logger.error(f"Failed to save heatmap to {path}: {e}")
+            if staging is not None and os.path.exists(staging):
+                os.remove(staging)
+            return False
+        self.snapshots += 1
+        logger.debug(f"Saved heatmap snapshot to {path}")
+        return True
+
+    def close(self):
+        """Write a final snapshot if snapshots are enabled."""
+        if self.snapshot_path and self._grid is not None:
+            self.save(self.snapshot_path)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get grid size, update/snapshot counts and the hottest cell."""
+        heat = self.heat()
+        return {
+            "grid": self.grid_shape,
+            "updates": self.updates,
+            "snapshots": self.snapshots,
+            "peak_seconds": float(heat.max()) if heat.size else 0.0,
+            "total_seconds": float(heat.sum()),
+        }
@@ -0,0 +1,310 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineExceeded(Exception):
+    """Raised by a request's future when it was dropped instead of run late."""
+
+
+class InferenceRequest:
+    """One frame waiting for inference."""
+
+    __slots__ = ("camera", "frame", "deadline", "submitted", "future")
+
+    def __init__(
+        self,
+        camera: str,
+        frame: np.ndarray,
+        deadline: float,
+        submitted: Optional[float] = None,
+    ):
+        self.camera = camera
+        self.frame = frame
+        self.deadline = deadline
+        self.submitted = time.monotonic() if submitted is None else submitted
+        self.future: Future = Future()
+
+
+class _CameraState:
+    """Per-camera queue, share of service and counters."""
+
+    def __init__(self, weight: float, budget: float):
+        self.weight = weight
+        self.budget = budget
+        self.pending: deque = deque()
+        # Inference seconds received, divided by weight
+        self.service = 0.0
+        self.submitted = 0
+        self.completed = 0
+        self.dropped_expired = 0
+        self.dropped_superseded = 0
+        self.deadline_misses = 0
+        self.latencies: deque = deque(maxlen=512)
+
+
+class InferenceScheduler:
+    """Share one detector between cameras with deadlines and fairness.
+
+    Cameras submit frames with a deadline (by default ``now + budget``).
+    A single worker thread repeatedly:
+
+    1. drops requests whose deadline has passed, failing their futures
+       with DeadlineExceeded instead of producing stale results;
+    2. picks the cameras that have not received more than their weighted
+       share of inference time (within ``fairness_window`` seconds);
+    3. fills a batch of up to ``max_batch`` requests in earliest-deadline
+       order, eligible cameras first, then anything else that is ready;
+    4. runs the batch through ``detect_batch`` in one call.
+
+    Results are delivered through the concurrent.futures.Future returned
+    by submit().
+    """
+
+    def __init__(
+        self,
+        detector,
+        max_batch: int = 4,
+        default_budget: float = 0.1,
+        fairness_window: float = 0.05,
+        latest_only: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            detector: Detector with detect_batch() (or detect_objects())
+            max_batch: Maximum frames per inference call
+            default_budget: Seconds from submission to deadline for cameras
+                registered without a budget
+            fairness_window: Weighted service (seconds) a camera may be
+                ahead of the least-served waiting camera and still be
+                scheduled first
+            latest_only: A new frame from a camera replaces its queued,
+                not yet started frame, so live feeds never wait behind
+                their own stale frames
+            clock: Time source for deadlines and charged inference time
+        """
+        self.detector = detector
+        self.max_batch = max_batch
+        self.default_budget = default_budget
+        self.fairness_window = fairness_window
+        self.latest_only = latest_only
+        self.clock = clock
+        self.batches = 0
+        self._cameras: Dict[str, _CameraState] = {}
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def register_camera(
+        self, camera: str, weight: float = 1.0, budget: Optional[float] = None
+    ):
+        """Register or update a camera.
+
+        Args:
+            camera: Camera name
+            weight: Relative share of inference time under contention
+            budget: Default latency budget in seconds for its requests
+        """
+        if weight <= 0:
+            raise ValueError("Camera weight must be positive")
+        with self._condition:
+            state = self._cameras.get(camera)
+            if state is None:
+                state = _CameraState(weight, budget or self.default_budget)
+                # Join at the current level of service rather than at zero,
+                # so a new camera does not monopolize the detector
+                waiting = [s.service for s in self._cameras.values() if s.pending]
+                state.service = min(waiting) if waiting else 0.0
+                self._cameras[camera] = state
+            else:
+                state.weight = weight
+                state.budget = budget or state.budget
+
+    def submit(
+        self, camera: str, frame: np.ndarray, deadline: Optional[float] = None
+    ) -> Future:
+        """Queue a frame for inference.
+
+        Args:
+            camera: Camera name (registered on first use with weight 1)
+            frame: Frame to run detection on
+            deadline: clock() time (time.monotonic() by default) by which
+                the result is needed
+                (default: now + the camera's budget)
+
+        Returns:
+            Future resolving to the frame's detections, or failing with
+            DeadlineExceeded if the request was dropped
+        """
+        if camera not in self._cameras:
+            self.register_camera(camera)
+        with self._condition:
+            state = self._cameras[camera]
+            now = self.clock()
+            if deadline is None:
+                deadline = now + state.budget
+            request = InferenceRequest(camera, frame, deadline, now)
+            if self.latest_only:
+                while state.pending:
+                    stale = state.pending.popleft()
+                    state.dropped_superseded += 1
+                    stale.future.set_exception(
+                        DeadlineExceeded(f"Superseded by a newer frame from {camera}")
+                    )
+            state.pending.append(request)
+            state.submitted += 1
+            self._condition.notify()
+        return request.future
+
+    def start(self):
+        """Start the worker thread."""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="inference-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the worker; queued requests fail with DeadlineExceeded."""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        with self._condition:
+            for state in self._cameras.values():
+                while state.pending:
+                    state.pending.popleft().future.set_exception(
+                        DeadlineExceeded("Scheduler stopped")
+                    )
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running and not self._has_pending():
+                    self._condition.wait()
+                if not self._running:
+                    return
+            self.run_once()
+
+    def _has_pending(self) -> bool:
+        return any(state.pending for state in self._cameras.values())
+
+    def _drop_expired(self, now: float):
+        """Fail every queued request whose deadline has passed."""
+        for camera, state in self._cameras.items():
+            # Deadlines are per request, so expired ones need not be in front
+            if not any(request.deadline <= now for request in state.pending):
+                continue
+            alive = deque()
+            for request in state.pending:
+                if request.deadline > now:
+                    alive.append(request)
+                    continue
+                state.dropped_expired += 1
+                request.future.set_exception(
+                    DeadlineExceeded(
+                        f"Deadline passed {now - request.deadline:.3f}s ago "
+                        f"for {camera}"
+                    )
+                )
+            state.pending = alive
+
+    def _select_batch(self, now: float) -> List[InferenceRequest]:
+        """Pick the next batch: EDF over cameras within their fair share."""
+        self._drop_expired(now)
+        waiting = [state for state in self._cameras.values() if state.pending]
+        if not waiting:
+            return []
+        least_served = min(state.service for state in waiting)
+        ready = []
+        for state in waiting:
+            eligible = state.service <= least_served + self.fairness_window
+            for request in state.pending:
+                ready.append((not eligible, request.deadline, request))
+        ready.sort(key=lambda item: (item[0], item[1]))
+        batch = [request for _, _, request in ready[: self.max_batch]]
+        for request in batch:
+            self._cameras[request.camera].pending.remove(request)
+        return batch
+
+    def run_once(self) -> int:
+        """Schedule and run one batch.
+
+        Returns:
+            int: Number of requests run
+        """
+        with self._condition:
+            batch = self._select_batch(self.clock())
+        if not batch:
+            return 0
+
+        start = self.clock()
+        try:
+            frames = [request.frame for request in batch]
+            if hasattr(self.detector, "detect_batch"):
+                results = self.detector.detect_batch(frames)
+            else:
+                results = [self.detector.detect_objects(frame) for frame in frames]
+        except Exception as e:
+            logger.error(f"Scheduled inference failed: {e}")
+            for request in batch:
+                request.future.set_exception(e)
+            return len(batch)
+        finished = self.clock()
+        share = (finished - start) / len(batch)
+
+        with self._condition:
+            self.batches += 1
+            for request, detections in zip(batch, results):
+                state = self._cameras[request.camera]
+                state.service += share / state.weight
+                state.completed += 1
+                state.latencies.append(finished - request.submitted)
+                if finished > request.deadline:
+                    state.deadline_misses += 1
+        for request, detections in zip(batch, results):
+            request.future.set_result(detections)
+        return len(batch)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-camera scheduling statistics.
+
+        Returns:
+            dict: camera -> submitted, completed, dropped (expired and
+            superseded), deadline misses (completed late), queue depth,
+            weighted service seconds and p50/p95 latency in ms
+        """
+        with self._condition:
+            result = {}
+            for camera, state in self._cameras.items():
+                latencies = np.asarray(state.latencies) * 1000.0
+                p50, p95 = (
+                    np.percentile(latencies, (50, 95)).tolist()
+                    if latencies.size
+                    else (None, None)
+                )
+                result[camera] = {
+                    "weight": state.weight,
+                    "submitted": state.submitted,
+                    "completed": state.completed,
+                    "dropped_expired": state.dropped_expired,
+                    "dropped_superseded": state.dropped_superseded,
+                    "deadline_misses": state.deadline_misses,
+                    "queued": len(state.pending),
+                    "service_s": state.service,
+                    "latency_p50_ms": p50,
+                    "latency_p95_ms": p95,
+                }
+            return result
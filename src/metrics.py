@@ -0,0 +1,361 @@
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds, spanning sub-millisecond capture to slow inference
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = ""):
+    """Render a Prometheus label set, e.g. ``{camera="0",stage="capture"}``."""
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value the way the Prometheus text format expects."""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Common behaviour for labelled metrics."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **labels):
+        """Get the child series for a label set.
+
+        Callers on hot paths should look the child up once and keep it, so
+        each update is a plain method call without any label hashing.
+        """
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _default(self):
+        """Child used when the metric has no labels."""
+        return self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def series(self) -> List[Tuple[Tuple[str, ...], object]]:
+        """Snapshot of (label values, child) pairs."""
+        with self._lock:
+            return list(self._children.items())
+
+
+class _CounterChild:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        """Increment the unlabelled counter."""
+        self._default().inc(amount)
+
+
+class _GaugeChild:
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, e.g. a queue depth."""
+
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        """Set the unlabelled gauge."""
+        self._default().set(value)
+
+
+class _HistogramChild:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by linear interpolation inside buckets."""
+        with self._lock:
+            counts = list(self.counts)
+            total = self.count
+        if total == 0:
+            return None
+        rank = q * total
+        cumulative = 0
+        lower = 0.0
+        for upper, count in zip(self.buckets + (float("inf"),), counts):
+            if count and cumulative + count >= rank:
+                if upper == float("inf"):
+                    return lower
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+            lower = upper
+        return lower
+
+
+class Histogram(_Metric):
+    """Distribution of observations in fixed cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Iterable[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        """Record an observation on the unlabelled histogram."""
+        self._default().observe(value)
+
+
+class MetricsRegistry:
+    """Collection of metrics with Prometheus text and dict exports."""
+
+    def __init__(self, namespace: str = "smartdet"):
+        """Initialize the registry.
+
+        Args:
+            namespace: Prefix prepended to every metric name
+        """
+        self.namespace = namespace
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        full_name = f"{self.namespace}_{name}" if self.namespace else name
+        with self._lock:
+            metric = self._metrics.get(full_name)
+            if metric is None:
+                metric = cls(full_name, *args, **kwargs)
+                self._metrics[full_name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(
+                    f"Metric {full_name} already registered as {metric.kind}"
+                )
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames=()) -> Counter:
+        """Get or create a counter."""
+        return self._get_or_create(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames=()) -> Gauge:
+        """Get or create a gauge."""
+        return self._get_or_create(Gauge, name, help_text, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames=(),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets)
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text ending with a newline
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for values, child in metric.series():
+                labels = _format_labels(metric.labelnames, values)
+                if isinstance(metric, Histogram):
+                    cumulative = 0
+                    bounds = metric.buckets + (float("inf"),)
+                    for upper, count in zip(bounds, list(child.counts)):
+                        cumulative += count
+                        le = f'le="{_format_value(upper)}"'
+                        bucket_labels = _format_labels(metric.labelnames, values, le)
+                        lines.append(
+                            f"{metric.name}_bucket{bucket_labels} {cumulative}"
+                        )
+                    lines.append(
+                        f"{metric.name}_sum{labels} {_format_value(child.sum)}"
+                    )
+                    lines.append(f"{metric.name}_count{labels} {child.count}")
+                else:
+                    lines.append(f"{metric.name}{labels} {_format_value(child.value)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> dict:
+        """Export all metrics as plain Python data.
+
+        Returns:
+            dict: metric name -> list of series dicts with their labels and
+            values; histograms include count, sum, mean and p50/p95/p99
+            estimates
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        result = {}
+        for metric in metrics:
+            series = []
+            for values, child in metric.series():
+                entry = {"labels": dict(zip(metric.labelnames, values))}
+                if isinstance(metric, Histogram):
+                    entry.update(
+                        count=child.count,
+                        sum=child.sum,
+                        mean=child.sum / child.count if child.count else None,
+                        p50=child.quantile(0.5),
+                        p95=child.quantile(0.95),
+                        p99=child.quantile(0.99),
+                    )
+                else:
+                    entry["value"] = child.value
+                series.append(entry)
+            result[metric.name] = series
+        return result
+
+
+class MetricsServer:
+    """Serve a registry on ``/metrics`` from a background HTTP server."""
+
+    def __init__(
+        self, registry: MetricsRegistry, port: int = 9100, host: str = "127.0.0.1"
+    ):
+        """Initialize the metrics server.
+
+        Args:
+            registry: Registry to expose
+            port: TCP port to listen on (0 picks a free port)
+            host: Interface to bind
+        """
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> bool:
+        """Start serving in a daemon thread.
+
+        Returns:
+            bool: True if the server started, False otherwise
+        """
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        except OSError as e:
+            logger.error(f"Cannot start metrics server on {self.host}:{self.port}: {e}")
+            return False
+
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics-server", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Metrics available at http://{self.host}:{self.port}/metrics")
+        return True
+
+    def stop(self):
+        """Shut the server down."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            logger.info("Metrics server stopped")
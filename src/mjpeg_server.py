@@ -0,0 +1,273 @@
+import threading
+import time
+import cv2
+import numpy as np
+from typing import Iterator, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+BOUNDARY = "frame"
+
+INDEX_PAGE = """<!doctype html>
+<html>
+<head><title>Smart Detection</title></head>
+<body style="margin:0;background:#111">
+<img src="/stream.mjpg" style="display:block;margin:auto;max-width:100%">
+</body>
+</html>
+"""
+
+
+class FrameBroadcaster:
+    """Encode annotated frames once and share the JPEG with every viewer.
+
+    publish() only resizes or copies the frame into a single pending slot;
+    a background thread JPEG-encodes the newest pending frame, so the
+    pipeline never waits for the encoder and the encoding cost per frame is
+    the same for one viewer or a hundred. Nothing is encoded while nobody
+    is watching.
+
+    Each viewer waits for the next encoded frame and always gets the
+    newest one, so a slow viewer skips frames instead of queueing them.
+    """
+
+    def __init__(
+        self,
+        quality: int = 80,
+        scale: float = 1.0,
+        max_fps: Optional[float] = None,
+    ):
+        """Initialize the broadcaster.
+
+        Args:
+            quality: JPEG quality (1-100)
+            scale: Preview size relative to the frame, e.g. 0.5
+            max_fps: Encode at most this many frames per second
+        """
+        self.quality = quality
+        self.scale = scale
+        self.max_fps = max_fps
+        self.viewers = 0
+        self.frames_encoded = 0
+        self.frames_skipped = 0
+
+        self._condition = threading.Condition()
+        self._pending: Optional[np.ndarray] = None
+        self._jpeg: Optional[bytes] = None
+        self._sequence = 0
+        self._last_publish = 0.0
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the encoder thread."""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._encode_loop, name="mjpeg-encoder", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the encoder thread and wake up waiting viewers."""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def publish(self, frame: np.ndarray) -> bool:
+        """Offer a frame to viewers.
+
+        The frame is copied (or downscaled into a new array), so the caller
+        may reuse its buffer as soon as this returns.
+
+        Args:
+            frame: Annotated BGR frame
+
+        Returns:
+            bool: True if the frame was queued for encoding
+        """
+        if not self.viewers:
+            return False
+        now = time.monotonic()
+        if self.max_fps and now - self._last_publish < 1.0 / self.max_fps:
+            return False
+        self._last_publish = now
+
+        if self.scale != 1.0:
+            preview = cv2.resize(
+                frame, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA
+            )
+        else:
+            preview = frame.copy()
+        with self._condition:
+            if self._pending is not None:
+                # The encoder has not caught up; the older frame is dropped
+                self.frames_skipped += 1
+            self._pending = preview
+            self._condition.notify_all()
+        return True
+
+    def _encode_loop(self):
+        params = [int(cv2.IMWRITE_JPEG_QUALITY), int(self.quality)]
+        while True:
+            with self._condition:
+                while self._running and self._pending is None:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                frame, self._pending = self._pending, None
+
+            ok, encoded = cv2.imencode(".jpg", frame, params)
+            if not ok:
+                logger.warning("JPEG encoding failed")
+                continue
+            with self._condition:
+                self._jpeg = encoded.tobytes()
+                self._sequence += 1
+                self.frames_encoded += 1
+                self._condition.notify_all()
+
+    def latest(self) -> Optional[bytes]:
+        """Most recent JPEG, or None if nothing has been encoded yet."""
+        with self._condition:
+            return self._jpeg
+
+    def frames(self, timeout: float = 30.0) -> Iterator[bytes]:
+        """Yield JPEGs for one viewer as they are encoded.
+
+        Counts the caller as a viewer until the iterator is closed.
+
+        Args:
+            timeout: Stop when no new frame arrives for this many seconds
+
+        Yields:
+            bytes: JPEG data
+        """
+        with self._condition:
+            self.viewers += 1
+            seen = 0
+        try:
+            while True:
+                with self._condition:
+                    self._condition.wait_for(
+                        lambda: self._sequence > seen or not self._running,
+                        timeout,
+                    )
+                    if not self._running or self._sequence == seen:
+                        return
+                    seen, jpeg = self._sequence, self._jpeg
+                yield jpeg
+        finally:
+            with self._condition:
+                self.viewers -= 1
+
+    def stats(self) -> dict:
+        """Get viewer and encoder counters."""
+        return {
+            "viewers": self.viewers,
+            "frames_encoded": self.frames_encoded,
+            "frames_skipped": self.frames_skipped,
+        }
+
+
+class MjpegServer:
+    """Serve a FrameBroadcaster as an MJPEG stream over HTTP.
+
+    Routes: ``/`` (viewer page), ``/stream.mjpg`` (multipart MJPEG) and
+    ``/snapshot.jpg`` (latest frame). Needs flask.
+    """
+
+    def __init__(
+        self,
+        broadcaster: FrameBroadcaster,
+        port: int = 8080,
+        host: str = "127.0.0.1",
+    ):
+        """Initialize the streaming server.
+
+        Args:
+            broadcaster: Source of encoded frames
+            port: TCP port to listen on (0 picks a free port)
+            host: Interface to bind
+        """
+        self.broadcaster = broadcaster
+        self.port = port
+        self.host = host
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+
+    def create_app(self):
+        """Build the flask application."""
+        from flask import Flask, Response
+
+        app = Flask(__name__)
+        broadcaster = self.broadcaster
+
+        @app.route("/")
+        def index():
+            return INDEX_PAGE
+
+        @app.route("/stream.mjpg")
+        def stream():
+            def parts():
+                for jpeg in broadcaster.frames():
+                    yield (
+                        f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                        f"Content-Length: {len(jpeg)}\r\n\r\n"
+                    ).encode() + jpeg + b"\r\n"
+
+            return Response(
+                parts(), mimetype=f"multipart/x-mixed-replace; boundary={BOUNDARY}"
+            )
+
+        @app.route("/snapshot.jpg")
+        def snapshot():
+            jpeg = broadcaster.latest()
+            if jpeg is None:
+                return Response("No frame yet", status=503)
+            return Response(jpeg, mimetype="image/jpeg")
+
+        return app
+
+    def start(self) -> bool:
+        """Start the encoder and serve in a daemon thread.
+
+        Returns:
+            bool: True if the server started, False otherwise
+        """
+        try:
+            from werkzeug.serving import make_server
+
+            app = self.create_app()
+        except ImportError as e:
+            logger.error(f"MJPEG streaming needs flask: {e}")
+            return False
+
+        try:
+            self._server = make_server(self.host, self.port, app, threaded=True)
+        except OSError as e:
+            logger.error(f"Cannot start stream server on {self.host}:{self.port}: {e}")
+            return False
+
+        self.port = self._server.server_port
+        self.broadcaster.start()
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="mjpeg-server", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Live view at http://{self.host}:{self.port}/")
+        return True
+
+    def stop(self):
+        """Stop serving and end open streams."""
+        if self._server is not None:
+            self.broadcaster.stop()
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            logger.info("Stream server stopped")
@@ -0,0 +1,264 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from importlib import metadata
+from typing import Callable, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "webcam-smartdet", "models"
+)
+
+# Libraries whose version changes can invalidate a prepared model artifact
+VERSIONED_LIBRARIES = ("torch", "ultralytics", "onnx", "onnxruntime")
+
+# File extension of the artifact produced for each backend
+BACKEND_EXTENSIONS = {
+    "torchscript": ".torchscript",
+    "onnx": ".onnx",
+}
+
+
+def file_hash(path: str, chunk_size: int = 1 << 20) -> str:
+    """Compute the SHA-256 of a file without reading it into memory at once.
+
+    Args:
+        path: File to hash
+        chunk_size: Bytes read per iteration
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def library_versions() -> Dict[str, Optional[str]]:
+    """Installed versions of the libraries that shape model artifacts.
+
+    Uses package metadata, so nothing heavy is imported.
+
+    Returns:
+        dict: library name -> version string, or None if not installed
+    """
+    versions = {}
+    for name in VERSIONED_LIBRARIES:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+class ModelCache:
+    """On-disk cache of prepared (exported, fused, reduced-precision) models.
+
+    Artifacts are keyed by the hash of the source model file, the input
+    size, the backend, any extra build options and the installed library
+    versions; changing any of them produces a new key and the stale
+    artifact for the same model file, input size, backend and options is
+    removed.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """Initialize the model cache.
+
+        Args:
+            cache_dir: Cache directory (default: ~/.cache/webcam-smartdet/models)
+        """
+        self.cache_dir = os.path.expanduser(cache_dir or DEFAULT_CACHE_DIR)
+        self._hashes: Dict[str, tuple] = {}
+
+    def _model_hash(self, model_path: str) -> str:
+        """Hash a model file, reusing the result while the file is unchanged."""
+        stat = os.stat(model_path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        cached = self._hashes.get(model_path)
+        if cached and cached[0] == signature:
+            return cached[1]
+        digest = file_hash(model_path)
+        self._hashes[model_path] = (signature, digest)
+        return digest
+
+    def cache_key(
+        self,
+        model_path: str,
+        imgsz: int,
+        backend: str,
+        options: Optional[dict] = None,
+        versions: Optional[dict] = None,
+    ) -> str:
+        """Compute the cache key for a prepared model.
+
+        Args:
+            model_path: Source model file
+            imgsz: Inference input size
+            backend: Artifact backend, e.g. "onnx"
+            options: Extra build options (precision, quantization, ...)
+            versions: Library versions (default: the installed ones)
+
+        Returns:
+            str: Hex key
+        """
+        description = {
+            "model_sha256": self._model_hash(model_path),
+            "imgsz": imgsz,
+            "backend": backend,
+            "options": options or {},
+            "versions": versions if versions is not None else library_versions(),
+        }
+        encoded = json.dumps(description, sort_keys=True).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _prefix(
+        self, model_path: str, imgsz: int, backend: str, options: Optional[dict]
+    ) -> str:
+        """File name prefix shared by all generations of one artifact.
+
+        Artifacts for other model files (even with the same name), input
+        sizes or options (e.g. FP16 vs FP32) get different prefixes, so
+        cameras and workers using them never prune each other's files.
+        A model file rebuilt in place keeps its prefix, so its previous
+        artifacts are pruned.
+        """
+        stem = os.path.splitext(os.path.basename(model_path))[0]
+        source = {"model": os.path.abspath(model_path), "options": options or {}}
+        encoded = json.dumps(source, sort_keys=True).encode()
+        digest = hashlib.sha256(encoded).hexdigest()[:8]
+        return f"{stem}-{imgsz}-{backend}-{digest}-"
+
+    def artifact_path(
+        self,
+        model_path: str,
+        imgsz: int,
+        backend: str,
+        key: str,
+        options: Optional[dict] = None,
+    ) -> str:
+        """Location of the artifact for a key."""
+        extension = BACKEND_EXTENSIONS.get(backend.split("-")[0], ".bin")
+        prefix = self._prefix(model_path, imgsz, backend, options)
+        return os.path.join(self.cache_dir, f"{prefix}{key[:16]}{extension}")
+
+    def lookup(
+        self,
+        model_path: str,
+        imgsz: int,
+        backend: str,
+        key: str,
+        options: Optional[dict] = None,
+    ) -> Optional[str]:
+        """Return the cached artifact for a key, if present."""
+        path = self.artifact_path(model_path, imgsz, backend, key, options)
+        return path if os.path.exists(path) else None
+
+    def store(
+        self,
+        built_path: str,
+        model_path: str,
+        imgsz: int,
+        backend: str,
+        key: str,
+        options: Optional[dict] = None,
+    ) -> str:
+        """Move a freshly built artifact into the cache atomically.
+
+        Args:
+            built_path: Artifact produced by the build step
+            model_path: Source model file
+            imgsz: Inference input size
+            backend: Artifact backend
+            key: Cache key
+            options: Build options the artifact was made with
+
+        Returns:
+            str: Final artifact path
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.artifact_path(model_path, imgsz, backend, key, options)
+        # Copy next to the destination first so the final rename is atomic
+        # and concurrent workers never observe a partial file
+        fd, staging = tempfile.mkstemp(dir=self.cache_dir, suffix=".partial")
+        os.close(fd)
+        shutil.move(built_path, staging)
+        os.replace(staging, path)
+        self.prune(model_path, imgsz, backend, key, options)
+        return path
+
+    def prune(
+        self,
+        model_path: str,
+        imgsz: int,
+        backend: str,
+        keep_key: str,
+        options: Optional[dict] = None,
+    ) -> int:
+        """Remove outdated generations of an artifact.
+
+        Returns:
+            int: Number of files removed
+        """
+        keep_path = self.artifact_path(model_path, imgsz, backend, keep_key, options)
+        keep = os.path.basename(keep_path)
+        prefix = self._prefix(model_path, imgsz, backend, options)
+        extension = os.path.splitext(keep)[1]
+        removed = 0
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        for name in os.listdir(self.cache_dir):
+            stale = (
+                name != keep
+                and name.startswith(prefix)
+                and name.endswith(extension)
+                and len(name) == len(keep)
+            )
+            if stale:
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                    removed += 1
+                except OSError:
+                    pass
+        if removed:
+            logger.info(f"Removed {removed} stale cached artifact(s) for {prefix}")
+        return removed
+
+    def get_or_build(
+        self,
+        model_path: str,
+        imgsz: int,
+        backend: str,
+        build: Callable[[str], str],
+        options: Optional[dict] = None,
+    ) -> str:
+        """Return a cached artifact, building and storing it on a miss.
+
+        Args:
+            model_path: Source model file
+            imgsz: Inference input size
+            backend: Artifact backend
+            build: Callable taking a scratch directory and returning the
+                path of the artifact it produced there
+            options: Extra build options that are part of the key
+
+        Returns:
+            str: Path to the prepared artifact
+        """
+        key = self.cache_key(model_path, imgsz, backend, options)
+        cached = self.lookup(model_path, imgsz, backend, key, options)
+        if cached:
+            logger.info(f"Using cached {backend} model {cached}")
+            return cached
+
+        logger.info(f"Preparing {backend} model for {model_path} (imgsz={imgsz})")
+        with tempfile.TemporaryDirectory() as scratch:
+            built = build(scratch)
+            path = self.store(built, model_path, imgsz, backend, key, options)
+        logger.info(f"Cached {backend} model at {path}")
+        return path
@@ -0,0 +1,256 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+import logging
+from .geometry import (
+    boxes_from_detections,
+    crop_to_frame,
+    expand_boxes,
+    iou_matrix,
+    with_boxes,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ModelCascade:
+    """Run a fast and an accurate detector and switch between them under load.
+
+    Both models are loaded and warmed up front, so a switch is just a
+    change of which model the next frame goes to. The cascade moves to the
+    fast model when the accurate model's smoothed latency exceeds the frame
+    budget and back when it fits with headroom; a minimum dwell time keeps
+    it from flapping. Optionally, boxes the fast model is unsure about are
+    cropped and re-checked by the accurate model in one batched call.
+
+    While the fast model is active the accurate model's latency is
+    predicted from its unloaded (warm-up) latency scaled by how much the
+    fast model has slowed down, since contention slows both alike.
+
+    The cascade exposes the same interface as ObjectDetector, so it can be
+    used anywhere a detector is expected.
+    """
+
+    def __init__(
+        self,
+        fast,
+        accurate,
+        frame_budget: float = 1.0 / 30,
+        upgrade_headroom: float = 0.7,
+        smoothing: float = 0.2,
+        min_dwell_frames: int = 30,
+        refine_band: Optional[Tuple[float, float]] = None,
+        refine_margin: float = 0.15,
+        max_refine_regions: int = 8,
+    ):
+        """Initialize the cascade.
+
+        Args:
+            fast: Detector used under load (e.g. yolov8n)
+            accurate: Detector used when there is headroom (e.g. yolov8s/m)
+            frame_budget: Seconds of detection time available per frame
+            upgrade_headroom: Upgrade when the accurate model's latency is
+                below this fraction of the budget
+            smoothing: Weight of the newest sample in the latency EWMA
+            min_dwell_frames: Frames to stay on a model before switching again
+            refine_band: (low, high) confidence range in which fast-model
+                detections are re-checked by the accurate model
+            refine_margin: Context added around refined boxes, as a fraction
+                of their size
+            max_refine_regions: Re-run the accurate model on the whole frame
+                instead of crops when more boxes than this are uncertain
+        """
+        self.detectors = {"fast": fast, "accurate": accurate}
+        self.frame_budget = frame_budget
+        self.upgrade_headroom = upgrade_headroom
+        self.smoothing = smoothing
+        self.min_dwell_frames = min_dwell_frames
+        self.refine_band = refine_band
+        self.refine_margin = refine_margin
+        self.max_refine_regions = max_refine_regions
+
+        self.active = "accurate"
+        self.latency: Dict[str, Optional[float]] = {"fast": None, "accurate": None}
+        self.baseline: Dict[str, Optional[float]] = {"fast": None, "accurate": None}
+        self.switches = 0
+        self.refined_regions = 0
+        self._frames_on_active = 0
+
+        if refine_band is not None:
+            # The fast model must report boxes down to the bottom of the band
+            fast.confidence_threshold = min(fast.confidence_threshold, refine_band[0])
+
+    @property
+    def stage_observer(self) -> Optional[Callable[[str, float, float], None]]:
+        """Stage timing callback shared by both models."""
+        return self.detectors["fast"].stage_observer
+
+    @stage_observer.setter
+    def stage_observer(self, observer):
+        for detector in self.detectors.values():
+            detector.stage_observer = observer
+
+    def load_model(self) -> bool:
+        """Load both models in parallel.
+
+        Returns:
+            bool: True if both models loaded, False otherwise
+        """
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            loaded = list(pool.map(lambda d: d.load_model(), self.detectors.values()))
+        return all(loaded)
+
+    def warmup(self, frame_size: Tuple[int, int] = (640, 480), iterations: int = 2):
+        """Warm up both models and seed their latency estimates.
+
+        Returns:
+            float: Seconds spent warming up
+        """
+        total = 0.0
+        for name, detector in self.detectors.items():
+            elapsed = detector.warmup(frame_size, iterations)
+            if elapsed > 0:
+                total += elapsed
+                self.latency[name] = elapsed / max(iterations, 1)
+                self.baseline[name] = self.latency[name]
+        self._choose_initial_model()
+        return total
+
+    def _choose_initial_model(self):
+        """Start on the accurate model only if it fits the budget."""
+        accurate = self.latency["accurate"]
+        if accurate is not None and accurate > self.frame_budget:
+            self.active = "fast"
+        logger.info(
+            f"Cascade starting on {self.active} model "
+            f"(budget {self.frame_budget * 1000:.1f} ms)"
+        )
+
+    def _record_latency(self, name: str, seconds: float):
+        previous = self.latency[name]
+        if previous is None:
+            self.latency[name] = seconds
+        else:
+            self.latency[name] = previous + self.smoothing * (seconds - previous)
+
+    def predicted_accurate_latency(self) -> Optional[float]:
+        """Current estimate of the accurate model's latency in seconds."""
+        if self.active == "accurate":
+            return self.latency["accurate"]
+        fast_base, accurate_base = self.baseline["fast"], self.baseline["accurate"]
+        if fast_base and accurate_base and self.latency["fast"]:
+            return accurate_base * self.latency["fast"] / fast_base
+        return self.latency["accurate"]
+
+    def _maybe_switch(self):
+        """Downgrade on budget overrun, upgrade when there is headroom."""
+        self._frames_on_active += 1
+        if self._frames_on_active < self.min_dwell_frames:
+            return
+
+        accurate = self.predicted_accurate_latency()
+        if self.active == "accurate":
+            if accurate is not None and accurate > self.frame_budget:
+                self._switch("fast")
+        elif accurate is None or accurate < self.frame_budget * self.upgrade_headroom:
+            self._switch("accurate")
+
+    def _switch(self, name: str):
+        latency = self.predicted_accurate_latency()
+        logger.info(
+            f"Cascade switching {self.active} -> {name} "
+            f"(accurate model {latency * 1000 if latency else 0:.1f} ms, "
+            f"budget {self.frame_budget * 1000:.1f} ms)"
+        )
+        self.active = name
+        self.switches += 1
+        self._frames_on_active = 0
+
+    def detect_objects(self, frame: np.ndarray) -> List[Dict[str, Any]]:
+        """Detect objects with the currently active model.
+
+        Args:
+            frame: Input image frame
+
+        Returns:
+            List of detection dictionaries containing bbox, confidence, and class info
+        """
+        name = self.active
+        start = time.perf_counter()
+        detections = self.detectors[name].detect_objects(frame)
+        self._record_latency(name, time.perf_counter() - start)
+
+        if name == "fast" and self.refine_band is not None:
+            detections = self._refine(frame, detections)
+
+        self._maybe_switch()
+        return detections
+
+    def _refine(self, frame: np.ndarray, detections: List[Dict[str, Any]]):
+        """Re-check uncertain fast-model detections with the accurate model."""
+        low, high = self.refine_band
+        confident = [d for d in detections if d["confidence"] >= high]
+        uncertain = [d for d in detections if low <= d["confidence"] < high]
+        if not uncertain:
+            return confident
+
+        accurate = self.detectors["accurate"]
+        if len(uncertain) > self.max_refine_regions:
+            # Cheaper to look at the whole frame once than at many crops
+            rechecked = accurate.detect_objects(frame)
+            self.refined_regions += 1
+            return confident + [
+                d for d in rechecked if not _overlaps_any(d["bbox"], confident)
+            ]
+
+        height, width = frame.shape[:2]
+        regions = expand_boxes(
+            boxes_from_detections(uncertain).astype(np.int64),
+            self.refine_margin,
+            width,
+            height,
+        ).tolist()
+        # Crops are views into the frame, so no pixels are copied here
+        crops = [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in regions]
+        results = accurate.detect_batch(crops)
+        self.refined_regions += len(crops)
+
+        refined = []
+        for region, crop_detections in zip(regions, results):
+            if not crop_detections:
+                continue
+            boxes = crop_to_frame([d["bbox"] for d in crop_detections], region)
+            for mapped in with_boxes(crop_detections, boxes):
+                if not _overlaps_any(mapped["bbox"], confident + refined):
+                    refined.append(mapped)
+        return confident + refined
+
+    def draw_detections(self, frame: np.ndarray, detections: List[Dict[str, Any]]):
+        """Draw detection boxes and labels on frame."""
+        return self.detectors["fast"].draw_detections(frame, detections)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cascade state for logging and metrics.
+
+        Returns:
+            dict: Active model, latency estimates, switch and refine counts
+        """
+        predicted = self.predicted_accurate_latency()
+        return {
+            "active": self.active,
+            "latency_ms": {
+                name: value * 1000 if value is not None else None
+                for name, value in self.latency.items()
+            },
+            "predicted_accurate_ms": predicted * 1000 if predicted else None,
+            "switches": self.switches,
+            "refined_regions": self.refined_regions,
+        }
+
+
+def _overlaps_any(bbox, others, threshold: float = 0.5) -> bool:
+    """Whether a box overlaps any of ``others`` by at least ``threshold`` IoU."""
+    if not others:
+        return False
+    return bool(np.any(iou_matrix(bbox, boxes_from_detections(others)) >= threshold))
@@ -1,28 +1,175 @@
 import numpy as np
-import torch
-from ultralytics import YOLO
-from typing import List, Dict, Any
+import os
+import shutil
+import time
+from typing import List, Dict, Any, Callable, Iterable, Mapping, Optional, Tuple, Union
 import logging
+from .detection_cache import DetectionCache, namespace_digest
+from .model_cache import BACKEND_EXTENSIONS, ModelCache, file_hash
+from .quantization import QUANTIZATION_MODES
 
 logger = logging.getLogger(__name__)
 
+# "pytorch" runs the .pt file directly; the others use cached exports
+BACKENDS = ("pytorch",) + tuple(BACKEND_EXTENSIONS)
+
+# Classes can be given by id or by name, e.g. 0 or "person"
+ClassRef = Union[int, str]
+
+
+def resolve_class_ids(names: Mapping[int, str], classes: Iterable[ClassRef]):
+    """Map class names or ids to model class ids.
+
+    Args:
+        names: Model class names, id -> name
+        classes: Class ids or names
+
+    Returns:
+        List of class ids; unknown entries are logged and skipped
+    """
+    by_name = {name: class_id for class_id, name in names.items()}
+    ids = []
+    for ref in classes:
+        if isinstance(ref, str) and ref.strip().isdigit():
+            ref = int(ref)
+        class_id = ref if isinstance(ref, int) else by_name.get(ref.strip())
+        if class_id in names:
+            ids.append(class_id)
+        else:
+            logger.warning(f"Ignoring unknown class {ref!r}")
+    return ids
+
+
+def build_class_filter(
+    names: Mapping[int, str],
+    confidence_threshold: float,
+    classes: Optional[Iterable[ClassRef]] = None,
+    exclude_classes: Optional[Iterable[ClassRef]] = None,
+    class_thresholds: Optional[Mapping[ClassRef, float]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Build per-class lookup tables for filtering raw detections.
+
+    Args:
+        names: Model class names, id -> name
+        confidence_threshold: Threshold for classes without their own
+        classes: Allow list (default: all classes)
+        exclude_classes: Deny list, applied after the allow list
+        class_thresholds: Per-class confidence thresholds
+
+    Returns:
+        (allowed, thresholds): a bool and a float32 array indexed by class id
+    """
+    size = max(names) + 1 if names else 0
+    allowed = np.zeros(size, dtype=bool)
+    if classes is None:
+        allowed[list(names)] = True
+    else:
+        allowed[resolve_class_ids(names, classes)] = True
+    if exclude_classes:
+        allowed[resolve_class_ids(names, exclude_classes)] = False
+
+    thresholds = np.full(size, confidence_threshold, dtype=np.float32)
+    for ref, threshold in (class_thresholds or {}).items():
+        thresholds[resolve_class_ids(names, [ref])] = threshold
+    return allowed, thresholds
+
+
+def select_boxes(
+    cls: np.ndarray,
+    conf: np.ndarray,
+    allowed: np.ndarray,
+    thresholds: np.ndarray,
+) -> np.ndarray:
+    """Mask of raw detections that pass the class filter.
+
+    Args:
+        cls: (N,) class ids
+        conf: (N,) confidence scores
+        allowed: Allowed flag per class id
+        thresholds: Confidence threshold per class id
+
+    Returns:
+        (N,) bool mask
+    """
+    cls = cls.astype(np.intp, copy=False)
+    # Ids outside the tables (a model with more classes) are dropped
+    known = (cls >= 0) & (cls < len(allowed))
+    safe = np.where(known, cls, 0)
+    return known & allowed[safe] & (conf >= thresholds[safe])
+
 
 class ObjectDetector:
     """Handle object detection using YOLO model."""
 
     def __init__(
-        self, model_path: str = "yolov8n.pt", confidence_threshold: float = 0.5
+        self,
+        model_path: str = "yolov8n.pt",
+        confidence_threshold: float = 0.5,
+        device: Optional[str] = None,
+        backend: str = "pytorch",
+        imgsz: int = 640,
+        half: bool = False,
+        cache_dir: Optional[str] = None,
+        quantization: Optional[str] = None,
+        calibration_dir: Optional[str] = None,
+        classes: Optional[Iterable[ClassRef]] = None,
+        exclude_classes: Optional[Iterable[ClassRef]] = None,
+        class_thresholds: Optional[Mapping[ClassRef, float]] = None,
+        detection_cache: Optional[DetectionCache] = None,
     ):
         """Initialize the object detector.
 
+        torch and ultralytics are imported by load_model(), not at module
+        import, so code paths that never run YOLO start without paying for
+        them.
+
         Args:
             model_path: Path to YOLO model file
             confidence_threshold: Minimum confidence score for detections
+            device: Inference device (default: cuda if available, else cpu)
+            backend: "pytorch", "torchscript" or "onnx"; exported backends
+                are prepared once and reused from the model cache
+            imgsz: Inference input size
+            half: Use FP16 for exported models on GPU
+            cache_dir: Model cache directory (default: ~/.cache/webcam-smartdet)
+            quantization: "dynamic" or "static" INT8 quantization of the
+                ONNX export for CPU inference (implies backend="onnx")
+            calibration_dir: Folder of sample frames for static quantization
+            classes: Only report these classes (ids or names)
+            exclude_classes: Never report these classes (ids or names)
+            class_thresholds: Confidence threshold per class (id or name),
+                overriding confidence_threshold for those classes
+            detection_cache: Reuse detections for frames already processed
+                with the same model and settings
         """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+        if quantization is not None:
+            if quantization not in QUANTIZATION_MODES:
+                raise ValueError(f"Unknown quantization mode {quantization!r}")
+            if quantization == "static" and not calibration_dir:
+                raise ValueError("Static quantization needs a calibration_dir")
+            backend, half = "onnx", False
         self.model_path = model_path
         self.confidence_threshold = confidence_threshold
         self.model = None
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.device = device
+        self.backend = backend
+        self.imgsz = imgsz
+        self.half = half
+        self.cache_dir = cache_dir
+        self.quantization = quantization
+        self.calibration_dir = calibration_dir
+        self.classes = list(classes) if classes is not None else None
+        self.exclude_classes = list(exclude_classes or [])
+        self.class_thresholds = dict(class_thresholds or {})
+        self._class_filter: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._model_classes: Optional[List[int]] = None
+        self._model_conf = confidence_threshold
+        self.detection_cache = detection_cache
+        self._cache_namespace: Optional[str] = None
+        # Optional callback(stage, start, end) receiving perf_counter stage timings
+        self.stage_observer: Optional[Callable[[str, float, float], None]] = None
 
     def load_model(self) -> bool:
         """Load the YOLO model.
@@ -31,14 +178,180 @@ class ObjectDetector:
             bool: True if model loaded successfully, False otherwise
         """
         try:
-            self.model = YOLO(self.model_path)
-            self.model.to(self.device)
-            logger.info(f"Model loaded successfully on {self.device}")
+            import torch
+            from ultralytics import YOLO
+
+            if self.device is None:
+                self.device = "cuda" if torch.cuda.is_available() else "cpu"
+            if self.backend == "pytorch":
+                self.model = YOLO(self.model_path)
+                self.model.to(self.device)
+            elif self.quantization:
+                self.model = YOLO(self._quantized_model_path(), task="detect")
+            else:
+                self.model = YOLO(self._prepared_model_path(), task="detect")
+            self.configure_class_filter()
+            variant = (
+                f"{self.backend}, int8 {self.quantization}"
+                if self.quantization
+                else self.backend
+            )
+            logger.info(f"Model loaded successfully on {self.device} ({variant})")
             return True
         except Exception as e:
             logger.error(f"Error loading model: {e}")
             return False
 
+    def configure_class_filter(self):
+        """Resolve class filters against the loaded model's class names.
+
+        The allowed classes and the lowest threshold in use are passed to
+        the model, so NMS already discards everything else; the remaining
+        per-class thresholds are applied as masks in decode_results().
+        Call again after changing classes or thresholds.
+        """
+        names = self.model.names
+        self._class_filter = build_class_filter(
+            names,
+            self.confidence_threshold,
+            self.classes,
+            self.exclude_classes,
+            self.class_thresholds,
+        )
+        allowed, thresholds = self._class_filter
+        self._cache_namespace = None
+        filtered = self.classes is not None or bool(self.exclude_classes)
+        self._model_classes = np.flatnonzero(allowed).tolist() if filtered else None
+        self._model_conf = float(thresholds[allowed].min()) if allowed.any() else 1.0
+        if filtered:
+            logger.info(f"Detecting {len(self._model_classes)} of {len(names)} classes")
+
+    def cache_namespace(self) -> str:
+        """Fingerprint of everything besides the frame that shapes the output.
+
+        Covers the model file contents (or the weights name if it is not a
+        local file), backend, input size, precision and class filters.
+        """
+        if self._cache_namespace is None:
+            model = self.model_path
+            if os.path.exists(model):
+                model = file_hash(model)
+            self._cache_namespace = namespace_digest(
+                detector="yolo",
+                model=model,
+                backend=self.backend,
+                imgsz=self.imgsz,
+                half=self.half,
+                quantization=self.quantization,
+                calibration_dir=self.calibration_dir,
+                confidence_threshold=self.confidence_threshold,
+                classes=self.classes,
+                exclude_classes=self.exclude_classes,
+                class_thresholds=self.class_thresholds,
+            )
+        return self._cache_namespace
+
+    def _source_model_path(self) -> str:
+        """Local path of the .pt weights, downloading named weights if needed."""
+        if os.path.exists(self.model_path):
+            return self.model_path
+        from ultralytics import YOLO
+
+        return YOLO(self.model_path).ckpt_path
+
+    def _quantized_model_path(self) -> str:
+        """Get the INT8 ONNX model from the model cache, building it on a miss.
+
+        Returns:
+            str: Path to the cached INT8 artifact
+        """
+        from .quantization import frames_fingerprint, list_frames, quantize_onnx
+
+        fp32_path = self._prepared_model_path()
+        calibration = []
+        if self.quantization == "static":
+            calibration = list_frames(self.calibration_dir)
+            if not calibration:
+                raise ValueError(f"No calibration frames in {self.calibration_dir}")
+
+        def build(scratch: str) -> str:
+            return quantize_onnx(
+                fp32_path,
+                os.path.join(scratch, "model-int8.onnx"),
+                self.quantization,
+                calibration,
+                self.imgsz,
+            )
+
+        return ModelCache(self.cache_dir).get_or_build(
+            self._source_model_path(),
+            self.imgsz,
+            "onnx-int8",
+            build,
+            options={
+                "mode": self.quantization,
+                "calibration": frames_fingerprint(calibration),
+            },
+        )
+
+    def _prepared_model_path(self) -> str:
+        """Get the exported model for this backend from the model cache.
+
+        Returns:
+            str: Path to the cached artifact
+        """
+        from ultralytics import YOLO
+
+        source = self._source_model_path()
+        half = self.half and self.device != "cpu"
+
+        def build(scratch: str) -> str:
+            # Export from a private copy; Ultralytics writes next to the
+            # source file, which concurrent workers must not share
+            local = os.path.join(scratch, os.path.basename(source))
+            shutil.copy2(source, local)
+            return YOLO(local).export(
+                format=self.backend, imgsz=self.imgsz, half=half, device=self.device
+            )
+
+        return ModelCache(self.cache_dir).get_or_build(
+            source,
+            self.imgsz,
+            self.backend,
+            build,
+            options={"half": half, "device": self.device.split(":")[0]},
+        )
+
+    def warmup(self, frame_size: Tuple[int, int] = (640, 480), iterations: int = 2):
+        """Run dummy inferences so the first real frame is not slow.
+
+        The first calls pay for lazy backend initialization, memory
+        allocation and kernel selection; running them at the capture
+        resolution moves that cost to startup.
+
+        Args:
+            frame_size: (width, height) of the frames that will be processed
+            iterations: Number of dummy inferences
+
+        Returns:
+            float: Seconds spent warming up, or -1.0 if the model is not loaded
+        """
+        if self.model is None:
+            logger.error("Model not loaded. Call load_model() first.")
+            return -1.0
+
+        width, height = frame_size
+        dummy = np.zeros((height, width, 3), dtype=np.uint8)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            self.predict(dummy)
+        elapsed = time.perf_counter() - start
+        logger.info(
+            f"Model warmed up with {iterations} frames at {width}x{height} "
+            f"in {elapsed:.2f}s"
+        )
+        return elapsed
+
     def detect_objects(self, frame: np.ndarray) -> List[Dict[str, Any]]:
         """Detect objects in a frame.
 
@@ -53,34 +366,138 @@ class ObjectDetector:
             return []
 
         try:
-            # Run inference
-            results = self.model(frame, conf=self.confidence_threshold)
-
-            detections = []
-            for result in results:
-                boxes = result.boxes
-                if boxes is not None:
-                    for box in boxes:
-                        # Extract detection information
-                        x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                        confidence = box.conf[0].cpu().numpy()
-                        class_id = int(box.cls[0].cpu().numpy())
-                        class_name = self.model.names[class_id]
-
-                        detection = {
-                            "bbox": [int(x1), int(y1), int(x2), int(y2)],
-                            "confidence": float(confidence),
-                            "class_id": class_id,
-                            "class_name": class_name,
-                        }
-                        detections.append(detection)
+            cache, key = self.detection_cache, None
+            if cache is not None:
+                key = cache.key(self.cache_namespace(), frame)
+                cached = cache.get(key)
+                if cached is not None:
+                    return cached
 
+            observer = self.stage_observer
+            if observer is None:
+                detections = self.decode_results(self.predict(frame))
+            else:
+                start = time.perf_counter()
+                results = self.predict(frame)
+                inferred = time.perf_counter()
+                detections = self.decode_results(results)
+                observer("inference", start, inferred)
+                observer("decode", inferred, time.perf_counter())
+
+            if key is not None:
+                cache.put(key, detections)
             return detections
 
         except Exception as e:
             logger.error(f"Error during detection: {e}")
             return []
 
+    def detect_batch(self, frames: List[np.ndarray]) -> List[List[Dict[str, Any]]]:
+        """Detect objects in several frames with a single batched model call.
+
+        Args:
+            frames: Input image frames (or crops)
+
+        Returns:
+            One list of detection dictionaries per input frame
+        """
+        if self.model is None:
+            logger.error("Model not loaded. Call load_model() first.")
+            return [[] for _ in frames]
+        if not frames:
+            return []
+
+        try:
+            batch: List[Optional[List[Dict[str, Any]]]] = [None] * len(frames)
+            cache, keys = self.detection_cache, []
+            if cache is not None:
+                namespace = self.cache_namespace()
+                keys = [cache.key(namespace, frame) for frame in frames]
+                batch = [cache.get(key) for key in keys]
+            missing = [index for index, cached in enumerate(batch) if cached is None]
+            if not missing:
+                return batch
+
+            observer = self.stage_observer
+            start = time.perf_counter()
+            results = self.predict([frames[index] for index in missing])
+            inferred = time.perf_counter()
+            for index, result in zip(missing, results):
+                batch[index] = self.decode_results([result])
+                if keys:
+                    cache.put(keys[index], batch[index])
+            if observer is not None:
+                observer("inference", start, inferred)
+                observer("decode", inferred, time.perf_counter())
+            return batch
+
+        except Exception as e:
+            logger.error(f"Error during batched detection: {e}")
+            return [[] for _ in frames]
+
+    def predict(self, frame):
+        """Run raw model inference on a frame.
+
+        Args:
+            frame: Input image frame, or a list of frames for one batched call
+
+        Returns:
+            Raw YOLO results; each result carries per-stage timings in
+            ``result.speed`` (preprocess, inference, postprocess in ms)
+        """
+        if self._class_filter is None:
+            self.configure_class_filter()
+        return self.model(
+            frame,
+            conf=self._model_conf,
+            classes=self._model_classes,
+            imgsz=self.imgsz,
+            device=self.device,
+            verbose=False,
+        )
+
+    def decode_results(self, results) -> List[Dict[str, Any]]:
+        """Convert raw YOLO results into detection dictionaries.
+
+        Args:
+            results: Output of predict()
+
+        Returns:
+            List of detection dictionaries containing bbox, confidence, and class info
+        """
+        if self._class_filter is None:
+            self.configure_class_filter()
+        allowed, thresholds = self._class_filter
+        names = self.model.names
+
+        detections = []
+        for result in results:
+            boxes = result.boxes
+            if boxes is None or len(boxes) == 0:
+                continue
+            # One device-to-host copy per result; rows are x1, y1, x2, y2,
+            # [track id,] confidence, class
+            data = boxes.data.cpu().numpy()
+            conf = data[:, -2]
+            cls = data[:, -1].astype(np.intp)
+            keep = select_boxes(cls, conf, allowed, thresholds)
+            if not keep.any():
+                continue
+            xyxy = data[keep, :4].astype(np.int64).tolist()
+            for bbox, confidence, class_id in zip(
+                xyxy, conf[keep].tolist(), cls[keep].tolist()
+            ):
+                detections.append(
+                    {
+                        "bbox": bbox,
+                        "confidence": confidence,
+                        "class_id": class_id,
+                        "class_name": names[class_id],
+                    }
+                )
+
+        return detections
+
     def draw_detections(
         self, frame: np.ndarray, detections: List[Dict[str, Any]]
     ) -> np.ndarray:
@@ -0,0 +1,256 @@
+import cProfile
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TraceRecorder:
+    """Record pipeline spans and export them as a Chrome/Perfetto trace."""
+
+    def __init__(self, max_events: int = 200000):
+        """Initialize the trace recorder.
+
+        Args:
+            max_events: Spans kept in memory; the oldest are dropped first so
+                long profiling sessions stay bounded
+        """
+        self.max_events = max_events
+        self._events = deque(maxlen=max_events)
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._thread_names = {}
+
+    def add_span(
+        self,
+        name: str,
+        start: float,
+        end: float,
+        frame: Optional[int] = None,
+        category: str = "pipeline",
+    ):
+        """Record a completed span.
+
+        Args:
+            name: Stage name, e.g. "capture" or "inference"
+            start: Start time from time.perf_counter()
+            end: End time from time.perf_counter()
+            frame: Frame sequence number the span belongs to
+            category: Trace category
+        """
+        thread = threading.current_thread()
+        tid = thread.ident
+        if tid not in self._thread_names:
+            self._thread_names[tid] = thread.name
+        # deque.append is atomic, so worker threads can record concurrently
+        self._events.append((name, category, start, end, tid, frame))
+
+    @contextmanager
+    def span(self, name: str, frame: Optional[int] = None, category="pipeline"):
+        """Record the enclosed block as a span."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_span(name, start, time.perf_counter(), frame, category)
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def to_chrome_trace(self) -> dict:
+        """Build a Chrome trace event document.
+
+        Returns:
+            dict: Trace in the JSON object format understood by
+            chrome://tracing and ui.perfetto.dev
+        """
+        events = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self._pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in list(self._thread_names.items())
+        ]
+        for name, category, start, end, tid, frame in list(self._events):
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self._origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": self._pid,
+                "tid": tid,
+            }
+            if frame is not None:
+                event["args"] = {"frame": frame}
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path: str) -> bool:
+        """Write the trace to a JSON file.
+
+        Args:
+            path: Output file path
+
+        Returns:
+            bool: True if the trace was written, False otherwise
+        """
+        try:
+            with open(path, "w") as f:
+                json.dump(self.to_chrome_trace(), f)
+            logger.info(f"Trace with {len(self)} spans written to {path}")
+            return True
+        except OSError as e:
+            logger.error(f"Error writing trace: {e}")
+            return False
+
+
+class SignalProfiler:
+    """Profile a live process for a fixed window when it receives a signal.
+
+    Two modes are supported:
+
+    - ``sample``: a background thread samples the stacks of every thread
+      and writes them in the collapsed ("folded") format used by py-spy's
+      raw output, ready for flamegraph.pl or speedscope
+    - ``cprofile``: deterministic cProfile of the main thread, written as a
+      ``.prof`` file for pstats or snakeviz
+    """
+
+    MODES = ("sample", "cprofile")
+
+    def __init__(
+        self,
+        duration: float = 10.0,
+        output_dir: str = ".",
+        mode: str = "sample",
+        interval: float = 0.005,
+        signum: Optional[int] = None,
+    ):
+        """Initialize the profiler.
+
+        Args:
+            duration: Length of each profiling window in seconds
+            output_dir: Directory for profile output files
+            mode: "sample" or "cprofile"
+            interval: Sampling interval in seconds (sample mode)
+            signum: Trigger signal (default: SIGUSR1)
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        self.duration = duration
+        self.output_dir = output_dir
+        self.mode = mode
+        self.interval = interval
+        self.signum = signum if signum is not None else getattr(signal, "SIGUSR1", None)
+        self.active = False
+        self.last_output: Optional[str] = None
+        self._profile: Optional[cProfile.Profile] = None
+
+    def install(self) -> bool:
+        """Register the signal handler; must be called from the main thread.
+
+        Returns:
+            bool: True if the handler was installed, False otherwise
+        """
+        if self.signum is None:
+            logger.warning("Signal-triggered profiling is not supported here")
+            return False
+        try:
+            signal.signal(self.signum, self._on_signal)
+        except ValueError as e:
+            logger.error(f"Cannot install profiling signal handler: {e}")
+            return False
+        logger.info(
+            f"Send signal {self.signum} to PID {os.getpid()} for a "
+            f"{self.duration:.0f}s {self.mode} profile"
+        )
+        return True
+
+    def _on_signal(self, signum, frame):
+        self.start()
+
+    def _output_path(self, extension: str) -> str:
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        return os.path.join(self.output_dir, f"profile-{stamp}.{extension}")
+
+    def start(self) -> bool:
+        """Start a profiling window unless one is already running.
+
+        Returns:
+            bool: True if a new window started
+        """
+        if self.active:
+            return False
+        self.active = True
+        if self.mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+            # The profile is bound to this thread, so stop it from a SIGALRM
+            # handler, which also runs on the main thread
+            signal.signal(signal.SIGALRM, lambda signum, frame: self.stop())
+            signal.setitimer(signal.ITIMER_REAL, self.duration)
+        else:
+            threading.Thread(
+                target=self._sample, name="stack-sampler", daemon=True
+            ).start()
+        logger.info(f"Profiling started for {self.duration:.1f}s ({self.mode})")
+        return True
+
+    def stop(self):
+        """Finish a cProfile window and write its output."""
+        if self._profile is None:
+            return
+        self._profile.disable()
+        path = self._output_path("prof")
+        self._profile.dump_stats(path)
+        self._profile = None
+        self._finish(path)
+
+    def _sample(self):
+        """Collect folded stacks of all threads for the window duration."""
+        own = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        stacks = Counter()
+        deadline = time.perf_counter() + self.duration
+        while time.perf_counter() < deadline:
+            for tid, frame in sys._current_frames().items():
+                if tid == own:
+                    continue
+                calls = []
+                while frame is not None:
+                    code = frame.f_code
+                    filename = os.path.basename(code.co_filename)
+                    calls.append(f"{code.co_name} ({filename}:{frame.f_lineno})")
+                    frame = frame.f_back
+                calls.reverse()
+                thread = names.get(tid, str(tid))
+                stacks[";".join([thread] + calls)] += 1
+            time.sleep(self.interval)
+
+        path = self._output_path("folded")
+        try:
+            with open(path, "w") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+        except OSError as e:
+            logger.error(f"Error writing profile: {e}")
+            path = None
+        self._finish(path)
+
+    def _finish(self, path: Optional[str]):
+        self.active = False
+        self.last_output = path
+        if path:
+            logger.info(f"Profile written to {path}")
@@ -0,0 +1,286 @@
+import glob
+import hashlib
+import os
+import re
+import time
+import cv2
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional
+import logging
+from .geometry import boxes_from_detections, iou_matrix
+
+logger = logging.getLogger(__name__)
+
+QUANTIZATION_MODES = ("dynamic", "static")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def list_frames(folder: str, limit: Optional[int] = None) -> List[str]:
+    """List image files in a folder in a stable order.
+
+    Args:
+        folder: Directory of sample frames
+        limit: Maximum number of files (default: all)
+
+    Returns:
+        List of image paths
+    """
+    paths = sorted(
+        path
+        for path in glob.glob(os.path.join(folder, "*"))
+        if path.lower().endswith(IMAGE_EXTENSIONS)
+    )
+    return paths[:limit] if limit else paths
+
+
+def frames_fingerprint(paths: List[str]) -> str:
+    """Fingerprint a set of frames by name, size and modification time."""
+    digest = hashlib.sha256()
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(
+            f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}".encode()
+        )
+    return digest.hexdigest()[:16]
+
+
+def letterbox(frame: np.ndarray, imgsz: int, pad_value: int = 114) -> np.ndarray:
+    """Resize keeping aspect ratio and pad to a square, as YOLO does.
+
+    Args:
+        frame: BGR image
+        imgsz: Output side length
+        pad_value: Border fill value
+
+    Returns:
+        imgsz x imgsz BGR image
+    """
+    height, width = frame.shape[:2]
+    scale = min(imgsz / height, imgsz / width)
+    new_w, new_h = int(round(width * scale)), int(round(height * scale))
+    resized = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    top = (imgsz - new_h) // 2
+    left = (imgsz - new_w) // 2
+    return cv2.copyMakeBorder(
+        resized,
+        top,
+        imgsz - new_h - top,
+        left,
+        imgsz - new_w - left,
+        cv2.BORDER_CONSTANT,
+        value=(pad_value,) * 3,
+    )
+
+
+def preprocess_for_onnx(frame: np.ndarray, imgsz: int) -> np.ndarray:
+    """Convert a BGR frame to the 1x3xHxW float32 tensor of a YOLO export."""
+    image = letterbox(frame, imgsz)[:, :, ::-1].transpose(2, 0, 1)
+    return np.ascontiguousarray(image[np.newaxis], dtype=np.float32) / 255.0
+
+
+class CalibrationFrames:
+    """Iterate model inputs built from a folder of sample frames."""
+
+    def __init__(self, paths: List[str], input_name: str, imgsz: int):
+        """Initialize the calibration set.
+
+        Args:
+            paths: Image files to calibrate on
+            input_name: Name of the ONNX model input
+            imgsz: Model input size
+        """
+        self.paths = paths
+        self.input_name = input_name
+        self.imgsz = imgsz
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __iter__(self):
+        for path in self.paths:
+            frame = cv2.imread(path)
+            if frame is None:
+                logger.warning(f"Skipping unreadable calibration frame {path}")
+                continue
+            yield {self.input_name: preprocess_for_onnx(frame, self.imgsz)}
+
+
+def _head_nodes(model) -> List[str]:
+    """Names of the nodes in the final (detection head) module of an export.
+
+    Ultralytics exports name nodes ``/model.<index>/...``; the highest
+    index is the Detect head, whose box decoding is sensitive to INT8.
+    """
+    indices = {}
+    for node in model.graph.node:
+        match = re.match(r"/model\.(\d+)/", node.name)
+        if match:
+            indices.setdefault(int(match.group(1)), []).append(node.name)
+    return indices[max(indices)] if indices else []
+
+
+def quantize_onnx(
+    fp32_path: str,
+    output_path: str,
+    mode: str = "dynamic",
+    calibration_paths: Optional[List[str]] = None,
+    imgsz: int = 640,
+    exclude_head: bool = True,
+) -> str:
+    """Quantize an FP32 ONNX export to INT8 with ONNX Runtime.
+
+    Args:
+        fp32_path: FP32 ONNX model
+        output_path: Where to write the INT8 model
+        mode: "dynamic" (weights only, activations quantized at run time)
+            or "static" (activation ranges calibrated on sample frames)
+        calibration_paths: Sample frames, required for static mode
+        imgsz: Model input size
+        exclude_head: Keep the detection head in FP32 to protect box accuracy
+
+    Returns:
+        str: output_path
+    """
+    import onnx
+    from onnxruntime.quantization import (
+        CalibrationDataReader,
+        QuantFormat,
+        QuantType,
+        quantize_dynamic,
+        quantize_static,
+    )
+
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"Unknown quantization mode: {mode}")
+
+    model = onnx.load(fp32_path)
+    excluded = _head_nodes(model) if exclude_head else []
+    input_name = model.graph.input[0].name
+    del model
+
+    if mode == "dynamic":
+        quantize_dynamic(
+            fp32_path,
+            output_path,
+            weight_type=QuantType.QUInt8,
+            nodes_to_exclude=excluded,
+        )
+    else:
+        if not calibration_paths:
+            raise ValueError("Static quantization needs calibration frames")
+
+        class Reader(CalibrationDataReader):
+            def __init__(self, frames: CalibrationFrames):
+                self._iterator = iter(frames)
+
+            def get_next(self):
+                return next(self._iterator, None)
+
+        frames = CalibrationFrames(calibration_paths, input_name, imgsz)
+        logger.info(f"Calibrating INT8 ranges on {len(frames)} frames")
+        quantize_static(
+            fp32_path,
+            output_path,
+            Reader(frames),
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            per_channel=True,
+            nodes_to_exclude=excluded,
+        )
+    logger.info(f"Wrote {mode} INT8 model to {output_path}")
+    return output_path
+
+
+def match_detections(
+    reference: List[Dict[str, Any]],
+    candidate: List[Dict[str, Any]],
+    iou_threshold: float = 0.5,
+) -> Dict[str, float]:
+    """Match candidate detections against reference detections of one frame.
+
+    Detections match when they share a class and overlap by at least
+    ``iou_threshold``; each reference box is matched at most once, in
+    order of decreasing candidate confidence.
+
+    Returns:
+        dict: matched, reference and candidate counts, summed IoU of matches
+    """
+    stats = {
+        "matched": 0,
+        "reference": len(reference),
+        "candidate": len(candidate),
+        "iou_sum": 0.0,
+    }
+    if not reference or not candidate:
+        return stats
+
+    ref_boxes = boxes_from_detections(reference)
+    cand_boxes = boxes_from_detections(candidate)
+    ref_cls = np.array([d["class_id"] for d in reference])
+    cand_cls = np.array([d["class_id"] for d in candidate])
+    iou = iou_matrix(cand_boxes, ref_boxes)
+    iou[cand_cls[:, None] != ref_cls[None, :]] = 0.0
+
+    used = np.zeros(len(reference), dtype=bool)
+    order = np.argsort([-d["confidence"] for d in candidate])
+    for i in order:
+        overlaps = np.where(used, 0.0, iou[i])
+        j = int(np.argmax(overlaps))
+        if overlaps[j] >= iou_threshold:
+            used[j] = True
+            stats["matched"] += 1
+            stats["iou_sum"] += float(overlaps[j])
+    return stats
+
+
+def compare_detectors(
+    reference: Callable[[np.ndarray], List[Dict[str, Any]]],
+    candidate: Callable[[np.ndarray], List[Dict[str, Any]]],
+    frames: List[np.ndarray],
+    iou_threshold: float = 0.5,
+) -> Dict[str, Any]:
+    """Compare a quantized detector against its FP32 reference.
+
+    The reference model's detections are treated as ground truth, so
+    precision and recall measure how closely INT8 reproduces FP32.
+
+    Args:
+        reference: FP32 detect function
+        candidate: INT8 detect function
+        frames: Frames to evaluate on
+        iou_threshold: IoU required for a match
+
+    Returns:
+        dict: Agreement (precision, recall, F1, mean IoU) and latency report
+    """
+    totals = {"matched": 0, "reference": 0, "candidate": 0, "iou_sum": 0.0}
+    ref_times, cand_times = [], []
+    for frame in frames:
+        start = time.perf_counter()
+        ref = reference(frame)
+        ref_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        cand = candidate(frame)
+        cand_times.append(time.perf_counter() - start)
+        for key, value in match_detections(ref, cand, iou_threshold).items():
+            totals[key] += value
+
+    precision = totals["matched"] / totals["candidate"] if totals["candidate"] else 1.0
+    recall = totals["matched"] / totals["reference"] if totals["reference"] else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    ref_ms = float(np.mean(ref_times) * 1000) if ref_times else 0.0
+    cand_ms = float(np.mean(cand_times) * 1000) if cand_times else 0.0
+    return {
+        "frames": len(frames),
+        "iou_threshold": iou_threshold,
+        "reference_detections": totals["reference"],
+        "candidate_detections": totals["candidate"],
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "mean_iou": totals["iou_sum"] / totals["matched"] if totals["matched"] else 0.0,
+        "reference_latency_ms": ref_ms,
+        "candidate_latency_ms": cand_ms,
+        "speedup": ref_ms / cand_ms if cand_ms else 0.0,
+    }
@@ -0,0 +1,163 @@
+import cv2
+import numpy as np
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+from .face_detector import FaceDetector
+from .geometry import boxes_from_detections, clip_boxes, expand_boxes, overlap_matrix
+
+logger = logging.getLogger(__name__)
+
+# Ways a region can be obscured
+REDACTION_MODES = ("pixelate", "blur")
+
+
+class Redactor:
+    """Pixelate or blur people and faces before frames leave the process.
+
+    Regions come from the frame's detections (and optionally a face
+    detector), grown by a margin and combined with the regions of the last
+    few frames, so a frame whose detector missed an object, or a skipped
+    detection, still gets redacted. Each region is shrunk to a few cells and
+    scaled back up: nearest-neighbour upscaling gives pixelation, bilinear
+    a blur. Both touch only the region's pixels, so the cost grows with the
+    redacted area rather than the frame size, unlike a Gaussian kernel.
+    """
+
+    def __init__(
+        self,
+        mode: str = "pixelate",
+        classes: Optional[Iterable[str]] = ("person", "face"),
+        head_fraction: Optional[float] = None,
+        margin: float = 0.1,
+        cells: int = 8,
+        hold_frames: int = 10,
+        face_detector: Optional[FaceDetector] = None,
+    ):
+        """Initialize the redactor.
+
+        Args:
+            mode: "pixelate" or "blur"
+            classes: Class names whose boxes are redacted (None: all)
+            head_fraction: Only redact this top fraction of person boxes,
+                where the face is (default: the whole box)
+            margin: Grow regions by this fraction of their size per side
+            cells: Cells across the longer side of a region after shrinking;
+                lower is coarser
+            hold_frames: Keep redacting a region for this many frames after
+                its last detection
+            face_detector: Also redact faces found by this detector; runs
+                on the whole frame, unlike the redaction itself
+        """
+        if mode not in REDACTION_MODES:
+            raise ValueError(
+                f"Unknown redaction mode {mode!r}, expected one of {REDACTION_MODES}"
+            )
+        self.mode = mode
+        self.classes = set(classes) if classes is not None else None
+        self.head_fraction = head_fraction
+        self.margin = margin
+        self.cells = max(1, cells)
+        self.face_detector = face_detector
+        self._interpolation = (
+            cv2.INTER_NEAREST if mode == "pixelate" else cv2.INTER_LINEAR
+        )
+        self.hold_frames = max(0, hold_frames)
+        # Regions still redacted, and frames since each was last detected
+        self._held = np.zeros((0, 4), dtype=np.float32)
+        self._age = np.zeros(0, dtype=np.int64)
+        self.frames = 0
+        self.regions = 0
+        self.redacted_pixels = 0
+
+    def _fresh_boxes(
+        self, detections: List[Dict[str, Any]], width: int, height: int
+    ) -> np.ndarray:
+        """Expanded boxes to redact from this frame's detections."""
+        if self.classes is not None:
+            detections = [d for d in detections if d["class_name"] in self.classes]
+        boxes = boxes_from_detections(detections)
+        if self.head_fraction is not None and len(boxes):
+            person = np.array([d["class_name"] == "person" for d in detections])
+            heights = boxes[:, 3] - boxes[:, 1]
+            boxes[person, 3] = boxes[person, 1] + heights[person] * self.head_fraction
+        return expand_boxes(boxes, self.margin, width, height)
+
+    def plan(
+        self, detections: List[Dict[str, Any]], frame_size: Tuple[int, int]
+    ) -> np.ndarray:
+        """Update the held regions with this frame's boxes and return them.
+
+        A fresh box replaces the held regions it mostly covers (the same
+        object, seen again); held regions nobody replaced age by one frame
+        and are dropped after ``hold_frames``. The held set therefore stays
+        about one region per object.
+
+        Args:
+            detections: Detections of the frame
+            frame_size: (width, height) of the frame
+
+        Returns:
+            (K, 4) int32 x1, y1, x2, y2 regions to redact
+        """
+        width, height = frame_size
+        fresh = self._fresh_boxes(detections, width, height)
+        keep = self._age < self.hold_frames
+        if len(fresh) and keep.any():
+            covered = overlap_matrix(self._held, fresh, "ios").max(axis=1) >= 0.5
+            keep &= ~covered
+        self._held = np.concatenate([fresh, self._held[keep]])
+        self._age = np.concatenate(
+            [np.zeros(len(fresh), dtype=np.int64), self._age[keep] + 1]
+        )
+
+        boxes = clip_boxes(self._held, width, height)
+        regions = np.concatenate(
+            [np.floor(boxes[:, :2]), np.ceil(boxes[:, 2:])], axis=1
+        ).astype(np.int32)
+        return regions[
+            (regions[:, 2] > regions[:, 0]) & (regions[:, 3] > regions[:, 1])
+        ]
+
+    def redact(self, frame: np.ndarray, detections: List[Dict[str, Any]]) -> np.ndarray:
+        """Redact a frame in place.
+
+        Call for every frame that is shown, streamed or written, so held
+        regions cover frames without a fresh detection.
+
+        Args:
+            frame: BGR frame, modified in place
+            detections: Detections of the frame
+
+        Returns:
+            The redacted frame
+        """
+        height, width = frame.shape[:2]
+        if self.face_detector is not None:
+            detections = list(detections) + self.face_detector.detect_faces(frame)
+        regions = self.plan(detections, (width, height))
+        for x1, y1, x2, y2 in regions.tolist():
+            self._obscure(frame[y1:y2, x1:x2])
+            self.redacted_pixels += (x2 - x1) * (y2 - y1)
+        self.frames += 1
+        self.regions += len(regions)
+        return frame
+
+    def _obscure(self, roi: np.ndarray):
+        """Shrink a region to a few cells and scale it back up in place."""
+        height, width = roi.shape[:2]
+        scale = self.cells / max(width, height)
+        small = cv2.resize(
+            roi,
+            (max(1, round(width * scale)), max(1, round(height * scale))),
+            interpolation=cv2.INTER_AREA,
+        )
+        cv2.resize(small, (width, height), dst=roi, interpolation=self._interpolation)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get redaction counts."""
+        return {
+            "frames": self.frames,
+            "regions": self.regions,
+            "mean_regions": self.regions / self.frames if self.frames else 0.0,
+            "redacted_pixels": self.redacted_pixels,
+        }
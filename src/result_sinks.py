@@ -0,0 +1,356 @@
+import json
+import queue
+import socket
+import struct
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Sink kinds accepted by create_sink(), as "<kind>:<target>"
+SINK_KINDS = ("jsonl", "msgpack", "unix", "unix+msgpack")
+
+# Big-endian payload length in front of every msgpack record
+LENGTH_PREFIX = struct.Struct(">I")
+
+
+def _to_builtin(value):
+    """JSON fallback for numpy scalars and arrays."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def encode_json_lines(results: List[Dict[str, Any]]) -> bytes:
+    """Encode results as newline-delimited compact JSON."""
+    dumps = json.JSONEncoder(separators=(",", ":"), default=_to_builtin).encode
+    return "".join(dumps(result) + "\n" for result in results).encode()
+
+
+def encode_msgpack_frames(results: List[Dict[str, Any]]) -> bytes:
+    """Encode results as length-prefixed msgpack records.
+
+    Each record is a 4-byte big-endian length followed by that many bytes
+    of msgpack, so readers can split the stream without parsing it.
+    """
+    import msgpack
+
+    packer = msgpack.Packer(default=_to_builtin)
+    parts = []
+    for result in results:
+        body = packer.pack(result)
+        parts.append(LENGTH_PREFIX.pack(len(body)))
+        parts.append(body)
+    return b"".join(parts)
+
+
+def read_msgpack_frames(data: bytes) -> List[Dict[str, Any]]:
+    """Decode a buffer of complete length-prefixed msgpack records."""
+    import msgpack
+
+    results, offset = [], 0
+    while offset + LENGTH_PREFIX.size <= len(data):
+        (length,) = LENGTH_PREFIX.unpack_from(data, offset)
+        offset += LENGTH_PREFIX.size
+        results.append(msgpack.unpackb(data[offset : offset + length]))
+        offset += length
+    return results
+
+
+ENCODERS = {"json": encode_json_lines, "msgpack": encode_msgpack_frames}
+
+
+class ResultSink:
+    """Publish detection results from a background thread.
+
+    publish() never blocks: results go into a bounded queue and are
+    dropped (and counted) when it is full, so a slow consumer cannot stall
+    inference. The writer thread drains the queue in batches and hands
+    each batch to write() as one encoded buffer, which keeps the
+    per-message cost to a queue put and a share of one system call.
+
+    Subclasses implement open(), write() and close_output().
+    """
+
+    def __init__(
+        self,
+        encoding: str = "json",
+        max_queue: int = 4096,
+        batch_size: int = 256,
+        flush_interval: float = 0.05,
+    ):
+        """Initialize the sink.
+
+        Args:
+            encoding: "json" (newline-delimited) or "msgpack"
+                (length-prefixed)
+            max_queue: Results buffered before new ones are dropped
+            batch_size: Maximum results written per batch
+            flush_interval: Seconds a partial batch may wait
+        """
+        if encoding not in ENCODERS:
+            raise ValueError(f"Unknown encoding {encoding!r}")
+        self.encoding = encoding
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.published = 0
+        self.written = 0
+        self.errors = 0
+        # Each counter has a single writing thread, so no lock is needed
+        self._dropped_full = 0
+        self._dropped_write = 0
+        self._encode = ENCODERS[encoding]
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Called from the writer thread with every batch that was written
+        self.write_observer: Optional[Callable[[List[Dict[str, Any]]], None]] = None
+
+    @property
+    def dropped(self) -> int:
+        """Results lost to a full queue or a failed write."""
+        return self._dropped_full + self._dropped_write
+
+    @property
+    def name(self) -> str:
+        return type(self).__name__
+
+    def start(self) -> bool:
+        """Open the output and start the writer thread.
+
+        Returns:
+            bool: True if the sink is running, False otherwise
+        """
+        if self.encoding == "msgpack":
+            try:
+                import msgpack  # noqa: F401
+            except ImportError:
+                logger.error(f"{self.name} needs msgpack (pip install msgpack)")
+                return False
+        if not self.open():
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"sink-{self.name}", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def publish(self, result: Dict[str, Any]) -> bool:
+        """Queue a result for writing without blocking.
+
+        Returns:
+            bool: True if queued, False if dropped because the queue is full
+        """
+        try:
+            self._queue.put_nowait(result)
+        except queue.Full:
+            self._dropped_full += 1
+            return False
+        self.published += 1
+        return True
+
+    def close(self, timeout: float = 2.0):
+        """Flush queued results, stop the writer and close the output."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout)
+            self._thread = None
+        self.close_output()
+        logger.info(f"{self.name} closed: {self.stats()}")
+
+    def _run(self):
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                written = self.write(self._encode(batch))
+            except Exception as e:
+                self.errors += 1
+                self._dropped_write += len(batch)
+                logger.error(f"{self.name} write failed: {e}")
+                continue
+            if not written:
+                self._dropped_write += len(batch)
+                continue
+            self.written += len(batch)
+            if self.write_observer is not None:
+                try:
+                    self.write_observer(batch)
+                except Exception as e:
+                    logger.error(f"{self.name} write observer failed: {e}")
+
+    def open(self) -> bool:
+        """Open the output; called once by start()."""
+        return True
+
+    def write(self, data: bytes) -> bool:
+        """Write one encoded batch.
+
+        Returns:
+            bool: True if written, False if the batch had to be discarded
+        """
+        raise NotImplementedError
+
+    def close_output(self):
+        """Close the output; called once by close()."""
+
+    def stats(self) -> Dict[str, int]:
+        """Get published, written, dropped and error counts."""
+        return {
+            "published": self.published,
+            "written": self.written,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "queued": self._queue.qsize(),
+        }
+
+
+class JsonLinesSink(ResultSink):
+    """Write newline-delimited JSON to a file or stdout."""
+
+    def __init__(self, path: str = "-", **kwargs):
+        """Initialize the sink.
+
+        Args:
+            path: Output file (appended to), or "-" for stdout
+            **kwargs: ResultSink arguments
+        """
+        kwargs.setdefault("encoding", "json")
+        super().__init__(**kwargs)
+        self.path = path
+        self._file = None
+
+    def open(self) -> bool:
+        if self.path == "-":
+            self._file = sys.stdout.buffer
+            return True
+        try:
+            self._file = open(self.path, "ab")
+            return True
+        except OSError as e:
+            logger.error(f"Cannot open result file {self.path}: {e}")
+            return False
+
+    def write(self, data: bytes) -> bool:
+        self._file.write(data)
+        self._file.flush()
+        return True
+
+    def close_output(self):
+        if self._file is not None and self._file is not sys.stdout.buffer:
+            self._file.close()
+        self._file = None
+
+
+class MsgpackSink(JsonLinesSink):
+    """Write length-prefixed msgpack records to a file or stdout."""
+
+    def __init__(self, path: str = "-", **kwargs):
+        kwargs["encoding"] = "msgpack"
+        super().__init__(path, **kwargs)
+
+
+class UnixSocketSink(ResultSink):
+    """Stream results to a UNIX domain socket listener.
+
+    Connects lazily and reconnects after failures, at most once per
+    ``reconnect_interval``; batches produced while disconnected are
+    dropped rather than buffered.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        reconnect_interval: float = 1.0,
+        send_timeout: float = 1.0,
+        **kwargs,
+    ):
+        """Initialize the sink.
+
+        Args:
+            path: Socket path of the listening consumer
+            reconnect_interval: Minimum seconds between connection attempts
+            send_timeout: Give up on a stuck consumer after this many seconds
+            **kwargs: ResultSink arguments (e.g. encoding="msgpack")
+        """
+        super().__init__(**kwargs)
+        self.path = path
+        self.reconnect_interval = reconnect_interval
+        self.send_timeout = send_timeout
+        self._socket: Optional[socket.socket] = None
+        self._last_attempt = 0.0
+
+    def _connect(self) -> bool:
+        now = time.monotonic()
+        if now - self._last_attempt < self.reconnect_interval:
+            return False
+        self._last_attempt = now
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.send_timeout)
+        try:
+            sock.connect(self.path)
+        except OSError as e:
+            sock.close()
+            logger.warning(f"Cannot connect to result socket {self.path}: {e}")
+            return False
+        self._socket = sock
+        logger.info(f"Publishing results to {self.path}")
+        return True
+
+    def write(self, data: bytes) -> bool:
+        if self._socket is None and not self._connect():
+            return False
+        try:
+            self._socket.sendall(data)
+            return True
+        except OSError as e:
+            # A partial send would corrupt the stream; start over cleanly
+            logger.warning(f"Result socket {self.path} failed: {e}")
+            self.close_output()
+            return False
+
+    def close_output(self):
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+
+def create_sink(spec: str, **kwargs) -> ResultSink:
+    """Create a sink from a ``<kind>:<target>`` specification.
+
+    Examples: ``jsonl:-``, ``jsonl:detections.jsonl``,
+    ``msgpack:detections.bin``, ``unix:/tmp/smartdet.sock``,
+    ``unix+msgpack:/tmp/smartdet.sock``.
+
+    Args:
+        spec: Sink specification
+        **kwargs: ResultSink arguments
+
+    Returns:
+        ResultSink: Sink, not yet started
+    """
+    kind, _, target = spec.partition(":")
+    if kind not in SINK_KINDS or not target:
+        raise ValueError(
+            f"Invalid sink {spec!r}, expected <kind>:<target> with kind in "
+            f"{SINK_KINDS}"
+        )
+    if kind == "jsonl":
+        return JsonLinesSink(target, **kwargs)
+    if kind == "msgpack":
+        return MsgpackSink(target, **kwargs)
+    encoding = "msgpack" if kind == "unix+msgpack" else "json"
+    return UnixSocketSink(target, encoding=encoding, **kwargs)
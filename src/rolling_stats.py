@@ -0,0 +1,227 @@
+import time
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Default windows in seconds: 1 minute, 5 minutes, 1 hour
+DEFAULT_WINDOWS = (60.0, 300.0, 3600.0)
+
+
+def format_duration(seconds: float) -> str:
+    """Short label for a window length, e.g. 60 -> "1m", 3600 -> "1h"."""
+    for unit, size in (("h", 3600), ("m", 60)):
+        if seconds >= size and seconds % size == 0:
+            return f"{int(seconds // size)}{unit}"
+    return f"{seconds:g}s"
+
+
+class _Window:
+    """Ring of fixed-width time buckets with running totals.
+
+    Counts and confidence sums are kept as totals that gain each frame and
+    lose whole buckets as they expire, so both updates and sum queries are
+    O(1). Peaks cannot be subtracted; they are the maximum over the
+    (constant) number of buckets.
+    """
+
+    def __init__(self, length: float, buckets: int, classes: int):
+        self.length = length
+        self.buckets = buckets
+        self.width = length / buckets
+        self.head: Optional[int] = None
+        self.frames = np.zeros(buckets, dtype=np.int64)
+        self.counts = np.zeros((buckets, classes), dtype=np.int64)
+        self.confidence = np.zeros((buckets, classes), dtype=np.float64)
+        self.peaks = np.zeros((buckets, classes), dtype=np.int64)
+        self.total_peaks = np.zeros(buckets, dtype=np.int64)
+        self.frame_total = 0
+        self.count_total = np.zeros(classes, dtype=np.int64)
+        self.confidence_total = np.zeros(classes, dtype=np.float64)
+
+    def grow(self, classes: int):
+        """Add columns for newly seen classes."""
+        extra = classes - self.counts.shape[1]
+        pad = ((0, 0), (0, extra))
+        self.counts = np.pad(self.counts, pad)
+        self.confidence = np.pad(self.confidence, pad)
+        self.peaks = np.pad(self.peaks, pad)
+        self.count_total = np.pad(self.count_total, (0, extra))
+        self.confidence_total = np.pad(self.confidence_total, (0, extra))
+
+    def advance(self, timestamp: float) -> int:
+        """Expire buckets older than the window; return the current slot."""
+        index = int(timestamp // self.width)
+        if self.head is None:
+            self.head = index
+        elif index > self.head:
+            # Clear the buckets skipped since the last update, at most all
+            stale = np.arange(self.head + 1, min(index, self.head + self.buckets) + 1)
+            slots = stale % self.buckets
+            self.frame_total -= int(self.frames[slots].sum())
+            self.count_total -= self.counts[slots].sum(axis=0)
+            self.confidence_total -= self.confidence[slots].sum(axis=0)
+            for array in (
+                self.frames,
+                self.counts,
+                self.confidence,
+                self.peaks,
+                self.total_peaks,
+            ):
+                array[slots] = 0
+            self.head = index
+        # Late timestamps are credited to the current bucket
+        return self.head % self.buckets
+
+    def add(self, timestamp: float, counts, confidence, total: int):
+        slot = self.advance(timestamp)
+        self.frames[slot] += 1
+        self.frame_total += 1
+        self.counts[slot] += counts
+        self.count_total += counts
+        self.confidence[slot] += confidence
+        self.confidence_total += confidence
+        np.maximum(self.peaks[slot], counts, out=self.peaks[slot])
+        self.total_peaks[slot] = max(self.total_peaks[slot], total)
+
+
+class RollingStats:
+    """Per-class detection statistics over sliding time windows.
+
+    Every frame's detections update a ring of fixed-width buckets per
+    window (60 buckets each by default: 1 s buckets for 1 minute, 5 s for
+    5 minutes, 1 min for 1 hour). Memory is fixed by the number of windows,
+    buckets and classes seen, and windows slide in steps of one bucket.
+    Raw detections are never kept.
+    """
+
+    def __init__(self, windows: Sequence[float] = DEFAULT_WINDOWS, buckets: int = 60):
+        """Initialize the aggregator.
+
+        Args:
+            windows: Window lengths in seconds
+            buckets: Buckets per window; a window's resolution is its
+                length divided by this
+        """
+        self._class_index: Dict[str, int] = {}
+        self._windows = [
+            _Window(float(length), max(1, buckets), 0) for length in windows
+        ]
+        self.frames = 0
+        self.detections = 0
+
+    @property
+    def windows(self) -> List[float]:
+        """Window lengths in seconds."""
+        return [window.length for window in self._windows]
+
+    @property
+    def class_names(self) -> List[str]:
+        """Classes seen so far, in order of first appearance."""
+        return list(self._class_index)
+
+    def update(
+        self, detections: List[Dict[str, Any]], timestamp: Optional[float] = None
+    ):
+        """Add one frame's detections.
+
+        Call for every processed frame, including frames without
+        detections, so frame counts and rates stay correct.
+
+        Args:
+            detections: Detections of the frame
+            timestamp: Frame time in seconds (default: time.monotonic())
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+        index = self._class_index
+        columns = []
+        for detection in detections:
+            column = index.get(detection["class_name"])
+            if column is None:
+                column = index[detection["class_name"]] = len(index)
+                for window in self._windows:
+                    window.grow(len(index))
+            columns.append(column)
+        counts = np.bincount(columns, minlength=len(index)).astype(np.int64)
+        confidence = np.bincount(
+            columns, [d["confidence"] for d in detections], minlength=len(index)
+        )
+        for window in self._windows:
+            window.add(now, counts, confidence, len(detections))
+        self.frames += 1
+        self.detections += len(detections)
+
+    def summary(
+        self, window: Optional[float] = None, timestamp: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Aggregates over one window.
+
+        Args:
+            window: Window length in seconds (default: the shortest)
+            timestamp: Query time (default: time.monotonic()); buckets
+                older than the window at this time are expired first
+
+        Returns:
+            dict: ``window`` seconds, ``frames``, ``detections``,
+            ``peak_objects`` (most objects in one frame) and ``classes``
+            mapping each class seen in the window to its ``count``,
+            ``mean_confidence``, ``peak`` (most in one frame) and ``per_frame``
+        """
+        if not self._windows:
+            raise ValueError("No windows configured")
+        if window is None:
+            ring = min(self._windows, key=lambda ring: ring.length)
+        else:
+            matches = [ring for ring in self._windows if ring.length == window]
+            if not matches:
+                raise ValueError(f"Unknown window {window}, expected {self.windows}")
+            ring = matches[0]
+        ring.advance(time.monotonic() if timestamp is None else timestamp)
+
+        peaks = ring.peaks.max(axis=0)
+        frames = ring.frame_total
+        classes = {}
+        for name, column in self._class_index.items():
+            count = int(ring.count_total[column])
+            if count <= 0:
+                continue
+            classes[name] = {
+                "count": count,
+                "mean_confidence": float(ring.confidence_total[column]) / count,
+                "peak": int(peaks[column]),
+                "per_frame": count / frames if frames else 0.0,
+            }
+        return {
+            "window": ring.length,
+            "frames": frames,
+            "detections": int(ring.count_total.sum()),
+            "peak_objects": int(ring.total_peaks.max()),
+            "classes": classes,
+        }
+
+    def summaries(self, timestamp: Optional[float] = None) -> List[Dict[str, Any]]:
+        """summary() of every window, shortest first."""
+        now = time.monotonic() if timestamp is None else timestamp
+        return [self.summary(length, now) for length in sorted(self.windows)]
+
+    def format_summary(self, timestamp: Optional[float] = None) -> str:
+        """One log line per window, e.g.
+        ``Last 1m: 1800 frames, peak 4 objects; person 2100 (conf 0.81, peak 3)``
+        """
+        lines = []
+        for summary in self.summaries(timestamp):
+            classes = sorted(
+                summary["classes"].items(), key=lambda item: -item[1]["count"]
+            )
+            detail = ", ".join(
+                f"{name} {stats['count']} "
+                f"(conf {stats['mean_confidence']:.2f}, peak {stats['peak']})"
+                for name, stats in classes
+            )
+            lines.append(
+                f"Last {format_duration(summary['window'])}: "
+                f"{summary['frames']} frames, peak {summary['peak_objects']} objects"
+                + (f"; {detail}" if detail else "")
+            )
+        return "\n".join(lines)
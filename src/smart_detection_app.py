@@ -1,12 +1,42 @@
 import cv2
 import logging
 import time
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, List, Optional
+from .analytics import ZoneAnalytics
 from .camera_handler import CameraHandler
+from .frame_latency import FrameInfo, LatencyTracker
+from .heatmap import OccupancyHeatmap
+from .metrics import MetricsRegistry, MetricsServer
+from .mjpeg_server import FrameBroadcaster, MjpegServer
+from .model_cascade import ModelCascade
 from .object_detector import ObjectDetector
+from .profiling import TraceRecorder
+from .redaction import Redactor
+from .result_sinks import ResultSink
+from .rolling_stats import RollingStats
+from .snapshot_store import SnapshotStore
+from .tiling import MotionTileSelector, TiledDetector
 
 logger = logging.getLogger(__name__)
 
+# Stages timed by the run loop and reported in stage_latency_seconds
+PIPELINE_STAGES = (
+    "capture",
+    "grab",
+    "inference",
+    "decode",
+    "analytics",
+    "heatmap",
+    "redact",
+    "snapshot",
+    "draw",
+    "stream",
+    "write",
+    "display",
+)
+
 
 class SmartDetectionApp:
     """Main application class for webcam smart detection."""
@@ -16,6 +46,30 @@ class SmartDetectionApp:
         camera_id: int = 0,
         model_path: str = "yolov8n.pt",
         confidence_threshold: float = 0.5,
+        metrics: Optional[MetricsRegistry] = None,
+        metrics_port: Optional[int] = None,
+        metrics_host: str = "127.0.0.1",
+        tracer: Optional[TraceRecorder] = None,
+        warmup_frames: int = 2,
+        detector_options: Optional[dict] = None,
+        cascade_model_path: Optional[str] = None,
+        cascade_options: Optional[dict] = None,
+        camera_options: Optional[dict] = None,
+        tile_options: Optional[dict] = None,
+        stream_port: Optional[int] = None,
+        stream_host: str = "127.0.0.1",
+        stream_options: Optional[dict] = None,
+        sinks: Optional[List[ResultSink]] = None,
+        reconnect_timeout: Optional[float] = None,
+        process_every: int = 1,
+        analytics: Optional[ZoneAnalytics] = None,
+        heatmap: Optional[OccupancyHeatmap] = None,
+        heatmap_overlay: Optional[float] = None,
+        rolling_stats: Optional[RollingStats] = None,
+        stats_interval: float = 60.0,
+        redactor: Optional[Redactor] = None,
+        snapshot_store: Optional[SnapshotStore] = None,
+        latency_target: Optional[float] = None,
     ):
         """Initialize the smart detection application.
 
@@ -23,10 +77,262 @@ class SmartDetectionApp:
             camera_id: Camera device ID
             model_path: Path to YOLO model file
             confidence_threshold: Minimum confidence score for detections
+            metrics: Registry to record metrics into (default: a new one)
+            metrics_port: Serve metrics on http://host:port/metrics if set
+            metrics_host: Interface for the metrics endpoint
+            tracer: Record per-frame stage spans for trace export if set
+            warmup_frames: Dummy inferences run at the capture resolution
+                before the first real frame (0 disables warm-up)
+            detector_options: Extra ObjectDetector arguments (backend,
+                imgsz, half, cache_dir, ...)
+            cascade_model_path: Accurate model to cascade with; model_path
+                becomes the fast model and the app switches between them
+                under load
+            cascade_options: Extra ModelCascade arguments (frame_budget,
+                refine_band, ...)
+            camera_options: Extra CameraHandler arguments (frame_width,
+                frame_height, fps)
+            tile_options: Run detection on tiles of each frame if set;
+                TiledDetector arguments (tile_size, overlap, ...), plus
+                "motion" to skip tiles without motion
+            stream_port: Serve annotated frames as MJPEG on
+                http://host:port/ if set
+            stream_host: Interface for the stream server
+            stream_options: Extra FrameBroadcaster arguments (quality,
+                scale, max_fps)
+            sinks: Result sinks that receive the detections of every frame
+                with at least one detection
+            reconnect_timeout: Seconds to keep trying to reopen a lost
+                camera before exiting (default: until stopped)
+            process_every: Run detection on every Nth frame; the frames in
+                between are grabbed but never decoded
+            analytics: Count zone occupancy and line crossings of the
+                detections if set; results are added to published frames
+            heatmap: Accumulate where detections spend time if set
+            heatmap_overlay: Blend the heatmap onto output frames with this
+                opacity (default: no overlay)
+            rolling_stats: Aggregate per-class statistics of every frame
+                over sliding windows if set
+            stats_interval: Seconds between logging the rolling statistics
+                and frame ages (0 disables)
+            redactor: Obscure people and faces before frames are drawn on,
+                displayed, streamed or recorded if set
+            snapshot_store: Store thumbnails of significant detections if
+                set; crops are taken after redaction
+            latency_target: Age in seconds that frames should stay under at
+                every output; older ones are counted
         """
-        self.camera_handler = CameraHandler(camera_id)
-        self.object_detector = ObjectDetector(model_path, confidence_threshold)
+        self.camera_handler = CameraHandler(camera_id, **(camera_options or {}))
+        self.tile_options = tile_options
+        self.object_detector = self._build_detector(
+            model_path, confidence_threshold, detector_options
+        )
+        if cascade_model_path:
+            accurate = self._build_detector(
+                cascade_model_path, confidence_threshold, detector_options
+            )
+            cascade_options = dict(cascade_options or {})
+            cascade_options.setdefault("frame_budget", 1.0 / self.camera_handler.fps)
+            self.object_detector = ModelCascade(
+                self.object_detector, accurate, **cascade_options
+            )
         self.running = False
+        self.reconnect_timeout = reconnect_timeout
+        self.process_every = max(1, process_every)
+        self.tracer = tracer
+        self.warmup_frames = warmup_frames
+        self._frame_index = 0
+        self._frame_info: Optional[FrameInfo] = None
+
+        self.metrics = metrics or MetricsRegistry()
+        self.metrics_server = None
+        if metrics_port is not None:
+            self.metrics_server = MetricsServer(
+                self.metrics, metrics_port, metrics_host
+            )
+        self.latency = LatencyTracker(self.metrics, latency_target)
+
+        self.sinks = list(sinks or [])
+        self.analytics = analytics
+        self.heatmap = heatmap
+        self.heatmap_overlay = heatmap_overlay
+        self.rolling_stats = rolling_stats
+        self.stats_interval = stats_interval
+        self.redactor = redactor
+        self.snapshot_store = snapshot_store
+        self.broadcaster = None
+        self.stream_server = None
+        if stream_port is not None:
+            self.broadcaster = FrameBroadcaster(**(stream_options or {}))
+            self.stream_server = MjpegServer(self.broadcaster, stream_port, stream_host)
+        self._setup_metrics(str(camera_id))
+        self.object_detector.stage_observer = self._record_stage
+
+    def _build_detector(
+        self,
+        model_path: str,
+        confidence_threshold: float,
+        detector_options: Optional[dict],
+    ):
+        """Create an ObjectDetector, wrapped for tiled inference if enabled."""
+        detector = ObjectDetector(
+            model_path, confidence_threshold, **(detector_options or {})
+        )
+        if self.tile_options is None:
+            return detector
+        tile_options = dict(self.tile_options)
+        motion = tile_options.pop("motion", None)
+        if motion:
+            selector_options = motion if isinstance(motion, dict) else {}
+            tile_options["motion_selector"] = MotionTileSelector(**selector_options)
+        return TiledDetector(detector, **tile_options)
+
+    def _setup_metrics(self, camera: str):
+        """Register the per-camera metric series used by the run loop."""
+        self._camera_label = camera
+        self._stage_latency_metric = self.metrics.histogram(
+            "stage_latency_seconds",
+            "Per-frame latency of each pipeline stage",
+            ("camera", "stage"),
+        )
+        self._stage_latency = {
+            stage: self._stage_latency_metric.labels(camera=camera, stage=stage)
+            for stage in PIPELINE_STAGES
+        }
+        self._frames_processed = self.metrics.counter(
+            "frames_processed_total", "Frames run through detection", ("camera",)
+        ).labels(camera=camera)
+        self._frames_dropped = self.metrics.counter(
+            "frames_dropped_total", "Frames lost to failed camera reads", ("camera",)
+        ).labels(camera=camera)
+        self._frames_skipped = self.metrics.counter(
+            "frames_skipped_total",
+            "Frames captured but not run through detection",
+            ("camera",),
+        ).labels(camera=camera)
+        self._detections_metric = self.metrics.counter(
+            "detections_total", "Detections per class", ("camera", "class_name")
+        )
+        self._detections_by_class = {}
+        self._queue_depth = self.metrics.gauge(
+            "queue_depth", "Items waiting in pipeline queues", ("camera", "queue")
+        )
+        self._frame_pool_in_use = self._queue_depth.labels(
+            camera=camera, queue="frame_pool"
+        )
+        self._camera_up = self.metrics.gauge(
+            "camera_up", "1 while the camera delivers frames", ("camera",)
+        ).labels(camera=camera)
+        self._camera_reconnects = self.metrics.counter(
+            "camera_reconnects_total", "Successful camera reconnections", ("camera",)
+        ).labels(camera=camera)
+        if self.analytics is not None:
+            self._setup_analytics_metrics(camera)
+
+    def _setup_analytics_metrics(self, camera: str):
+        """Register per-zone and per-line series for the analytics engine."""
+        occupancy = self.metrics.gauge(
+            "zone_occupancy", "Objects currently inside each zone", ("camera", "zone")
+        )
+        entries = self.metrics.counter(
+            "zone_entries_total", "Objects that entered each zone", ("camera", "zone")
+        )
+        exits = self.metrics.counter(
+            "zone_exits_total", "Objects that left each zone", ("camera", "zone")
+        )
+        crossings = self.metrics.counter(
+            "line_crossings_total",
+            "Objects that crossed each tripwire",
+            ("camera", "line", "direction"),
+        )
+        self._zone_metrics = {
+            zone.name: (
+                occupancy.labels(camera=camera, zone=zone.name),
+                entries.labels(camera=camera, zone=zone.name),
+                exits.labels(camera=camera, zone=zone.name),
+            )
+            for zone in self.analytics.zones
+        }
+        self._line_metrics = {
+            (wire.name, direction): crossings.labels(
+                camera=camera, line=wire.name, direction=direction
+            )
+            for wire in self.analytics.tripwires
+            for direction in ("in", "out")
+        }
+
+    def _analyze(self, detections) -> Dict[str, Any]:
+        """Run the analytics engine on a frame and update its metrics."""
+        start = time.perf_counter()
+        result = self.analytics.update(detections)
+        self._record_stage("analytics", start, time.perf_counter())
+        for name, count in result["occupancy"].items():
+            self._zone_metrics[name][0].set(count)
+        for event in result["events"]:
+            if event["type"] == "cross":
+                self._line_metrics[(event["line"], event["direction"])].inc()
+            else:
+                _, entries, exits = self._zone_metrics[event["zone"]]
+                (entries if event["type"] == "enter" else exits).inc()
+        return result
+
+    def _record_stage(self, stage: str, start: float, end: float):
+        """Record a stage duration measured with time.perf_counter()."""
+        child = self._stage_latency.get(stage)
+        if child is None:
+            child = self._stage_latency_metric.labels(
+                camera=self._camera_label, stage=stage
+            )
+            self._stage_latency[stage] = child
+        child.observe(end - start)
+        if self.tracer is not None:
+            self.tracer.add_span(stage, start, end, self._frame_index)
+
+    def _count_detections(self, detections):
+        """Increment the per-class detection counters."""
+        for detection in detections:
+            class_name = detection["class_name"]
+            child = self._detections_by_class.get(class_name)
+            if child is None:
+                child = self._detections_metric.labels(
+                    camera=self._camera_label, class_name=class_name
+                )
+                self._detections_by_class[class_name] = child
+            child.inc()
+
+    def _observe_age(self, output: str):
+        """Record how old the current frame is as it reaches an output."""
+        if self._frame_info is not None:
+            self.latency.observe_timestamp(
+                self._camera_label, self._frame_info.timestamp, output
+            )
+
+    def _observe_written(self, output: str, results: List[Dict[str, Any]]):
+        """Record frame ages of results a sink has written; any thread."""
+        now = time.monotonic()
+        for result in results:
+            capture = result.get("capture")
+            if capture is not None:
+                self.latency.observe_timestamp(
+                    result["camera"], capture["timestamp"], output, now
+                )
+
+    def _publish(self, detections, analysis: Optional[Dict[str, Any]] = None):
+        """Hand a frame's detections to every result sink."""
+        if not self.sinks:
+            return
+        result = {
+            "camera": self._camera_label,
+            "frame_index": self._frame_index,
+            "timestamp": time.time(),
+            "detections": detections,
+        }
+        if self._frame_info is not None:
+            result["capture"] = self._frame_info.to_dict()
+        if analysis is not None:
+            result["analytics"] = analysis
+        for sink in self.sinks:
+            sink.publish(result)
 
     def initialize(self) -> bool:
         """Initialize camera and model.
@@ -36,17 +342,62 @@ class SmartDetectionApp:
         """
         logger.info("Initializing Smart Detection App...")
 
-        # Initialize camera
-        if not self.camera_handler.initialize_camera():
+        # Load and warm up the model while the camera opens; both are slow
+        # and independent, so startup costs the longer of the two
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="model") as pool:
+            model_ready = pool.submit(self._prepare_model)
+
+            # Initialize camera
+            camera_ready = self.camera_handler.initialize_camera()
+
+            if not model_ready.result():
+                logger.error("Failed to load detection model")
+                return False
+
+        if not camera_ready:
             logger.error("Failed to initialize camera")
             return False
 
-        # Load detection model
-        if not self.object_detector.load_model():
-            logger.error("Failed to load detection model")
+        logger.info("Smart Detection App initialized successfully")
+        return True
+
+    def _recover_camera(self) -> bool:
+        """Handle a failed read without tearing down the pipeline.
+
+        The model, metrics and other downstream stages stay loaded while
+        the camera is reopened.
+
+        Returns:
+            bool: True to keep running, False to stop
+        """
+        camera = self.camera_handler
+        if not camera.is_live:
+            logger.info("End of video")
+            return False
+        if not camera.needs_reconnect():
+            # Transient hiccup; try the next read
+            return self.running
+        self._camera_up.set(0)
+        logger.warning(f"Camera lost ({camera.health()}), reconnecting")
+        if not self.running or not camera.reconnect(self.reconnect_timeout):
             return False
+        self._camera_reconnects.inc()
+        return self.running
 
-        logger.info("Smart Detection App initialized successfully")
+    def _prepare_model(self) -> bool:
+        """Load the detection model and warm it up at the capture resolution.
+
+        Returns:
+            bool: True if the model is ready, False otherwise
+        """
+        if not self.object_detector.load_model():
+            return False
+        if self.warmup_frames > 0:
+            frame_size = (
+                self.camera_handler.frame_width,
+                self.camera_handler.frame_height,
+            )
+            self.object_detector.warmup(frame_size, self.warmup_frames)
         return True
 
     def run(
@@ -66,9 +417,21 @@ class SmartDetectionApp:
             logger.error("Failed to initialize application")
             return
 
+        if self.metrics_server is not None:
+            self.metrics_server.start()
+        if self.stream_server is not None:
+            self.stream_server.start()
+        self.sinks = [sink for sink in self.sinks if sink.start()]
+        for sink in self.sinks:
+            sink.write_observer = partial(self._observe_written, f"sink:{sink.name}")
+        if self.snapshot_store is not None and not self.snapshot_store.start():
+            self.snapshot_store = None
+
         self.running = True
         frame_count = 0
+        captured = 0
         start_time = time.time()
+        last_stats_log = time.monotonic()
 
         # Video writer for saving output
         video_writer = None
@@ -84,40 +447,153 @@ class SmartDetectionApp:
 
         try:
             while self.running:
-                # Read frame from camera
-                ret, frame = self.camera_handler.read_frame()
+                captured += 1
+                if captured % self.process_every:
+                    # Keep the stream current without paying for decoding
+                    grab_start = time.perf_counter()
+                    grabbed = self.camera_handler.grab_frame()
+                    self._record_stage("grab", grab_start, time.perf_counter())
+                    if grabbed:
+                        self._frames_skipped.inc()
+                    else:
+                        self._frames_dropped.inc()
+                        if not self._recover_camera():
+                            break
+                    continue
+
+                # Read frame from camera into a pooled buffer
+                self._frame_index = frame_count
+                read_start = time.perf_counter()
+                ret, pooled = self.camera_handler.read_pooled_frame()
+                self._record_stage("capture", read_start, time.perf_counter())
                 if not ret:
-                    logger.warning("Failed to read frame from camera")
-                    break
+                    self._frames_dropped.inc()
+                    if not self._recover_camera():
+                        break
+                    continue
+                self._camera_up.set(1)
+                self._frame_info = pooled.info
 
-                # Detect objects
-                detections = self.object_detector.detect_objects(frame)
+                pool = self.camera_handler.frame_pool
+                self._frame_pool_in_use.set(pool.in_use if pool else 0)
 
-                # Draw detections on frame
-                if detections:
-                    frame = self.object_detector.draw_detections(frame, detections)
-                    logger.info(f"Detected {len(detections)} objects")
+                with pooled as frame:
+                    # Detect objects (inference and decode are timed by the detector)
+                    detections = self.object_detector.detect_objects(frame)
+                    self._frames_processed.inc()
+                    self._observe_age("detect")
 
-                # Save frame if required
-                if video_writer:
-                    video_writer.write(frame)
+                    # Every frame, so objects that left are forgotten and
+                    # heat fades while the scene is empty
+                    analysis = None
+                    if self.analytics is not None:
+                        analysis = self._analyze(detections)
+                    if self.rolling_stats is not None:
+                        self.rolling_stats.update(detections)
+                    if self.heatmap is not None:
+                        heatmap_start = time.perf_counter()
+                        self.heatmap.update(
+                            detections, (frame.shape[1], frame.shape[0])
+                        )
+                        self._record_stage(
+                            "heatmap", heatmap_start, time.perf_counter()
+                        )
 
-                # Display frame
-                if display_window:
-                    cv2.imshow("Smart Detection", frame)
+                    # Before anything leaves the process; boxes are drawn on top
+                    if self.redactor is not None:
+                        redact_start = time.perf_counter()
+                        frame = self.redactor.redact(frame, detections)
+                        self._record_stage("redact", redact_start, time.perf_counter())
 
-                    # Check for quit key
-                    key = cv2.waitKey(1) & 0xFF
-                    if key == ord("q") or key == 27:  # 'q' or ESC
-                        break
+                    # Only the crop copy; encoding happens on the store's workers
+                    if self.snapshot_store is not None and detections:
+                        snapshot_start = time.perf_counter()
+                        self.snapshot_store.submit(
+                            frame,
+                            detections,
+                            camera=self._camera_label,
+                            frame_index=self._frame_index,
+                        )
+                        self._record_stage(
+                            "snapshot", snapshot_start, time.perf_counter()
+                        )
+
+                    # Heat goes underneath the boxes and zones
+                    if self.heatmap is not None and self.heatmap_overlay:
+                        draw_start = time.perf_counter()
+                        frame = self.heatmap.overlay(frame, self.heatmap_overlay)
+                        self._record_stage("draw", draw_start, time.perf_counter())
+
+                    # Empty frames still carry occupancy and exit events
+                    if detections or analysis is not None:
+                        self._publish(detections, analysis)
+
+                    # Draw detections on frame
+                    if detections:
+                        self._count_detections(detections)
+                        draw_start = time.perf_counter()
+                        frame = self.object_detector.draw_detections(frame, detections)
+                        self._record_stage("draw", draw_start, time.perf_counter())
+                        logger.info(f"Detected {len(detections)} objects")
+                    if self.analytics is not None:
+                        draw_start = time.perf_counter()
+                        frame = self.analytics.draw(frame)
+                        self._record_stage("draw", draw_start, time.perf_counter())
+
+                    # Share with live viewers; costs nothing when nobody watches
+                    if self.broadcaster is not None and self.broadcaster.viewers:
+                        stream_start = time.perf_counter()
+                        self.broadcaster.publish(frame)
+                        self._record_stage("stream", stream_start, time.perf_counter())
+                        self._observe_age("stream")
+
+                    # Save frame if required
+                    if video_writer:
+                        write_start = time.perf_counter()
+                        video_writer.write(frame)
+                        self._record_stage("write", write_start, time.perf_counter())
+                        self._observe_age("write")
+
+                    # Display frame
+                    if display_window:
+                        display_start = time.perf_counter()
+                        cv2.imshow("Smart Detection", frame)
+
+                        # Check for quit key
+                        key = cv2.waitKey(1) & 0xFF
+                        self._record_stage(
+                            "display", display_start, time.perf_counter()
+                        )
+                        self._observe_age("display")
+                        if key == ord("q") or key == 27:  # 'q' or ESC
+                            break
 
                 frame_count += 1
+                if self.tracer is not None:
+                    self.tracer.add_span(
+                        "frame", read_start, time.perf_counter(), frame_count - 1
+                    )
 
                 # Log FPS every 30 frames
                 if frame_count % 30 == 0:
                     elapsed_time = time.time() - start_time
                     fps = frame_count / elapsed_time
                     logger.info(f"FPS: {fps:.2f}")
+                    if isinstance(self.object_detector, ModelCascade):
+                        logger.info(f"Cascade: {self.object_detector.stats()}")
+                    elif isinstance(self.object_detector, TiledDetector):
+                        logger.info(f"Tiling: {self.object_detector.stats()}")
+
+                if (
+                    self.stats_interval > 0
+                    and time.monotonic() - last_stats_log >= self.stats_interval
+                ):
+                    last_stats_log = time.monotonic()
+                    if self.rolling_stats is not None:
+                        for line in self.rolling_stats.format_summary().splitlines():
+                            logger.info(line)
+                    for line in self.latency.format_summary().splitlines():
+                        logger.info(line)
 
         except KeyboardInterrupt:
             logger.info("Application stopped by user")
@@ -135,9 +611,24 @@ class SmartDetectionApp:
         if video_writer:
             video_writer.release()
 
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        if self.stream_server is not None:
+            self.stream_server.stop()
+        for sink in self.sinks:
+            sink.close()
+        if self.heatmap is not None:
+            self.heatmap.close()
+        if self.snapshot_store is not None:
+            self.snapshot_store.close()
+        # After the sinks have flushed, so their last writes are included
+        for line in self.latency.format_summary().splitlines():
+            logger.info(line)
+
         cv2.destroyAllWindows()
         logger.info("Cleanup completed")
 
     def stop(self):
         """Stop the application."""
         self.running = False
+        self.camera_handler.interrupt()
@@ -0,0 +1,404 @@
+import json
+import os
+import queue
+import threading
+import time
+import cv2
+import numpy as np
+from collections import OrderedDict, deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.jsonl"
+
+# Objects whose recent hashes are remembered for deduplication
+MAX_RECENT_OBJECTS = 4096
+
+
+def difference_hash(image: np.ndarray) -> int:
+    """64-bit dHash: brightness gradients of a 9x8 grayscale thumbnail.
+
+    Near-identical crops differ in only a few bits, so the Hamming distance
+    between hashes measures visual similarity.
+    """
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(image, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).reshape(-1)
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class _Crop:
+    """A crop waiting to be encoded, with its index metadata."""
+
+    __slots__ = ("image", "meta", "key")
+
+    def __init__(self, image: np.ndarray, meta: Dict[str, Any], key: Tuple):
+        self.image = image
+        self.meta = meta
+        self.key = key
+
+
+class SnapshotStore:
+    """Rolling store of JPEG thumbnails of significant detections.
+
+    submit() is called from the frame loop and only copies the crops (large
+    boxes subsampled while copying, so the copy stays small) into a queue
+    bounded by bytes; when the queue is full, crops are dropped and counted. Worker
+    threads take batches of crops, skip those that look like a recent
+    snapshot of the same object (dHash within ``dedup_distance`` bits),
+    resize and JPEG-encode the rest, and append them to the index. The
+    oldest snapshots are deleted once the store exceeds ``max_bytes``, and
+    the index is compacted as entries are evicted.
+
+    Snapshots are ``<directory>/<camera>/<ms>_<frame>_<n>_<class>.jpg``;
+    ``index.jsonl`` lists them oldest first with camera, frame index,
+    timestamp, class, confidence, box and track id.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        min_confidence: float = 0.6,
+        classes: Optional[Iterable[str]] = None,
+        min_size: int = 32,
+        max_side: int = 256,
+        quality: int = 85,
+        workers: int = 2,
+        batch_size: int = 16,
+        max_queue_bytes: int = 32 << 20,
+        max_bytes: int = 512 << 20,
+        dedup_distance: int = 6,
+        dedup_window: float = 30.0,
+    ):
+        """Initialize the store.
+
+        Args:
+            directory: Directory for snapshots and the index
+            min_confidence: Only keep detections at least this confident
+            classes: Only keep these class names (default: all)
+            min_size: Skip boxes narrower or shorter than this many pixels
+            max_side: Longest side of a stored thumbnail
+            quality: JPEG quality
+            workers: Encoding threads
+            batch_size: Crops a worker takes from the queue at once
+            max_queue_bytes: Crop bytes waiting for encoding before new
+                crops are dropped
+            max_bytes: Size of the store before the oldest snapshots are
+                deleted
+            dedup_distance: Skip a crop within this many dHash bits of a
+                snapshot of the same object (0 disables deduplication)
+            dedup_window: Seconds a snapshot suppresses similar ones
+        """
+        self.directory = directory
+        self.min_confidence = min_confidence
+        self.classes = set(classes) if classes is not None else None
+        self.min_size = min_size
+        self.max_side = max_side
+        self.quality = quality
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.max_queue_bytes = max_queue_bytes
+        self.max_bytes = max_bytes
+        self.dedup_distance = dedup_distance
+        self.dedup_window = dedup_window
+
+        self.submitted = 0
+        self.dropped = 0
+        self.deduplicated = 0
+        self.written = 0
+        self.evicted = 0
+        self.errors = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._queued_bytes = 0
+        self._lock = threading.Lock()
+        # (index entry, bytes) of stored snapshots, oldest first
+        self._entries: deque = deque()
+        self._stored_bytes = 0
+        self._stale_lines = 0
+        # Object key -> recent (timestamp, hash) pairs, least recently
+        # snapshotted object first
+        self._recent: "OrderedDict[Tuple, deque]" = OrderedDict()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.directory, INDEX_FILE)
+
+    def start(self) -> bool:
+        """Load the existing index and start the encoding workers.
+
+        Returns:
+            bool: True if the store is running, False otherwise
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self._load_index()
+        except OSError as e:
+            logger.error(f"Cannot open snapshot store {self.directory}: {e}")
+            return False
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"snapshot-{n}", daemon=True)
+            for n in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(
+            f"Snapshot store {self.directory}: {len(self._entries)} snapshots, "
+            f"{self._stored_bytes / 2**20:.1f} MiB"
+        )
+        return True
+
+    def _load_index(self):
+        """Pick up snapshots of earlier runs so the size cap covers them."""
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                path = os.path.join(self.directory, entry["file"])
+                if os.path.exists(path):
+                    self._entries.append((entry, entry["bytes"]))
+                    self._stored_bytes += entry["bytes"]
+                else:
+                    self._stale_lines += 1
+
+    def submit(
+        self,
+        frame: np.ndarray,
+        detections: List[Dict[str, Any]],
+        camera: str = "0",
+        frame_index: int = 0,
+        timestamp: Optional[float] = None,
+    ) -> int:
+        """Queue crops of a frame's significant detections without blocking.
+
+        Args:
+            frame: BGR frame the detections belong to
+            detections: Detections of the frame
+            camera: Camera name, also the snapshot subdirectory
+            frame_index: Frame number, for the index
+            timestamp: Wall-clock time of the frame (default: now)
+
+        Returns:
+            int: Number of crops queued
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        height, width = frame.shape[:2]
+        queued = 0
+        for number, detection in enumerate(detections):
+            if detection["confidence"] < self.min_confidence or (
+                self.classes is not None and detection["class_name"] not in self.classes
+            ):
+                continue
+            x1, y1, x2, y2 = (int(v) for v in detection["bbox"])
+            x1, y1 = max(x1, 0), max(y1, 0)
+            x2, y2 = min(x2, width), min(y2, height)
+            if x2 - x1 < self.min_size or y2 - y1 < self.min_size:
+                continue
+            # Large boxes are subsampled while copying; the thumbnail is made
+            # from at least twice its final resolution either way
+            step = max(1, max(x2 - x1, y2 - y1) // (2 * self.max_side))
+            size = (-(-(x2 - x1) // step), -(-(y2 - y1) // step))
+            nbytes = size[0] * size[1] * (frame.nbytes // (width * height))
+            self.submitted += 1
+            with self._lock:
+                if self._queued_bytes + nbytes > self.max_queue_bytes:
+                    self.dropped += 1
+                    continue
+                self._queued_bytes += nbytes
+            if step == 1:
+                crop = frame[y1:y2, x1:x2].copy()
+            else:
+                crop = cv2.resize(
+                    frame[y1:y2, x1:x2], size, interpolation=cv2.INTER_NEAREST
+                )
+            meta = {
+                "camera": camera,
+                "frame_index": frame_index,
+                "number": number,
+                "timestamp": timestamp,
+                "class_name": detection["class_name"],
+                "confidence": round(float(detection["confidence"]), 4),
+                "bbox": [x1, y1, x2, y2],
+            }
+            track_id = detection.get("track_id")
+            if track_id is not None:
+                meta["track_id"] = track_id
+            key = (camera, detection["class_name"], track_id)
+            self._queue.put(_Crop(crop, meta, key))
+            queued += 1
+        return queued
+
+    def _run(self):
+        while True:
+            try:
+                batch = [self._queue.get(timeout=0.05)]
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            with self._lock:
+                self._queued_bytes -= sum(item.image.nbytes for item in batch)
+            try:
+                self._store(self._encode(batch))
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                logger.error(f"Snapshot batch failed: {e}")
+
+    def _is_duplicate(self, item: _Crop, digest: int) -> bool:
+        """Check a crop against recent snapshots of the same object."""
+        if self.dedup_distance <= 0:
+            return False
+        now = item.meta["timestamp"]
+        with self._lock:
+            recent = self._recent.get(item.key)
+            if recent is None:
+                recent = self._recent[item.key] = deque(maxlen=32)
+            while recent and now - recent[0][0] > self.dedup_window:
+                recent.popleft()
+            if any(hamming(digest, seen) <= self.dedup_distance for _, seen in recent):
+                self.deduplicated += 1
+                return True
+            recent.append((now, digest))
+            self._recent.move_to_end(item.key)
+            self._forget_objects(now)
+        return False
+
+    def _forget_objects(self, now: float):
+        """Forget objects not snapshotted within the dedup window.
+
+        Beyond MAX_RECENT_OBJECTS, the least recently snapshotted objects
+        are forgotten first. Track ids are rarely seen again once an object
+        leaves, so entries must expire by age, not on their next lookup.
+        """
+        recent = self._recent
+        while recent:
+            oldest = next(iter(recent.values()))
+            expired = not oldest or now - oldest[-1][0] > self.dedup_window
+            if not expired and len(recent) <= MAX_RECENT_OBJECTS:
+                break
+            recent.popitem(last=False)
+
+    def _encode(self, batch: List[_Crop]) -> List[Tuple[Dict[str, Any], bytes]]:
+        """Thumbnail and JPEG-encode the crops that are not duplicates."""
+        encoded = []
+        for item in batch:
+            digest = difference_hash(item.image)
+            if self._is_duplicate(item, digest):
+                continue
+            image = item.image
+            scale = self.max_side / max(image.shape[:2])
+            if scale < 1:
+                size = (
+                    max(1, round(image.shape[1] * scale)),
+                    max(1, round(image.shape[0] * scale)),
+                )
+                image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+            ok, data = cv2.imencode(
+                ".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, self.quality]
+            )
+            if not ok:
+                logger.warning(f"Could not encode a {image.shape} crop")
+                continue
+            meta = dict(item.meta, hash=f"{digest:016x}")
+            encoded.append((meta, data.tobytes()))
+        return encoded
+
+    def _store(self, encoded: List[Tuple[Dict[str, Any], bytes]]):
+        """Write a batch of snapshots, append it to the index and evict."""
+        if not encoded:
+            return
+        lines = []
+        entries = []
+        for meta, data in encoded:
+            camera = str(meta["camera"])
+            # Wall-clock milliseconds keep names unique across restarts
+            name = (
+                f"{int(meta['timestamp'] * 1000)}_{meta['frame_index']}_"
+                f"{meta['number']}_{meta['class_name'].replace(' ', '_')}.jpg"
+            )
+            relative = os.path.join(camera, name)
+            os.makedirs(os.path.join(self.directory, camera), exist_ok=True)
+            with open(os.path.join(self.directory, relative), "wb") as f:
+                f.write(data)
+            entry = dict(meta, file=relative, bytes=len(data))
+            del entry["number"]
+            entries.append((entry, len(data)))
+            lines.append(json.dumps(entry) + "\n")
+
+        with self._lock:
+            with open(self.index_path, "a") as f:
+                f.writelines(lines)
+            self._entries.extend(entries)
+            self._stored_bytes += sum(size for _, size in entries)
+            self.written += len(entries)
+            self._evict()
+
+    def _evict(self):
+        """Delete the oldest snapshots over the size cap; holds the lock."""
+        while self._stored_bytes > self.max_bytes and self._entries:
+            entry, size = self._entries.popleft()
+            try:
+                os.remove(os.path.join(self.directory, entry["file"]))
+            except FileNotFoundError:
+                pass
+            self._stored_bytes -= size
+            self._stale_lines += 1
+            self.evicted += 1
+        # Rewrite the index once most of its lines are for deleted files
+        if self._stale_lines > max(len(self._entries), 64):
+            self._compact_index()
+
+    def _compact_index(self):
+        """Rewrite the index with the remaining snapshots; holds the lock."""
+        staging = self.index_path + ".partial"
+        with open(staging, "w") as f:
+            f.writelines(json.dumps(entry) + "\n" for entry, _ in self._entries)
+        os.replace(staging, self.index_path)
+        self._stale_lines = 0
+
+    def close(self, timeout: float = 5.0):
+        """Encode queued crops, stop the workers and compact the index."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        with self._lock:
+            if self._stale_lines:
+                try:
+                    self._compact_index()
+                except OSError as e:
+                    logger.error(f"Failed to compact snapshot index: {e}")
+        logger.info(f"Snapshot store closed: {self.stats()}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get submitted, dropped, deduplicated, written and evicted counts."""
+        return {
+            "submitted": self.submitted,
+            "dropped": self.dropped,
+            "deduplicated": self.deduplicated,
+            "written": self.written,
+            "evicted": self.evicted,
+            "errors": self.errors,
+            "queued": self._queue.qsize(),
+            "stored": len(self._entries),
+            "stored_bytes": self._stored_bytes,
+        }
@@ -0,0 +1,331 @@
+import time
+import cv2
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+from .geometry import OVERLAP_METRICS, batched_nms, crop_to_frame, with_boxes
+
+logger = logging.getLogger(__name__)
+
+
+def compute_tiles(
+    width: int, height: int, tile_size: int = 640, overlap: float = 0.2
+) -> np.ndarray:
+    """Split a frame into overlapping square tiles.
+
+    Tiles are spread evenly so that neighbours overlap by at least
+    ``overlap`` of the tile size and the last row and column end exactly
+    at the frame edge. Frames smaller than a tile give a single tile.
+
+    Args:
+        width: Frame width
+        height: Frame height
+        tile_size: Tile side length in pixels
+        overlap: Minimum overlap between neighbouring tiles, as a fraction
+
+    Returns:
+        (T, 4) int array of x1, y1, x2, y2 tiles in row-major order
+    """
+
+    def starts(length: int) -> Tuple[np.ndarray, int]:
+        size = min(tile_size, length)
+        if length <= size:
+            return np.zeros(1, dtype=int), size
+        stride = max(1, int(size * (1 - overlap)))
+        count = int(np.ceil((length - size) / stride)) + 1
+        return np.linspace(0, length - size, count).round().astype(int), size
+
+    xs, tile_w = starts(width)
+    ys, tile_h = starts(height)
+    grid_x, grid_y = np.meshgrid(xs, ys)
+    x1, y1 = grid_x.ravel(), grid_y.ravel()
+    return np.stack([x1, y1, x1 + tile_w, y1 + tile_h], axis=1)
+
+
+class MotionTileSelector:
+    """Pick the tiles of a frame that changed since the previous frame.
+
+    Frames are compared on a small grayscale copy, and the changed-pixel
+    count of every tile is read from one integral image, so selection
+    costs about the same for any number of tiles.
+    """
+
+    def __init__(
+        self,
+        threshold: int = 25,
+        min_changed: float = 0.002,
+        downscale: int = 8,
+        refresh_interval: int = 30,
+    ):
+        """Initialize the selector.
+
+        Args:
+            threshold: Gray-level difference that counts as change
+            min_changed: Fraction of a tile's pixels that must change
+            downscale: Frame downscale factor for the comparison
+            refresh_interval: Select every tile every N frames, so objects
+                that stopped moving are re-detected (0 disables)
+        """
+        self.threshold = threshold
+        self.min_changed = min_changed
+        self.downscale = downscale
+        self.refresh_interval = refresh_interval
+        self._previous: Optional[np.ndarray] = None
+        self._frames = 0
+
+    def reset(self):
+        """Forget the previous frame; the next call selects every tile."""
+        self._previous = None
+        self._frames = 0
+
+    def select(self, frame: np.ndarray, tiles: np.ndarray) -> np.ndarray:
+        """Compute which tiles have motion.
+
+        Args:
+            frame: Current BGR frame
+            tiles: (T, 4) tiles from compute_tiles()
+
+        Returns:
+            (T,) bool mask of tiles to run detection on
+        """
+        height, width = frame.shape[:2]
+        size = (max(1, width // self.downscale), max(1, height // self.downscale))
+        small = cv2.cvtColor(
+            cv2.resize(frame, size, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY
+        )
+        previous, self._previous = self._previous, small
+        refresh = self.refresh_interval and self._frames % self.refresh_interval == 0
+        self._frames += 1
+        if refresh or previous is None or previous.shape != small.shape:
+            return np.ones(len(tiles), dtype=bool)
+
+        changed = (cv2.absdiff(small, previous) > self.threshold).astype(np.uint8)
+        integral = cv2.integral(changed)
+        scaled = tiles // self.downscale
+        scaled[:, 0::2] = np.clip(scaled[:, 0::2], 0, size[0])
+        scaled[:, 1::2] = np.clip(scaled[:, 1::2], 0, size[1])
+        x1, y1, x2, y2 = scaled.T
+        counts = (
+            integral[y2, x2] - integral[y1, x2] - integral[y2, x1] + integral[y1, x1]
+        )
+        area = np.maximum((x2 - x1) * (y2 - y1), 1)
+        return counts / area >= self.min_changed
+
+
+class TiledDetector:
+    """Detect small objects in large frames by running the model on tiles.
+
+    Active tiles are cropped (as views, without copying) and sent through
+    the wrapped detector in one batched call; their boxes are mapped back
+    to frame coordinates and merged with class-aware NMS. With a motion
+    selector, unchanged tiles are skipped and their previous detections
+    reused, so the cost follows the number of active tiles rather than the
+    frame's pixel count.
+
+    Exposes the same interface as ObjectDetector.
+    """
+
+    def __init__(
+        self,
+        detector,
+        tile_size: int = 640,
+        overlap: float = 0.2,
+        iou_threshold: float = 0.5,
+        match_metric: str = "ios",
+        motion_selector: Optional[MotionTileSelector] = None,
+        full_frame: bool = False,
+    ):
+        """Initialize the tiled detector.
+
+        Args:
+            detector: Detector with detect_batch(), e.g. ObjectDetector
+            tile_size: Tile side length; match the model's imgsz so tiles
+                are not rescaled
+            overlap: Minimum overlap between neighbouring tiles
+            iou_threshold: Overlap above which duplicate boxes are merged
+            match_metric: "ios" (default) also merges boxes cut off at a
+                tile edge with the complete box; "iou" is plain NMS
+            motion_selector: Skip tiles without motion if set
+            full_frame: Also run the whole (downscaled) frame, to catch
+                objects larger than a tile
+        """
+        if match_metric not in OVERLAP_METRICS:
+            raise ValueError(f"Unknown match metric {match_metric!r}")
+        self.detector = detector
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.iou_threshold = iou_threshold
+        self.match_metric = match_metric
+        self.motion_selector = motion_selector
+        self.full_frame = full_frame
+
+        self.frames = 0
+        self.tiles_run = 0
+        self.tiles_total = 0
+        self._tiles: Dict[Tuple[int, int], np.ndarray] = {}
+        self._tile_cache: Dict[int, Tuple[List[Dict[str, Any]], np.ndarray]] = {}
+        self._cache_size: Optional[Tuple[int, int]] = None
+
+    @property
+    def stage_observer(self) -> Optional[Callable[[str, float, float], None]]:
+        """Stage timing callback of the wrapped detector."""
+        return self.detector.stage_observer
+
+    @stage_observer.setter
+    def stage_observer(self, observer):
+        self.detector.stage_observer = observer
+
+    @property
+    def confidence_threshold(self) -> float:
+        return self.detector.confidence_threshold
+
+    @confidence_threshold.setter
+    def confidence_threshold(self, value: float):
+        self.detector.confidence_threshold = value
+
+    def load_model(self) -> bool:
+        """Load the wrapped detector's model."""
+        return self.detector.load_model()
+
+    def tiles_for(self, width: int, height: int) -> np.ndarray:
+        """Tile grid for a frame size, computed once per size."""
+        tiles = self._tiles.get((width, height))
+        if tiles is None:
+            tiles = compute_tiles(width, height, self.tile_size, self.overlap)
+            self._tiles[(width, height)] = tiles
+            logger.info(
+                f"Tiling {width}x{height} frames into {len(tiles)} "
+                f"{self.tile_size}px tiles"
+            )
+        return tiles
+
+    def warmup(self, frame_size: Tuple[int, int] = (640, 480), iterations: int = 2):
+        """Warm up with a full batch of tiles for the given frame size.
+
+        Returns:
+            float: Seconds spent warming up, or -1.0 if the model is not loaded
+        """
+        if getattr(self.detector, "model", None) is None:
+            logger.error("Model not loaded. Call load_model() first.")
+            return -1.0
+        width, height = frame_size
+        tiles = self.tiles_for(width, height)
+        tile_w, tile_h = tiles[0, 2] - tiles[0, 0], tiles[0, 3] - tiles[0, 1]
+        dummy = np.zeros((tile_h, tile_w, 3), dtype=np.uint8)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            self.detector.predict([dummy] * len(tiles))
+        elapsed = time.perf_counter() - start
+        logger.info(
+            f"Tiled model warmed up with {iterations} batches of {len(tiles)} "
+            f"tiles in {elapsed:.2f}s"
+        )
+        return elapsed
+
+    def detect_objects(self, frame: np.ndarray) -> List[Dict[str, Any]]:
+        """Detect objects across all active tiles of a frame.
+
+        Args:
+            frame: Input image frame
+
+        Returns:
+            List of detection dictionaries in frame coordinates
+        """
+        height, width = frame.shape[:2]
+        tiles = self.tiles_for(width, height)
+        if self._cache_size != (width, height):
+            self._tile_cache.clear()
+            self._cache_size = (width, height)
+            if self.motion_selector is not None:
+                self.motion_selector.reset()
+
+        if self.motion_selector is not None:
+            active = self.motion_selector.select(frame, tiles)
+            # Tiles never run before have nothing to reuse
+            active |= np.array([i not in self._tile_cache for i in range(len(tiles))])
+        else:
+            active = np.ones(len(tiles), dtype=bool)
+        indices = np.flatnonzero(active)
+
+        crops = [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in tiles[indices]]
+        results = self.detector.detect_batch(crops) if crops else []
+        for index, detections in zip(indices.tolist(), results):
+            self._tile_cache[index] = self._to_frame(
+                detections, tiles[index], width, height
+            )
+
+        self.frames += 1
+        self.tiles_run += len(indices)
+        self.tiles_total += len(tiles)
+
+        merge_start = time.perf_counter()
+        candidates, truncated = [], []
+        for index in range(len(tiles)):
+            detections, cut = self._tile_cache.get(index, ([], np.zeros(0, bool)))
+            # Copies, so later stages can annotate this frame's results
+            # without touching the cache or earlier frames
+            candidates.extend(dict(d) for d in detections)
+            truncated.append(cut)
+        if self.full_frame:
+            whole = self.detector.detect_objects(frame)
+            candidates.extend(whole)
+            truncated.append(np.zeros(len(whole), dtype=bool))
+        merged = self._merge(candidates, np.concatenate(truncated))
+        observer = self.stage_observer
+        if observer is not None:
+            observer("merge", merge_start, time.perf_counter())
+        return merged
+
+    def detect_batch(self, frames: List[np.ndarray]) -> List[List[Dict[str, Any]]]:
+        """Detect objects in several small frames or crops, untiled."""
+        return self.detector.detect_batch(frames)
+
+    def _to_frame(self, detections, tile: np.ndarray, width: int, height: int):
+        """Shift tile detections into frame coordinates.
+
+        Also flags boxes touching an interior tile edge, which are likely
+        cut off and lose to complete boxes from a neighbouring tile.
+        """
+        if not detections:
+            return [], np.zeros(0, dtype=bool)
+        x1, y1, x2, y2 = tile.tolist()
+        boxes = crop_to_frame([d["bbox"] for d in detections], tile)
+        truncated = (
+            ((boxes[:, 0] <= x1 + 1) & (x1 > 0))
+            | ((boxes[:, 1] <= y1 + 1) & (y1 > 0))
+            | ((boxes[:, 2] >= x2 - 1) & (x2 < width))
+            | ((boxes[:, 3] >= y2 - 1) & (y2 < height))
+        )
+        return with_boxes(detections, boxes), truncated
+
+    def _merge(self, detections: List[Dict[str, Any]], truncated: np.ndarray):
+        """Drop cross-tile duplicates, preferring complete boxes."""
+        if len(detections) < 2:
+            return detections
+        boxes = np.array([d["bbox"] for d in detections], dtype=np.float32)
+        scores = np.array([d["confidence"] for d in detections], dtype=np.float32)
+        class_ids = np.array([d["class_id"] for d in detections])
+        # Any complete box outranks every truncated one
+        rank = scores - truncated.astype(np.float32)
+        keep = batched_nms(
+            boxes, rank, class_ids, self.iou_threshold, self.match_metric
+        )
+        return [detections[i] for i in keep.tolist()]
+
+    def draw_detections(self, frame: np.ndarray, detections: List[Dict[str, Any]]):
+        """Draw detection boxes and labels on frame."""
+        return self.detector.draw_detections(frame, detections)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get tiling counters for logging.
+
+        Returns:
+            dict: Frames, tiles run and the fraction of tiles that were active
+        """
+        return {
+            "frames": self.frames,
+            "tiles_run": self.tiles_run,
+            "active_fraction": (
+                self.tiles_run / self.tiles_total if self.tiles_total else 0.0
+            ),
+        }
@@ -0,0 +1,169 @@
+import json
+import tempfile
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from src.analytics import (
+    Tripwire,
+    Zone,
+    ZoneAnalytics,
+    ZoneMask,
+    load_analytics_config,
+)
+
+
+def person(cx, bottom, class_name="person"):
+    """Detection whose bottom centre is at (cx, bottom)."""
+    return {
+        "bbox": [cx - 10, bottom - 40, cx + 10, bottom],
+        "confidence": 0.9,
+        "class_id": 0,
+        "class_name": class_name,
+    }
+
+
+class TestAnalytics(unittest.TestCase):
+    """Test cases for zone and tripwire analytics."""
+
+    def test_zone_mask_matches_point_polygon_test(self):
+        """Test the rasterized lookup against cv2.pointPolygonTest."""
+        import cv2
+
+        rng = np.random.default_rng(0)
+        zones = [
+            Zone("square", [(10, 10), (110, 10), (110, 110), (10, 110)]),
+            Zone("concave", [(200, 0), (300, 0), (250, 50), (300, 100), (200, 100)]),
+            Zone("triangle", [(0, 200), (150, 300), (0, 300)]),
+        ]
+        points = rng.uniform(0, 320, (500, 2)).astype(np.float32)
+        inside = ZoneMask(zones).lookup(points)
+
+        for column, zone in enumerate(zones):
+            expected = [
+                cv2.pointPolygonTest(zone.polygon, tuple(map(float, p)), True)
+                for p in points
+            ]
+            # Membership is exact to the pixel
+            clear = np.abs(expected) > 1.5
+            np.testing.assert_array_equal(
+                inside[clear, column], np.array(expected)[clear] > 0
+            )
+
+    def test_occupancy_and_zone_entries(self):
+        """Test per-zone occupancy, class filters and entry/exit counts."""
+        analytics = ZoneAnalytics(
+            zones=[
+                Zone("left", [(0, 0), (100, 0), (100, 200), (0, 200)]),
+                Zone("cars", [(0, 0), (400, 0), (400, 200), (0, 200)], ["car"]),
+            ]
+        )
+        first = analytics.update([person(90, 50), person(130, 180)])
+        self.assertEqual(first["occupancy"], {"left": 1, "cars": 0})
+        # Objects first seen inside a zone count as entering it
+        self.assertEqual(
+            [(e["type"], e["zone"], e["track_id"]) for e in first["events"]],
+            [("enter", "left", 0)],
+        )
+
+        # The second person walks into the left zone, the first leaves it
+        second = analytics.update(
+            [person(110, 50), person(95, 180), person(300, 150, "car")]
+        )
+        self.assertEqual(second["occupancy"], {"left": 1, "cars": 1})
+        kinds = sorted((e["type"], e["zone"], e["track_id"]) for e in second["events"])
+        self.assertEqual(
+            kinds, [("enter", "cars", 2), ("enter", "left", 1), ("exit", "left", 0)]
+        )
+
+        stats = analytics.stats()["zones"]
+        self.assertEqual(stats["left"], {"occupancy": 1, "entries": 2, "exits": 1})
+
+    def test_tripwire_counts_each_crossing_once(self):
+        """Test direction and that a crossing is not re-counted."""
+        analytics = ZoneAnalytics(
+            tripwires=[Tripwire("door", (0, 100), (200, 100), ["person"])]
+        )
+        detections = [person(50, 160), person(150, 40), person(100, 160, "dog")]
+        analytics.update(detections)
+        self.assertEqual([d["track_id"] for d in detections], [0, 1, 2])
+
+        # Walk across in opposite directions, and past the end of the line
+        result = analytics.update(
+            [person(55, 90), person(150, 110), person(100, 90, "dog")]
+        )
+        events = {(e["track_id"], e["direction"]) for e in result["events"]}
+        self.assertEqual(events, {(0, "in"), (1, "out")})
+        analytics.update([person(60, 40), person(150, 170), person(260, 90)])
+        self.assertEqual(analytics.stats()["lines"]["door"], {"in": 1, "out": 1})
+
+    def test_lost_objects_are_forgotten(self):
+        """Test that objects missing for too long get new track ids."""
+        analytics = ZoneAnalytics(max_missed=1)
+        analytics.update([person(50, 50)])
+        analytics.update([])
+        detections = [person(52, 50)]
+        analytics.update(detections)
+        self.assertEqual(detections[0]["track_id"], 0)
+        analytics.update([])
+        analytics.update([])
+        detections = [person(52, 50)]
+        analytics.update(detections)
+        self.assertEqual(detections[0]["track_id"], 1)
+
+    def test_object_lost_inside_zone_exits(self):
+        """Test that an object vanishing inside a zone is counted as leaving."""
+        analytics = ZoneAnalytics(
+            zones=[Zone("room", [(0, 0), (200, 0), (200, 200), (0, 200)])],
+            max_missed=1,
+        )
+        analytics.update([person(50, 50, "dog")])
+        self.assertEqual(analytics.update([])["events"], [])
+        events = analytics.update([])["events"]
+        self.assertEqual(
+            events,
+            [
+                {
+                    "type": "exit",
+                    "zone": "room",
+                    "track_id": 0,
+                    "class_name": "dog",
+                    "lost": True,
+                }
+            ],
+        )
+        stats = analytics.stats()
+        self.assertEqual(
+            stats["zones"]["room"], {"occupancy": 0, "entries": 1, "exits": 1}
+        )
+        self.assertEqual(stats["tracked"], 0)
+
+    def test_load_per_camera_config(self):
+        """Test reading zones and lines for one camera from JSON."""
+        config = {
+            "cameras": {
+                "0": {
+                    "zones": [{"name": "door", "polygon": [[0, 0], [5, 0], [5, 5]]}],
+                    "tripwires": [
+                        {"name": "gate", "line": [[0, 0], [9, 9]], "classes": ["car"]}
+                    ],
+                }
+            }
+        }
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump(config, f)
+        try:
+            zones, tripwires = load_analytics_config(f.name, "0")
+            self.assertEqual([zone.name for zone in zones], ["door"])
+            self.assertEqual(tripwires[0].classes, {"car"})
+            self.assertEqual(load_analytics_config(f.name, "1"), ([], []))
+        finally:
+            os.unlink(f.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import time
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from src.async_stream import AsyncDetector
+
+
+class FakeDetector:
+    """Blocking detector reporting the frame's fill value as a detection."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def load_model(self):
+        return True
+
+    def detect_objects(self, frame):
+        time.sleep(self.latency)
+        return [{"value": int(frame[0, 0, 0])}]
+
+
+class FakeCamera:
+    """Blocking camera that delivers a fixed number of frames."""
+
+    def __init__(self, frames=None):
+        self.frames = frames
+        self.is_opened = False
+        self.released = False
+        self.reads = 0
+
+    def initialize_camera(self):
+        self.is_opened = True
+        return True
+
+    def read_frame(self):
+        if self.frames is not None and self.reads >= self.frames:
+            return False, None
+        self.reads += 1
+        time.sleep(0.001)
+        return True, np.full((4, 4, 3), self.reads % 256, dtype=np.uint8)
+
+    def release(self):
+        self.released = True
+
+
+async def frames(count, delay=0.0):
+    for value in range(count):
+        await asyncio.sleep(delay)
+        yield np.full((4, 4, 3), value, dtype=np.uint8)
+
+
+class TestAsyncDetector(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the asyncio streaming front end."""
+
+    async def test_stream_yields_every_frame_without_dropping(self):
+        """Test that a lossless stream keeps frame order and content."""
+        async with AsyncDetector(FakeDetector(), drop_oldest=False) as detector:
+            results = [r async for r in detector.stream(frames(5), name="clip")]
+        self.assertEqual([r["frame_index"] for r in results], [0, 1, 2, 3, 4])
+        self.assertEqual([r["detections"][0]["value"] for r in results], list(range(5)))
+        self.assertEqual(results[0]["source"], "clip")
+
+    async def test_slow_consumer_drops_oldest_frames(self):
+        """Test that a full buffer drops stale frames instead of growing."""
+        async with AsyncDetector(FakeDetector(latency=0.02), queue_size=1) as detector:
+            results = [r async for r in detector.stream(frames(20), name="cam")]
+        self.assertLess(len(results), 20)
+        self.assertEqual(len(results) + detector.dropped["cam"], 20)
+        # The newest frame always gets through
+        self.assertEqual(results[-1]["frame_index"], 19)
+
+    async def test_closing_stream_stops_camera(self):
+        """Test that closing the generator stops capture promptly."""
+        camera = FakeCamera()
+        async with AsyncDetector(FakeDetector()) as detector:
+            stream = detector.stream(camera, include_frames=False)
+            async for result in stream:
+                self.assertNotIn("frame", result)
+                if result["frame_index"] >= 3:
+                    break
+            await stream.aclose()
+            reads = camera.reads
+            await asyncio.sleep(0.05)
+        self.assertEqual(camera.reads, reads)
+
+    async def test_multiplex_interleaves_sources(self):
+        """Test that several sources share one loop and one model."""
+        cameras = {"a": FakeCamera(frames=5), "b": FakeCamera(frames=3)}
+        async with AsyncDetector(FakeDetector(), drop_oldest=False) as detector:
+            results = [r async for r in detector.multiplex(cameras)]
+        counts = {name: 0 for name in cameras}
+        for result in results:
+            counts[result["source"]] += 1
+        self.assertEqual(counts, {"a": 5, "b": 3})
+
+    async def test_io_pool_grows_with_live_cameras(self):
+        """Test that blocking reads of every camera run at the same time."""
+        lock = threading.Lock()
+        reading = [0, 0]  # now, peak
+
+        class SlowCamera(FakeCamera):
+            def read_frame(self):
+                with lock:
+                    reading[0] += 1
+                    reading[1] = max(reading[1], reading[0])
+                time.sleep(0.02)
+                with lock:
+                    reading[0] -= 1
+                return super().read_frame()
+
+        cameras = {str(index): SlowCamera(frames=3) for index in range(5)}
+        async with AsyncDetector(FakeDetector(), io_workers=2) as detector:
+            results = [r async for r in detector.multiplex(cameras)]
+        self.assertEqual(len(results), 15)
+        self.assertEqual(reading[1], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,6 @@
+import time
 import unittest
+import cv2
 import numpy as np
 from unittest.mock import Mock, patch
 import sys
@@ -7,7 +9,7 @@ import os
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
-from src.camera_handler import CameraHandler
+from src.camera_handler import CameraHandler, fourcc_to_str
 
 
 class TestCameraHandler(unittest.TestCase):
@@ -73,6 +75,169 @@ class TestCameraHandler(unittest.TestCase):
         self.assertIsNotNone(frame)
         self.assertEqual(frame.shape, (480, 640, 3))
 
+    @patch("cv2.VideoCapture")
+    def test_read_pooled_frame_reuses_buffer(self, mock_video_capture):
+        """Test that pooled reads decode into the same buffer."""
+        mock_cap = Mock()
+        mock_cap.isOpened.return_value = True
+        mock_cap.read.side_effect = lambda image=None: (
+            True,
+            image if image is not None else np.zeros((480, 640, 3), np.uint8),
+        )
+        mock_video_capture.return_value = mock_cap
+
+        self.camera_handler.initialize_camera()
+        ret, first = self.camera_handler.read_pooled_frame()
+        self.assertTrue(ret)
+        buffer = first.array
+        first.release()
+
+        ret, second = self.camera_handler.read_pooled_frame()
+        self.assertTrue(ret)
+        self.assertIs(second.array, buffer)
+        self.assertIs(mock_cap.read.call_args.kwargs["image"], buffer)
+        second.release()
+
+    @patch("cv2.VideoCapture")
+    def test_reconnect_after_failed_reads(self, mock_video_capture):
+        """Test that repeated read failures trigger a backoff reconnect."""
+        broken = Mock()
+        broken.isOpened.return_value = True
+        broken.read.return_value = (False, None)
+        unavailable = Mock()
+        unavailable.isOpened.return_value = False
+        recovered = Mock()
+        recovered.isOpened.return_value = True
+        recovered.read.return_value = (True, np.zeros((480, 640, 3), np.uint8))
+        mock_video_capture.side_effect = [broken, unavailable, recovered]
+
+        camera = CameraHandler(camera_id=0, max_failed_reads=3, reconnect_delay=0.01)
+        camera.initialize_camera()
+        for _ in range(3):
+            self.assertFalse(camera.read_frame()[0])
+        self.assertTrue(camera.needs_reconnect())
+        self.assertEqual(camera.health()["state"], "degraded")
+
+        self.assertTrue(camera.reconnect(max_wait=1.0))
+        broken.release.assert_called_once()
+        self.assertTrue(camera.read_frame()[0])
+        health = camera.health()
+        self.assertEqual(health["state"], "ok")
+        self.assertEqual(health["reconnects"], 1)
+        self.assertEqual(health["consecutive_failures"], 0)
+
+    @patch("cv2.VideoCapture")
+    def test_reconnect_gives_up_after_max_wait(self, mock_video_capture):
+        """Test that reconnect stops retrying at its deadline."""
+        unavailable = Mock()
+        unavailable.isOpened.return_value = False
+        mock_video_capture.return_value = unavailable
+
+        camera = CameraHandler(camera_id=0, reconnect_delay=0.01)
+        self.assertFalse(camera.reconnect(max_wait=0.1))
+        self.assertGreater(mock_video_capture.call_count, 2)
+        self.assertEqual(camera.health()["state"], "disconnected")
+
+    @patch("cv2.VideoCapture")
+    def test_frozen_timestamp_is_a_stall(self, mock_video_capture):
+        """Test that frames with a stuck stream position count as stalled."""
+        mock_cap = Mock()
+        mock_cap.isOpened.return_value = True
+        mock_cap.read.return_value = (True, np.zeros((480, 640, 3), np.uint8))
+        mock_cap.get.return_value = 1234.0
+        mock_video_capture.return_value = mock_cap
+
+        camera = CameraHandler(camera_id=0, stall_timeout=0.05)
+        camera.initialize_camera()
+        self.assertTrue(camera.read_frame()[0])
+        time.sleep(0.1)
+        self.assertFalse(camera.read_frame()[0])
+        self.assertTrue(camera.needs_reconnect())
+        self.assertEqual(camera.health()["last_error"], "stalled")
+
+    @patch("cv2.VideoCapture")
+    def test_frames_are_timestamped_and_numbered(self, mock_video_capture):
+        """Test sequence numbers and the choice of capture clock."""
+        mock_cap = Mock()
+        mock_cap.isOpened.return_value = True
+        mock_cap.read.return_value = (True, np.zeros((48, 64, 3), np.uint8))
+        mock_cap.grab.return_value = True
+        # A V4L2-style driver timestamp 20 ms before the read returns
+        mock_cap.get.side_effect = lambda prop: (time.monotonic() - 0.02) * 1000.0
+        mock_video_capture.return_value = mock_cap
+
+        camera = CameraHandler(camera_id=0)
+        camera.initialize_camera()
+        ret, frame, first = camera.read_timestamped_frame()
+        self.assertTrue(ret)
+        self.assertEqual((first.sequence, first.clock), (1, "driver"))
+        self.assertGreaterEqual(first.age(), 0.02)
+
+        # A grabbed but never decoded frame still uses up a number
+        self.assertTrue(camera.grab_frame())
+        ret, pooled = camera.read_pooled_frame()
+        self.assertEqual(pooled.info.sequence, 3)
+        pooled.release()
+
+        # Positions that are not on the monotonic clock are ignored
+        mock_cap.get.side_effect = None
+        mock_cap.get.return_value = 1234.0
+        info = camera.read_timestamped_frame()[2]
+        self.assertEqual((info.sequence, info.clock), (4, "monotonic"))
+        self.assertAlmostEqual(info.age(), 0.0, delta=0.05)
+
+    @patch("cv2.VideoCapture")
+    def test_format_negotiation_is_verified(self, mock_video_capture):
+        """Test that FOURCC and buffer size are set and read back."""
+        mock_cap = Mock()
+        mock_cap.isOpened.return_value = True
+        reported = {
+            cv2.CAP_PROP_FOURCC: cv2.VideoWriter_fourcc(*"YUYV"),
+            cv2.CAP_PROP_FRAME_WIDTH: 1920,
+            cv2.CAP_PROP_FRAME_HEIGHT: 1080,
+            cv2.CAP_PROP_FPS: 5.0,
+            cv2.CAP_PROP_BUFFERSIZE: 1,
+        }
+        mock_cap.get.side_effect = lambda prop: reported.get(prop, 0)
+        mock_video_capture.return_value = mock_cap
+
+        camera = CameraHandler(
+            0, frame_width=1920, frame_height=1080, fourcc="MJPG", buffer_size=1
+        )
+        self.assertTrue(camera.initialize_camera())
+
+        props = [c.args[0] for c in mock_cap.set.call_args_list]
+        self.assertLess(
+            props.index(cv2.CAP_PROP_FOURCC), props.index(cv2.CAP_PROP_FRAME_WIDTH)
+        )
+        self.assertIn(cv2.CAP_PROP_BUFFERSIZE, props)
+        self.assertEqual(camera.negotiated["fourcc"], "YUYV")
+        self.assertEqual(camera.negotiated["mismatched"], ["fourcc", "fps"])
+        self.assertEqual(fourcc_to_str(cv2.VideoWriter_fourcc(*"MJPG")), "MJPG")
+
+    @patch("cv2.VideoCapture")
+    def test_grab_then_retrieve_decodes_on_demand(self, mock_video_capture):
+        """Test that grabbing skips decoding until a frame is retrieved."""
+        mock_cap = Mock()
+        mock_cap.isOpened.return_value = True
+        mock_cap.grab.return_value = True
+        mock_cap.retrieve.side_effect = lambda image=None: (
+            True,
+            image if image is not None else np.zeros((480, 640, 3), np.uint8),
+        )
+        mock_video_capture.return_value = mock_cap
+
+        self.camera_handler.initialize_camera()
+        for _ in range(3):
+            self.assertTrue(self.camera_handler.grab_frame())
+        self.assertEqual(mock_cap.retrieve.call_count, 0)
+
+        ret, pooled = self.camera_handler.retrieve_pooled_frame()
+        self.assertTrue(ret)
+        self.assertEqual(pooled.array.shape, (480, 640, 3))
+        pooled.release()
+        self.assertEqual(mock_cap.retrieve.call_count, 1)
+
     @patch("cv2.VideoCapture")
     def test_get_camera_info(self, mock_video_capture):
         """Test getting camera information."""
@@ -0,0 +1,149 @@
+import tempfile
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from src.detection_cache import (
+    DetectionCache,
+    decode_detections,
+    encode_detections,
+)
+from src.object_detector import ObjectDetector
+
+
+class FakeTensor:
+    def __init__(self, array):
+        self.array = np.asarray(array, dtype=np.float32)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self.array
+
+
+class FakeBoxes:
+    def __init__(self, rows):
+        self.data = FakeTensor(np.array(rows).reshape(-1, 6))
+
+    def __len__(self):
+        return len(self.data.array)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.boxes = FakeBoxes(rows)
+
+
+class CountingModel:
+    """Fake YOLO model returning one person box per frame."""
+
+    names = {0: "person", 1: "car"}
+
+    def __init__(self):
+        self.frames = 0
+
+    def __call__(self, frames, **kwargs):
+        frames = frames if isinstance(frames, list) else [frames]
+        self.frames += len(frames)
+        return [
+            FakeResult([[1, 2, 3, 4, 0.8 + frame[0, 0, 0] / 1000.0, 0]])
+            for frame in frames
+        ]
+
+
+def detection(index):
+    return {
+        "bbox": [index, index + 1, index + 10, index + 20],
+        "confidence": 0.5 + index / 100.0,
+        "class_id": index % 2,
+        "class_name": "person" if index % 2 == 0 else "car",
+    }
+
+
+class TestDetectionCache(unittest.TestCase):
+    """Test cases for the content-addressed detection cache."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "detections.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_encoding_round_trip(self):
+        """Test that the compact record format is lossless."""
+        detections = [detection(index) for index in range(5)]
+        payload = encode_detections(detections)
+        self.assertEqual(decode_detections(payload), detections)
+        self.assertEqual(decode_detections(encode_detections([])), [])
+        self.assertLess(len(payload), 5 * 40)
+
+    def test_entries_persist_across_reopen(self):
+        """Test that a second run over the same frames hits the cache."""
+        frame = np.random.randint(0, 255, (48, 64, 3), dtype=np.uint8)
+        cache = DetectionCache(self.path)
+        key = cache.key("model-a", frame)
+        self.assertIsNone(cache.get(key))
+        cache.put(key, [detection(1)])
+        cache.close()
+
+        cache = DetectionCache(self.path)
+        self.assertEqual(cache.get(key), [detection(1)])
+        self.assertIsNone(cache.get(cache.key("model-b", frame)))
+        self.assertIsNone(cache.get(cache.key("model-a", frame[:, :32])))
+        self.assertEqual(cache.stats()["entries"], 1)
+        cache.close()
+
+    def test_least_recently_used_evicted(self):
+        """Test that eviction keeps recently read entries."""
+        cache = DetectionCache(":memory:", max_entries=20)
+        keys = [bytes([index]) * 16 for index in range(21)]
+        for key in keys[:20]:
+            cache.put(key, [detection(0)])
+        cache.get(keys[0])
+        cache.put(keys[20], [detection(0)])
+
+        stats = cache.stats()
+        self.assertEqual(stats["entries"], 20)
+        self.assertEqual(stats["evictions"], 1)
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[2]))
+        self.assertIsNotNone(cache.get(keys[20]))
+
+        small = DetectionCache(":memory:", max_bytes=1000)
+        for key in keys:
+            small.put(key, [detection(0)] * 4)
+        self.assertLessEqual(small.stats()["bytes"], 1000)
+
+    def test_object_detector_skips_cached_frames(self):
+        """Test that re-processed frames do not reach the model."""
+        cache = DetectionCache(":memory:")
+        detector = ObjectDetector(detection_cache=cache)
+        detector.model = CountingModel()
+        frames = [np.full((8, 8, 3), value, dtype=np.uint8) for value in range(4)]
+
+        first = detector.detect_batch(frames[:2])
+        again = detector.detect_batch(frames)
+        single = detector.detect_objects(frames[3])
+
+        self.assertEqual(detector.model.frames, 4)
+        self.assertEqual(again[:2], first)
+        self.assertEqual(single, again[3])
+        self.assertAlmostEqual(single[0]["confidence"], 0.803, places=5)
+        self.assertEqual(cache.stats()["hits"], 3)
+
+        # Changing thresholds changes the namespace
+        detector.confidence_threshold = 0.6
+        detector.configure_class_filter()
+        detector.detect_objects(frames[3])
+        self.assertEqual(detector.model.frames, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
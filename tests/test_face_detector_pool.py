@@ -0,0 +1,124 @@
+import threading
+import time
+import unittest
+import cv2
+import numpy as np
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from src.face_detector import FaceDetector
+from src.face_detector_pool import FaceDetectorPool
+from src.geometry import boxes_from_detections, iou_matrix
+
+
+def draw_face(gray, x, y, size):
+    """Draw a cartoon face the frontal Haar cascade accepts."""
+    face = np.full((size, size), 90, np.uint8)
+    center = size // 2
+    axes = (int(size * 0.38), int(size * 0.48))
+    cv2.ellipse(face, (center, center), axes, 0, 0, 360, 200, -1)
+    for eye in (0.33, 0.67):
+        eye_center = (int(size * eye), int(size * 0.42))
+        cv2.ellipse(
+            face, eye_center, (int(size * 0.09), int(size * 0.05)), 0, 0, 360, 40, -1
+        )
+        brow = int(size * 0.33)
+        thickness = max(1, size // 30)
+        start, end = int(size * (eye - 0.12)), int(size * (eye + 0.12))
+        cv2.line(face, (start, brow), (end, brow), 60, thickness)
+    nose = (center, int(size * 0.45)), (center, int(size * 0.62))
+    cv2.line(face, *nose, 170, max(1, size // 25))
+    mouth = (center, int(size * 0.75)), (int(size * 0.14), int(size * 0.04))
+    cv2.ellipse(face, *mouth, 0, 0, 360, 70, -1)
+    bottom, right = y + size, x + size
+    gray[y:bottom, x:right] = cv2.GaussianBlur(face, (0, 0), size / 60)
+
+
+def faces_frame():
+    gray = np.full((720, 640), 120, np.uint8)
+    draw_face(gray, 40, 30, 60)
+    draw_face(gray, 300, 210, 64)  # straddles the first band edge at 240
+    draw_face(gray, 120, 400, 220)  # larger than the band overlap
+    draw_face(gray, 500, 600, 48)
+    return cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+
+
+class CountingFaceDetector(FaceDetector):
+    """FaceDetector that records how many threads use it at once."""
+
+    active = 0
+    peak = 0
+    shared = False
+    lock = threading.Lock()
+
+    def __init__(self):
+        super().__init__()
+        self.busy = False
+
+    def detect_faces_gray(self, gray, min_size=(30, 30), max_size=None):
+        cls = CountingFaceDetector
+        with cls.lock:
+            cls.shared |= self.busy
+            self.busy = True
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        time.sleep(0.01)
+        with cls.lock:
+            cls.active -= 1
+            self.busy = False
+        return super().detect_faces_gray(gray, min_size, max_size)
+
+
+class TestFaceDetectorPool(unittest.TestCase):
+    """Test cases for the pooled face detector."""
+
+    def test_bands_find_the_same_faces(self):
+        """Test that banding neither loses nor duplicates faces."""
+        frame = faces_frame()
+        single = FaceDetectorPool(size=1)
+        banded = FaceDetectorPool(size=2, bands=3, overlap=96)
+        try:
+            expected = boxes_from_detections(single.detect_faces(frame))
+            found = boxes_from_detections(banded.detect_faces(frame))
+        finally:
+            banded.close()
+        self.assertEqual(len(expected), 4)
+        self.assertEqual(len(found), 4)
+        self.assertTrue((iou_matrix(expected, found).max(axis=1) > 0.7).all())
+        # Three bands and the coarse whole-frame pass
+        self.assertEqual(banded.stats()["searches"], 4)
+
+    def test_cascades_are_never_shared(self):
+        """Test that concurrent callers each get their own cascade."""
+        pool = FaceDetectorPool(size=2, detector_factory=CountingFaceDetector)
+        frame = np.zeros((120, 160, 3), np.uint8)
+        threads = [
+            threading.Thread(target=pool.detect_faces, args=(frame,)) for _ in range(6)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertFalse(CountingFaceDetector.shared)
+        self.assertEqual(CountingFaceDetector.peak, 2)
+        stats = pool.stats()
+        self.assertEqual((stats["frames"], stats["in_use"]), (6, 0))
+        self.assertGreater(stats["mean_wait_ms"], 0.0)
+
+    def test_small_frames_are_not_split(self):
+        """Test the fallback to one search for short frames."""
+        pool = FaceDetectorPool(size=1, bands=4, overlap=96)
+        try:
+            self.assertEqual(pool.detect_faces(np.zeros((240, 320, 3), np.uint8)), [])
+            self.assertEqual(pool.detect_faces(None), [])
+        finally:
+            pool.close()
+        self.assertEqual(pool.stats()["searches"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
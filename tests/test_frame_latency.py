@@ -0,0 +1,71 @@
+import time
+import unittest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from src.frame_latency import FrameInfo, LatencyTracker
+from src.metrics import MetricsRegistry
+
+
+class TestLatencyTracker(unittest.TestCase):
+    """Test cases for frame age tracking."""
+
+    def test_ages_per_camera_and_output(self):
+        """Test distributions, maxima and the latency target."""
+        metrics = MetricsRegistry()
+        tracker = LatencyTracker(metrics, target=0.1)
+        for index in range(100):
+            info = FrameInfo("0", index + 1, timestamp=10.0)
+            tracker.observe(info, "detect", now=10.04)
+            tracker.observe(info, "display", now=10.04 + index * 0.002)
+        tracker.observe_timestamp("1", 5.0, "sink:JsonLinesSink", now=5.5)
+
+        summary = tracker.summary()
+        self.assertEqual(sorted(summary), ["0", "1"])
+        detect = summary["0"]["detect"]
+        self.assertEqual(detect["count"], 100)
+        self.assertAlmostEqual(detect["mean"], 0.04)
+        self.assertLessEqual(detect["p95"], 0.05)
+        self.assertEqual(detect["over_target"], 0)
+        display = summary["0"]["display"]
+        self.assertAlmostEqual(display["max"], 0.238)
+        # Ages above 0.1 s: index 31 onwards
+        self.assertEqual(display["over_target"], 69)
+        self.assertEqual(summary["1"]["sink:JsonLinesSink"]["over_target"], 1)
+
+        exported = metrics.snapshot()["smartdet_frame_age_seconds"]
+        self.assertEqual(len(exported), 3)
+        self.assertIn(
+            'smartdet_frame_age_seconds_count{camera="0",output="display"} 100',
+            metrics.render_prometheus(),
+        )
+
+    def test_format_summary(self):
+        """Test the per-camera log line."""
+        tracker = LatencyTracker(target=0.05)
+        tracker.observe_timestamp("0", 0.0, "detect", now=0.03)
+        tracker.observe_timestamp("0", 0.0, "write", now=0.08)
+        self.assertEqual(
+            tracker.format_summary(),
+            "Frame age camera 0: detect p50 27 ms, p95 30 ms, max 30 ms, "
+            "0/1 late; write p50 80 ms, p95 80 ms, max 80 ms, 1/1 late",
+        )
+
+    def test_frame_info(self):
+        """Test ages and the published form of a frame's capture info."""
+        now = time.monotonic()
+        info = FrameInfo("cam", 7, now - 0.25, "driver", 123.0)
+        self.assertAlmostEqual(info.age(now), 0.25)
+        published = info.to_dict()
+        self.assertEqual(published["sequence"], 7)
+        self.assertEqual(
+            (published["clock"], published["position_ms"]), ("driver", 123.0)
+        )
+        self.assertAlmostEqual(published["captured_at"], time.time() - 0.25, delta=0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
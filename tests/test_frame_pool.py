@@ -0,0 +1,67 @@
+import unittest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from src.frame_pool import FramePool
+
+
+class TestFramePool(unittest.TestCase):
+    """Test cases for FramePool class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.pool = FramePool((4, 6, 3), size=2)
+
+    def test_buffers_are_reused(self):
+        """Test that released buffers are handed out again."""
+        frame = self.pool.acquire()
+        buffer_id = id(frame.array)
+        frame.release()
+
+        again = self.pool.acquire()
+        self.assertEqual(id(again.array), buffer_id)
+        self.assertEqual(self.pool.allocated, 2)
+
+    def test_returned_only_after_all_consumers_release(self):
+        """Test reference counting across several consumers."""
+        frame = self.pool.acquire()
+        frame.retain()
+        frame.retain()
+        self.assertEqual(frame.refcount, 3)
+
+        frame.release()
+        frame.release()
+        self.assertEqual(self.pool.in_use, 1)
+
+        frame.release()
+        self.assertEqual(self.pool.in_use, 0)
+        self.assertIsNone(frame.array)
+
+    def test_over_release_raises(self):
+        """Test that releasing a returned frame is an error."""
+        frame = self.pool.acquire()
+        frame.release()
+        with self.assertRaises(RuntimeError):
+            frame.release()
+
+    def test_acquire_times_out_when_exhausted(self):
+        """Test that an exhausted pool does not allocate past max_size."""
+        held = [self.pool.acquire(), self.pool.acquire()]
+        self.assertIsNone(self.pool.acquire(timeout=0.01))
+        self.assertEqual(self.pool.allocated, 2)
+        for frame in held:
+            frame.release()
+
+    def test_context_manager_releases(self):
+        """Test using a pooled frame as a context manager."""
+        frame = self.pool.acquire()
+        with frame as array:
+            self.assertEqual(array.shape, (4, 6, 3))
+        self.assertEqual(self.pool.available, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+import unittest
+import numpy as np
+import sys
+import os
+from hypothesis import given, settings, strategies as st
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from src.geometry import (
+    batched_nms,
+    clip_boxes,
+    crop_to_frame,
+    expand_boxes,
+    frame_to_crop,
+    iou_matrix,
+    overlap_matrix,
+    weighted_box_fusion,
+)
+
+
+@st.composite
+def box_sets(draw, max_boxes=30, classes=3):
+    """Random boxes with positive area, scores and class ids."""
+    count = draw(st.integers(0, max_boxes))
+    coords = st.integers(0, 200)
+    sizes = st.integers(1, 120)
+    rows = draw(
+        st.lists(
+            st.tuples(coords, coords, sizes, sizes), min_size=count, max_size=count
+        )
+    )
+    boxes = np.array(
+        [[x, y, x + w, y + h] for x, y, w, h in rows], dtype=np.float32
+    ).reshape(-1, 4)
+    scores = np.array(
+        draw(st.lists(st.floats(0.01, 1.0), min_size=count, max_size=count)),
+        dtype=np.float32,
+    )
+    class_ids = np.array(
+        draw(st.lists(st.integers(0, classes - 1), min_size=count, max_size=count)),
+        dtype=np.int64,
+    )
+    return boxes, scores, class_ids
+
+
+def naive_iou(a, b):
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    inter = max(width, 0) * max(height, 0)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union
+
+
+def naive_nms(boxes, scores, class_ids, threshold):
+    keep = []
+    for i in sorted(range(len(boxes)), key=lambda i: -scores[i]):
+        if all(
+            class_ids[i] != class_ids[j] or naive_iou(boxes[i], boxes[j]) <= threshold
+            for j in keep
+        ):
+            keep.append(i)
+    return keep
+
+
+class TestGeometry(unittest.TestCase):
+    """Property tests for the vectorized box geometry."""
+
+    @given(box_sets(), box_sets())
+    def test_iou_matrix_matches_pairwise_loop(self, first, second):
+        a, b = first[0], second[0]
+        matrix = iou_matrix(a, b)
+        self.assertEqual(matrix.shape, (len(a), len(b)))
+        expected = [[naive_iou(x, y) for y in b] for x in a]
+        np.testing.assert_allclose(
+            matrix, np.array(expected).reshape(matrix.shape), atol=1e-5
+        )
+        self.assertTrue(np.all((matrix >= 0) & (matrix <= 1 + 1e-6)))
+
+    @given(box_sets())
+    def test_self_overlap_is_symmetric(self, data):
+        boxes = data[0]
+        for metric in ("iou", "ios"):
+            matrix = overlap_matrix(boxes, metric=metric)
+            np.testing.assert_allclose(matrix, matrix.T, atol=1e-6)
+            np.testing.assert_allclose(np.diag(matrix), 1.0, atol=1e-5)
+        # Intersection over the smaller box is never below IoU
+        self.assertTrue(
+            np.all(overlap_matrix(boxes, metric="ios") >= iou_matrix(boxes) - 1e-6)
+        )
+
+    @given(box_sets(), st.floats(0.1, 0.9))
+    def test_nms_matches_greedy_reference(self, data, threshold):
+        boxes, scores, class_ids = data
+        keep = batched_nms(boxes, scores, class_ids, threshold)
+        self.assertEqual(keep.tolist(), naive_nms(boxes, scores, class_ids, threshold))
+        kept = boxes[keep]
+        overlap = iou_matrix(kept)
+        same_class = class_ids[keep][:, None] == class_ids[keep][None, :]
+        np.fill_diagonal(same_class, False)
+        self.assertTrue(np.all(overlap[same_class] <= threshold + 1e-6))
+
+    @given(box_sets(), st.floats(0.3, 0.9))
+    def test_fusion_stays_within_cluster_hull(self, data, threshold):
+        boxes, scores, class_ids = data
+        fused, fused_scores, fused_classes = weighted_box_fusion(
+            boxes, scores, class_ids, threshold
+        )
+        self.assertLessEqual(len(fused), len(boxes))
+        self.assertEqual(set(fused_classes.tolist()), set(class_ids.tolist()))
+        if len(boxes):
+            self.assertTrue(np.all(fused[:, :2] >= boxes[:, :2].min(axis=0) - 1e-3))
+            self.assertTrue(np.all(fused[:, 2:] <= boxes[:, 2:].max(axis=0) + 1e-3))
+            self.assertLessEqual(fused_scores.max(), scores.max() + 1e-6)
+        # Non-overlapping input is returned unchanged
+        if np.all(np.triu(iou_matrix(boxes), 1) <= threshold):
+            self.assertEqual(len(fused), len(boxes))
+
+    @given(
+        box_sets(),
+        st.tuples(st.integers(0, 100), st.integers(0, 100)),
+        st.floats(0.25, 4.0),
+    )
+    def test_crop_mapping_round_trip(self, data, origin, scale):
+        boxes = data[0]
+        crop = (origin[0], origin[1], origin[0] + 300, origin[1] + 300)
+        in_crop = frame_to_crop(boxes, crop, (scale, scale * 0.5))
+        np.testing.assert_allclose(
+            crop_to_frame(in_crop, crop, (scale, scale * 0.5)),
+            boxes,
+            rtol=1e-5,
+            atol=1e-3,
+        )
+
+    @given(box_sets(), st.floats(0.0, 1.0), st.integers(50, 400), st.integers(50, 400))
+    def test_clip_and_expand_stay_in_frame(self, data, margin, width, height):
+        boxes = data[0]
+        for result in (
+            clip_boxes(boxes, width, height),
+            expand_boxes(boxes, margin, width, height),
+        ):
+            self.assertTrue(np.all(result >= 0))
+            self.assertTrue(np.all(result[:, [0, 2]] <= width))
+            self.assertTrue(np.all(result[:, [1, 3]] <= height))
+        clipped = clip_boxes(boxes, width, height)
+        np.testing.assert_array_equal(clip_boxes(clipped, width, height), clipped)
+
+    def test_fusion_averages_by_score(self):
+        """Test a worked example of weighted box fusion."""
+        boxes = np.array([[0, 0, 10, 10], [2, 0, 12, 10], [50, 50, 60, 60]])
+        fused, scores, classes = weighted_box_fusion(
+            boxes, np.array([0.9, 0.3, 0.8]), iou_threshold=0.5
+        )
+        np.testing.assert_allclose(fused[0], [0.5, 0, 10.5, 10])
+        np.testing.assert_allclose(scores, [0.6, 0.8])
+        np.testing.assert_allclose(fused[1], [50, 50, 60, 60])
+
+    @settings(max_examples=20)
+    @given(box_sets(max_boxes=5))
+    def test_empty_inputs(self, data):
+        empty = np.zeros((0, 4))
+        self.assertEqual(iou_matrix(data[0], empty).shape, (len(data[0]), 0))
+        self.assertEqual(batched_nms(empty, np.zeros(0)).size, 0)
+        self.assertEqual(len(weighted_box_fusion(empty, np.zeros(0))[0]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import tempfile
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from src.heatmap import MAX_UPDATE_INTERVAL, OccupancyHeatmap
+
+
+def box(x1, y1, x2, y2, class_name="person"):
+    return {
+        "bbox": [x1, y1, x2, y2],
+        "confidence": 0.9,
+        "class_id": 0,
+        "class_name": class_name,
+    }
+
+
+class TestOccupancyHeatmap(unittest.TestCase):
+    """Test cases for the dwell-time heatmap."""
+
+    def test_splat_matches_per_box_loop(self):
+        """Test that one batched splat equals adding boxes one at a time."""
+        rng = np.random.default_rng(0)
+        corners = rng.integers(-20, 180, (50, 2))
+        sizes = rng.integers(1, 60, (50, 2))
+        boxes = np.concatenate([corners, corners + sizes], axis=1).tolist()
+
+        heatmap = OccupancyHeatmap(cell_size=4, half_life=None)
+        heatmap.update([], (160, 120), timestamp=0.0)
+        heatmap.update([box(*b) for b in boxes], (160, 120), timestamp=0.25)
+
+        expected = np.zeros((30, 40), dtype=np.float32)
+        for x1, y1, x2, y2 in boxes:
+            cx1, cy1 = max(x1 // 4, 0), max(y1 // 4, 0)
+            cx2, cy2 = min(-(-x2 // 4), 40), min(-(-y2 // 4), 30)
+            if cx2 > cx1 and cy2 > cy1:
+                expected[cy1:cy2, cx1:cx2] += 0.25
+        np.testing.assert_allclose(heatmap.heat(), expected, atol=1e-6)
+
+    def test_decay_and_time_credit(self):
+        """Test half-life decay, class filtering and capped update gaps."""
+        heatmap = OccupancyHeatmap(cell_size=10, half_life=2.0)
+        heatmap.update([box(0, 0, 10, 10)], (100, 100), timestamp=0.0)
+        heatmap.update([box(0, 0, 10, 10), box(50, 50, 60, 60, "car")], (100, 100), 0.5)
+        self.assertAlmostEqual(float(heatmap.heat()[0, 0]), 0.5, places=5)
+        self.assertEqual(float(heatmap.heat()[5, 5]), 0.0)
+
+        # Two seconds of empty frames halve the accumulated time
+        for step in range(1, 21):
+            heatmap.update([], (100, 100), 0.5 + step * 0.1)
+        self.assertAlmostEqual(float(heatmap.heat()[0, 0]), 0.25, places=5)
+
+        # A long gap credits at most MAX_UPDATE_INTERVAL seconds
+        heatmap = OccupancyHeatmap(cell_size=10, half_life=None)
+        heatmap.update([box(0, 0, 10, 10)], (100, 100), timestamp=0.0)
+        heatmap.update([box(0, 0, 10, 10)], (100, 100), timestamp=30.0)
+        self.assertAlmostEqual(float(heatmap.heat()[0, 0]), MAX_UPDATE_INTERVAL)
+
+    def test_long_runs_stay_bounded(self):
+        """Test that lazy decay renormalizes instead of overflowing."""
+        heatmap = OccupancyHeatmap(cell_size=10, half_life=0.05)
+        for step in range(5000):
+            heatmap.update([box(0, 0, 10, 10)], (100, 100), step * 0.1)
+        heat = heatmap.heat()
+        self.assertTrue(np.all(np.isfinite(heat)))
+        # Steady state of adding 0.1 s while decaying by 2^-2 per step
+        self.assertAlmostEqual(float(heat[0, 0]), 0.1 / (1 - 0.25), places=4)
+        self.assertEqual(heatmap.stats()["grid"], (10, 10))
+
+    def test_snapshots_and_overlay(self):
+        """Test periodic snapshots to disk and the frame overlay."""
+        with tempfile.TemporaryDirectory() as tmp:
+            raw = os.path.join(tmp, "heat.npy")
+            heatmap = OccupancyHeatmap(
+                cell_size=8, half_life=None, snapshot_path=raw, snapshot_interval=1.0
+            )
+            for step in range(25):
+                heatmap.update([box(0, 0, 32, 32)], (64, 48), step * 0.1)
+            self.assertEqual(heatmap.snapshots, 2)
+            # Last written at t=2.0, after two seconds in the box
+            self.assertAlmostEqual(float(np.load(raw)[0, 0]), 2.0, places=4)
+
+            image = os.path.join(tmp, "heat.png")
+            self.assertTrue(heatmap.save(image))
+            self.assertTrue(os.path.exists(image))
+            self.assertFalse(heatmap.save(os.path.join(tmp, "heat.unknown")))
+            self.assertEqual(sorted(os.listdir(tmp)), ["heat.npy", "heat.png"])
+
+        frame = np.full((48, 64, 3), 100, dtype=np.uint8)
+        heatmap.overlay(frame)
+        self.assertFalse(np.array_equal(frame[8, 8], [100, 100, 100]))
+        np.testing.assert_array_equal(frame[40, 60], [100, 100, 100])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import time
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from src.inference_scheduler import DeadlineExceeded, InferenceScheduler
+
+
+class FakeClock:
+    """Manually advanced stand-in for time.monotonic()."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeDetector:
+    """Batch detector with a fixed per-call and per-frame latency.
+
+    With a FakeClock, each call advances it by ``cost`` instead of sleeping.
+    """
+
+    def __init__(self, call_latency=0.0, frame_latency=0.0, clock=None, cost=0.0):
+        self.call_latency = call_latency
+        self.frame_latency = frame_latency
+        self.clock = clock
+        self.cost = cost
+        self.batches = []
+
+    def detect_batch(self, frames):
+        if self.clock is not None:
+            self.clock.now += self.cost
+        else:
+            time.sleep(self.call_latency + self.frame_latency * len(frames))
+        self.batches.append([int(frame[0, 0, 0]) for frame in frames])
+        return [[{"frame": int(frame[0, 0, 0])}] for frame in frames]
+
+
+def frame(tag):
+    return np.full((4, 4, 3), tag, dtype=np.uint8)
+
+
+class TestInferenceScheduler(unittest.TestCase):
+    """Test cases for deadline-aware shared inference."""
+
+    def test_earliest_deadline_runs_first(self):
+        """Test EDF ordering and batching of whatever is ready."""
+        detector = FakeDetector()
+        scheduler = InferenceScheduler(detector, max_batch=2)
+        now = time.monotonic()
+        futures = [
+            scheduler.submit("a", frame(1), deadline=now + 3.0),
+            scheduler.submit("b", frame(2), deadline=now + 1.0),
+            scheduler.submit("c", frame(3), deadline=now + 2.0),
+        ]
+        self.assertEqual(scheduler.run_once(), 2)
+        self.assertEqual(scheduler.run_once(), 1)
+        self.assertEqual(detector.batches, [[2, 3], [1]])
+        self.assertEqual(futures[0].result(timeout=0)[0]["frame"], 1)
+
+    def test_expired_requests_are_dropped(self):
+        """Test that a passed deadline fails the request instead of running it."""
+        detector = FakeDetector()
+        scheduler = InferenceScheduler(detector, latest_only=False)
+        late = scheduler.submit("a", frame(1), deadline=time.monotonic() - 0.01)
+        fresh = scheduler.submit("a", frame(2), deadline=time.monotonic() + 1.0)
+        scheduler.run_once()
+
+        with self.assertRaises(DeadlineExceeded):
+            late.result(timeout=0)
+        self.assertEqual(fresh.result(timeout=0)[0]["frame"], 2)
+        self.assertEqual(detector.batches, [[2]])
+        stats = scheduler.stats()["a"]
+        self.assertEqual(stats["dropped_expired"], 1)
+        self.assertEqual(stats["completed"], 1)
+
+    def test_weighted_fairness_overrides_tight_deadlines(self):
+        """Test that a camera with tighter deadlines cannot starve the others."""
+        clock = FakeClock()
+        detector = FakeDetector(clock=clock, cost=0.002)
+        scheduler = InferenceScheduler(
+            detector,
+            max_batch=1,
+            fairness_window=0.0,
+            latest_only=False,
+            clock=clock,
+        )
+        scheduler.register_camera("busy", weight=1.0)
+        scheduler.register_camera("quiet", weight=1.0)
+        for index in range(6):
+            scheduler.submit("busy", frame(10 + index), deadline=1.0 + index)
+            scheduler.submit("quiet", frame(20 + index), deadline=5.0 + index)
+        while scheduler.run_once():
+            pass
+
+        # Every batch costs the same, so the cameras take turns; ties go to
+        # the earlier deadline
+        order = [tags[0] for tags in detector.batches]
+        self.assertEqual(order, [10, 20, 11, 21, 12, 22, 13, 23, 14, 24, 15, 25])
+
+    def test_latest_frame_supersedes_queued_frame(self):
+        """Test that a live feed never waits behind its own stale frame."""
+        scheduler = InferenceScheduler(FakeDetector())
+        stale = scheduler.submit("a", frame(1))
+        latest = scheduler.submit("a", frame(2))
+        scheduler.run_once()
+        with self.assertRaises(DeadlineExceeded):
+            stale.result(timeout=0)
+        self.assertEqual(latest.result(timeout=0)[0]["frame"], 2)
+        self.assertEqual(scheduler.stats()["a"]["dropped_superseded"], 1)
+
+    def test_worker_counts_deadline_misses(self):
+        """Test the worker thread with a detector slower than the budget."""
+        detector = FakeDetector(call_latency=0.03)
+        scheduler = InferenceScheduler(detector, default_budget=0.02)
+        futures = [scheduler.submit(name, frame(1)) for name in ("a", "b")]
+        scheduler.start()
+        try:
+            for future in futures:
+                self.assertEqual(len(future.result(timeout=2.0)), 1)
+        finally:
+            scheduler.stop()
+
+        stats = scheduler.stats()
+        self.assertEqual(sum(s["completed"] for s in stats.values()), 2)
+        self.assertEqual(sum(s["deadline_misses"] for s in stats.values()), 2)
+        self.assertGreater(stats["a"]["latency_p50_ms"], 20.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
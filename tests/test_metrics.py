@@ -0,0 +1,87 @@
+import unittest
+import urllib.request
+import urllib.error
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from src.metrics import MetricsRegistry, MetricsServer
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Test cases for MetricsRegistry and its metric types."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.registry = MetricsRegistry()
+
+    def test_counter_with_labels(self):
+        """Test labelled counters render as separate series."""
+        counter = self.registry.counter("detections_total", "help", ("class_name",))
+        counter.labels(class_name="person").inc()
+        counter.labels(class_name="person").inc(2)
+        counter.labels(class_name="car").inc()
+
+        text = self.registry.render_prometheus()
+        self.assertIn("# TYPE smartdet_detections_total counter", text)
+        self.assertIn('smartdet_detections_total{class_name="person"} 3', text)
+        self.assertIn('smartdet_detections_total{class_name="car"} 1', text)
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test histogram exposition uses cumulative buckets."""
+        histogram = self.registry.histogram("latency_seconds", "help", buckets=(0.1, 1))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value)
+
+        text = self.registry.render_prometheus()
+        self.assertIn('smartdet_latency_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('smartdet_latency_seconds_bucket{le="1"} 3', text)
+        self.assertIn('smartdet_latency_seconds_bucket{le="+Inf"} 4', text)
+        self.assertIn("smartdet_latency_seconds_count 4", text)
+
+    def test_snapshot_quantiles(self):
+        """Test the Python API reports histogram quantile estimates."""
+        histogram = self.registry.histogram(
+            "stage_latency_seconds", "help", ("stage",), buckets=(0.01, 0.02, 0.04)
+        )
+        child = histogram.labels(stage="inference")
+        for _ in range(100):
+            child.observe(0.015)
+
+        series = self.registry.snapshot()["smartdet_stage_latency_seconds"]
+        self.assertEqual(series[0]["labels"], {"stage": "inference"})
+        self.assertEqual(series[0]["count"], 100)
+        self.assertTrue(0.01 <= series[0]["p95"] <= 0.02)
+
+    def test_type_conflict_raises(self):
+        """Test re-registering a name with another type is rejected."""
+        self.registry.counter("frames", "help")
+        with self.assertRaises(ValueError):
+            self.registry.gauge("frames", "help")
+
+
+class TestMetricsServer(unittest.TestCase):
+    """Test cases for the /metrics HTTP endpoint."""
+
+    def test_serves_metrics(self):
+        """Test scraping the endpoint returns the exposition text."""
+        registry = MetricsRegistry()
+        registry.gauge("queue_depth", "help").set(3)
+        server = MetricsServer(registry, port=0)
+        self.assertTrue(server.start())
+        try:
+            url = f"http://127.0.0.1:{server.port}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read().decode()
+            self.assertIn("smartdet_queue_depth 3", body)
+
+            with self.assertRaises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"http://127.0.0.1:{server.port}/", timeout=5)
+        finally:
+            server.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
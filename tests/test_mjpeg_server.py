@@ -0,0 +1,114 @@
+import threading
+import time
+import unittest
+import urllib.request
+import numpy as np
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from src.mjpeg_server import FrameBroadcaster, MjpegServer
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+class TestFrameBroadcaster(unittest.TestCase):
+    """Test cases for shared JPEG encoding."""
+
+    def setUp(self):
+        self.broadcaster = FrameBroadcaster(quality=70, scale=0.5)
+        self.broadcaster.start()
+        self.frame = np.random.randint(0, 255, (120, 160, 3), dtype=np.uint8)
+
+    def tearDown(self):
+        self.broadcaster.stop()
+
+    def test_no_viewers_skips_encoding(self):
+        """Test that frames are not encoded while nobody watches."""
+        self.assertFalse(self.broadcaster.publish(self.frame))
+        time.sleep(0.02)
+        self.assertEqual(self.broadcaster.frames_encoded, 0)
+
+    def test_frame_encoded_once_for_all_viewers(self):
+        """Test that every viewer receives the same single encoding."""
+        viewers = [self.broadcaster.frames(timeout=1.0) for _ in range(3)]
+        received = []
+        threads = [
+            threading.Thread(target=lambda v=v: received.append(next(v)))
+            for v in viewers
+        ]
+        for thread in threads:
+            thread.start()
+        self.assertTrue(wait_until(lambda: self.broadcaster.viewers == 3))
+
+        self.broadcaster.publish(self.frame)
+        for thread in threads:
+            thread.join(timeout=2.0)
+
+        self.assertEqual(self.broadcaster.frames_encoded, 1)
+        self.assertEqual(len(received), 3)
+        self.assertEqual(len(set(received)), 1)
+        self.assertTrue(received[0].startswith(b"\xff\xd8"))
+        for viewer in viewers:
+            viewer.close()
+        self.assertEqual(self.broadcaster.viewers, 0)
+
+    def test_slow_viewer_gets_latest_frame(self):
+        """Test that a viewer that falls behind skips to the newest frame."""
+        viewer = self.broadcaster.frames(timeout=1.0)
+        first = threading.Thread(target=lambda: next(viewer))
+        first.start()
+        self.assertTrue(wait_until(lambda: self.broadcaster.viewers == 1))
+        self.broadcaster.publish(self.frame)
+        first.join(timeout=2.0)
+
+        # Three frames arrive while the viewer is busy elsewhere
+        for value in (10, 20, 30):
+            self.broadcaster.publish(np.full_like(self.frame, value))
+            wait_until(lambda: self.broadcaster._pending is None)
+        self.assertEqual(next(viewer), self.broadcaster.latest())
+        viewer.close()
+
+
+class TestMjpegServer(unittest.TestCase):
+    """Test cases for the HTTP endpoint."""
+
+    def test_stream_serves_multipart_jpeg(self):
+        """Test that /stream.mjpg delivers JPEG parts to a client."""
+        broadcaster = FrameBroadcaster()
+        server = MjpegServer(broadcaster, port=0)
+        self.assertTrue(server.start())
+        try:
+            frame = np.zeros((48, 64, 3), dtype=np.uint8)
+            publisher_stop = threading.Event()
+
+            def publish():
+                while not publisher_stop.is_set():
+                    broadcaster.publish(frame)
+                    time.sleep(0.01)
+
+            publisher = threading.Thread(target=publish, daemon=True)
+            publisher.start()
+            url = f"http://127.0.0.1:{server.port}/stream.mjpg"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                self.assertIn(
+                    "multipart/x-mixed-replace", response.headers["Content-Type"]
+                )
+                chunk = response.read(200)
+            publisher_stop.set()
+            publisher.join()
+            self.assertIn(b"Content-Type: image/jpeg", chunk)
+            self.assertIn(b"\xff\xd8", chunk)
+        finally:
+            server.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
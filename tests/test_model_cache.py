@@ -0,0 +1,125 @@
+import os
+import tempfile
+import unittest
+import sys
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from src.model_cache import ModelCache
+
+
+class TestModelCache(unittest.TestCase):
+    """Test cases for ModelCache class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ModelCache(os.path.join(self.tmp.name, "cache"))
+        self.model_path = os.path.join(self.tmp.name, "yolov8n.pt")
+        self._write_model(b"weights-v1")
+        self.builds = 0
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.tmp.cleanup()
+
+    def _write_model(self, content: bytes):
+        with open(self.model_path, "wb") as f:
+            f.write(content)
+        # Force a new mtime so the cached file hash is invalidated
+        stat = os.stat(self.model_path)
+        os.utime(self.model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def _build(self, scratch: str) -> str:
+        self.builds += 1
+        path = os.path.join(scratch, "model.onnx")
+        with open(path, "w") as f:
+            f.write(f"build {self.builds}")
+        return path
+
+    def test_key_depends_on_every_input(self):
+        """Test that model content, size, backend and versions change the key."""
+        versions = {"torch": "2.1.0"}
+        base = self.cache.cache_key(self.model_path, 640, "onnx", versions=versions)
+        self.assertEqual(
+            base, self.cache.cache_key(self.model_path, 640, "onnx", versions=versions)
+        )
+        self.assertNotEqual(
+            base, self.cache.cache_key(self.model_path, 320, "onnx", versions=versions)
+        )
+        self.assertNotEqual(
+            base,
+            self.cache.cache_key(
+                self.model_path, 640, "torchscript", versions=versions
+            ),
+        )
+        self.assertNotEqual(
+            base,
+            self.cache.cache_key(
+                self.model_path, 640, "onnx", versions={"torch": "2.2.0"}
+            ),
+        )
+        self._write_model(b"weights-v2")
+        self.assertNotEqual(
+            base, self.cache.cache_key(self.model_path, 640, "onnx", versions=versions)
+        )
+
+    def test_builds_once_and_reuses(self):
+        """Test that a second request is served from the cache."""
+        first = self.cache.get_or_build(self.model_path, 640, "onnx", self._build)
+        second = self.cache.get_or_build(self.model_path, 640, "onnx", self._build)
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.builds, 1)
+        self.assertTrue(first.endswith(".onnx"))
+        with open(first) as f:
+            self.assertEqual(f.read(), "build 1")
+
+    def test_changed_model_invalidates_and_prunes(self):
+        """Test that a new model file rebuilds and removes the stale artifact."""
+        old = self.cache.get_or_build(self.model_path, 640, "onnx", self._build)
+        self._write_model(b"weights-v2")
+        new = self.cache.get_or_build(self.model_path, 640, "onnx", self._build)
+
+        self.assertNotEqual(old, new)
+        self.assertEqual(self.builds, 2)
+        self.assertFalse(os.path.exists(old))
+        self.assertTrue(os.path.exists(new))
+
+    def test_different_options_coexist(self):
+        """Test that artifacts built with other options are not pruned."""
+        fp32 = self.cache.get_or_build(
+            self.model_path, 640, "onnx", self._build, {"half": False}
+        )
+        fp16 = self.cache.get_or_build(
+            self.model_path, 640, "onnx", self._build, {"half": True}
+        )
+
+        self.assertNotEqual(fp32, fp16)
+        self.assertTrue(os.path.exists(fp32))
+        self.assertTrue(os.path.exists(fp16))
+
+    def test_other_sizes_and_same_named_models_coexist(self):
+        """Test that only generations of the same model and size are pruned."""
+        other_dir = os.path.join(self.tmp.name, "other")
+        os.makedirs(other_dir)
+        other_model = os.path.join(other_dir, "yolov8n.pt")
+        with open(other_model, "wb") as f:
+            f.write(b"other-weights")
+
+        paths = [
+            self.cache.get_or_build(self.model_path, 640, "onnx", self._build),
+            self.cache.get_or_build(self.model_path, 320, "onnx", self._build),
+            self.cache.get_or_build(other_model, 640, "onnx", self._build),
+        ]
+
+        self.assertEqual(len(set(paths)), 3)
+        self.assertTrue(all(os.path.exists(path) for path in paths))
+        # Served from the cache, not rebuilt by the other two
+        self.cache.get_or_build(self.model_path, 640, "onnx", self._build)
+        self.assertEqual(self.builds, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import time
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from src.model_cascade import ModelCascade
+
+
+class FakeDetector:
+    """Detector stand-in with configurable latency and output."""
+
+    def __init__(self, latency=0.0, detections=None, crop_detections=None):
+        self.latency = latency
+        self.detections = detections or []
+        self.crop_detections = crop_detections or []
+        self.confidence_threshold = 0.5
+        self.stage_observer = None
+        self.calls = 0
+        self.batches = []
+
+    def load_model(self):
+        return True
+
+    def warmup(self, frame_size, iterations):
+        time.sleep(self.latency * iterations)
+        return self.latency * iterations
+
+    def detect_objects(self, frame):
+        self.calls += 1
+        time.sleep(self.latency)
+        return list(self.detections)
+
+    def detect_batch(self, frames):
+        self.batches.append([f.shape for f in frames])
+        return [list(self.crop_detections) for _ in frames]
+
+
+def detection(bbox, confidence, class_id=0):
+    return {
+        "bbox": bbox,
+        "confidence": confidence,
+        "class_id": class_id,
+        "class_name": "person",
+    }
+
+
+class TestModelCascade(unittest.TestCase):
+    """Test cases for ModelCascade class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.frame = np.zeros((100, 200, 3), dtype=np.uint8)
+
+    def test_starts_fast_when_accurate_exceeds_budget(self):
+        """Test the initial model is chosen from warm-up latency."""
+        cascade = ModelCascade(
+            FakeDetector(0.001), FakeDetector(0.02), frame_budget=0.01
+        )
+        cascade.warmup((200, 100), 1)
+        self.assertEqual(cascade.active, "fast")
+
+    def test_downgrades_under_load_and_upgrades_with_headroom(self):
+        """Test switching follows latency with dwell-time hysteresis."""
+        fast, accurate = FakeDetector(0.0), FakeDetector(0.0)
+        cascade = ModelCascade(fast, accurate, frame_budget=0.01, min_dwell_frames=3)
+        self.assertEqual(cascade.active, "accurate")
+
+        accurate.latency = 0.015
+        for _ in range(3):
+            cascade.detect_objects(self.frame)
+        self.assertEqual(cascade.active, "fast")
+        self.assertEqual(cascade.switches, 1)
+
+        # Load goes away: the fast model's estimate drives the prediction
+        cascade.latency["accurate"] = 0.001
+        for _ in range(3):
+            cascade.detect_objects(self.frame)
+        self.assertEqual(cascade.active, "accurate")
+        self.assertEqual(cascade.switches, 2)
+
+    def test_predicts_accurate_latency_from_fast_slowdown(self):
+        """Test the accurate estimate scales with the fast model's load."""
+        cascade = ModelCascade(FakeDetector(), FakeDetector(), frame_budget=0.05)
+        cascade.active = "fast"
+        cascade.baseline = {"fast": 0.01, "accurate": 0.03}
+        cascade.latency = {"fast": 0.02, "accurate": 0.03}
+        self.assertAlmostEqual(cascade.predicted_accurate_latency(), 0.06)
+
+    def test_refines_uncertain_boxes_in_one_batch(self):
+        """Test uncertain fast boxes are re-checked as crops and mapped back."""
+        fast = FakeDetector(
+            detections=[
+                detection([10, 10, 50, 50], 0.9),
+                detection([100, 20, 140, 80], 0.4),
+                detection([150, 20, 190, 80], 0.2),
+            ]
+        )
+        accurate = FakeDetector(crop_detections=[detection([2, 3, 30, 40], 0.8)])
+        cascade = ModelCascade(
+            fast,
+            accurate,
+            refine_band=(0.3, 0.6),
+            refine_margin=0.0,
+            min_dwell_frames=1000,
+        )
+        cascade.active = "fast"
+
+        detections = cascade.detect_objects(self.frame)
+
+        self.assertEqual(fast.confidence_threshold, 0.3)
+        self.assertEqual(accurate.batches, [[(60, 40, 3)]])
+        self.assertEqual(
+            [d["bbox"] for d in detections], [[10, 10, 50, 50], [102, 23, 130, 60]]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
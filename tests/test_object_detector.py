@@ -0,0 +1,119 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from src.object_detector import ObjectDetector, build_class_filter, select_boxes
+
+NAMES = {0: "person", 1: "bicycle", 2: "car", 3: "dog"}
+
+
+class FakeTensor:
+    """Array wrapper with the .cpu().numpy() interface of a torch tensor."""
+
+    def __init__(self, array):
+        self.array = np.asarray(array, dtype=np.float32)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self.array
+
+
+class FakeBoxes:
+    def __init__(self, rows):
+        self.data = FakeTensor(np.array(rows, dtype=np.float32).reshape(-1, 6))
+
+    def __len__(self):
+        return len(self.data.array)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.boxes = FakeBoxes(rows)
+
+
+class FakeModel:
+    names = NAMES
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, frame, **kwargs):
+        self.calls.append(kwargs)
+        return []
+
+
+class TestClassFilter(unittest.TestCase):
+    """Test cases for class allow/deny lists and per-class thresholds."""
+
+    def test_build_class_filter(self):
+        """Test name and id resolution into lookup tables."""
+        allowed, thresholds = build_class_filter(
+            NAMES,
+            0.5,
+            classes=["person", 2, "unicorn"],
+            exclude_classes=["car"],
+            class_thresholds={"person": 0.7, "3": 0.2},
+        )
+        self.assertEqual(allowed.tolist(), [True, False, False, False])
+        np.testing.assert_allclose(thresholds, [0.7, 0.5, 0.5, 0.2])
+
+    def test_select_boxes(self):
+        """Test the vectorized mask, including out-of-range class ids."""
+        allowed = np.array([True, False, True])
+        thresholds = np.array([0.5, 0.5, 0.8], dtype=np.float32)
+        cls = np.array([0, 0, 1, 2, 2, 7])
+        conf = np.array([0.6, 0.4, 0.9, 0.7, 0.85, 0.99])
+        mask = select_boxes(cls, conf, allowed, thresholds)
+        self.assertEqual(mask.tolist(), [True, False, False, False, True, False])
+
+    def test_decode_results_applies_filter(self):
+        """Test that only allowed boxes above their threshold are decoded."""
+        detector = ObjectDetector(
+            classes=["person", "dog"], class_thresholds={"dog": 0.3}
+        )
+        detector.model = FakeModel()
+        results = [
+            FakeResult(
+                [
+                    [10, 20, 50, 80, 0.9, 0],
+                    [0, 0, 5, 5, 0.4, 0],
+                    [1, 1, 9, 9, 0.95, 2],
+                    [5.7, 6.2, 30.9, 40.1, 0.35, 3],
+                ]
+            ),
+            FakeResult([]),
+        ]
+        detections = detector.decode_results(results)
+        self.assertEqual([d["class_name"] for d in detections], ["person", "dog"])
+        self.assertEqual(detections[0]["bbox"], [10, 20, 50, 80])
+        self.assertEqual(detections[1]["bbox"], [5, 6, 30, 40])
+        self.assertIsInstance(detections[0]["confidence"], float)
+
+    def test_predict_passes_filter_to_model(self):
+        """Test that allowed classes and the lowest threshold reach the model."""
+        detector = ObjectDetector(
+            exclude_classes=["car"], class_thresholds={"dog": 0.3}
+        )
+        detector.model = FakeModel()
+        detector.predict(np.zeros((8, 8, 3), dtype=np.uint8))
+        call = detector.model.calls[0]
+        self.assertEqual(call["classes"], [0, 1, 3])
+        self.assertAlmostEqual(call["conf"], 0.3, places=5)
+
+    def test_no_filter_passes_all_classes(self):
+        """Test that an unfiltered detector does not restrict model classes."""
+        detector = ObjectDetector(confidence_threshold=0.4)
+        detector.model = FakeModel()
+        detector.predict(np.zeros((8, 8, 3), dtype=np.uint8))
+        self.assertIsNone(detector.model.calls[0]["classes"])
+        self.assertAlmostEqual(detector.model.calls[0]["conf"], 0.4, places=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import json
+import os
+import signal
+import tempfile
+import time
+import unittest
+import sys
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from src.profiling import SignalProfiler, TraceRecorder
+
+
+class TestTraceRecorder(unittest.TestCase):
+    """Test cases for TraceRecorder class."""
+
+    def test_chrome_trace_format(self):
+        """Test spans export as complete ("X") trace events."""
+        tracer = TraceRecorder()
+        start = time.perf_counter()
+        tracer.add_span("capture", start, start + 0.002, frame=7)
+        with tracer.span("inference", frame=7):
+            pass
+
+        events = tracer.to_chrome_trace()["traceEvents"]
+        spans = [e for e in events if e["ph"] == "X"]
+        self.assertEqual([e["name"] for e in spans], ["capture", "inference"])
+        self.assertAlmostEqual(spans[0]["dur"], 2000, places=3)
+        self.assertEqual(spans[0]["args"], {"frame": 7})
+        self.assertTrue(any(e["ph"] == "M" for e in events))
+
+    def test_bounded_and_exportable(self):
+        """Test old spans are dropped and the trace is valid JSON."""
+        tracer = TraceRecorder(max_events=3)
+        for i in range(10):
+            tracer.add_span("frame", i, i + 0.5, frame=i)
+        self.assertEqual(len(tracer), 3)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.json")
+            self.assertTrue(tracer.export(path))
+            with open(path) as f:
+                events = json.load(f)["traceEvents"]
+        frames = [e["args"]["frame"] for e in events if e["ph"] == "X"]
+        self.assertEqual(frames, [7, 8, 9])
+
+
+@unittest.skipUnless(hasattr(signal, "SIGUSR1"), "requires POSIX signals")
+class TestSignalProfiler(unittest.TestCase):
+    """Test cases for SignalProfiler class."""
+
+    def test_sample_window_writes_folded_stacks(self):
+        """Test a signal starts a sampling window that writes folded stacks."""
+        previous = signal.getsignal(signal.SIGUSR1)
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler = SignalProfiler(duration=0.2, output_dir=tmp, interval=0.01)
+            try:
+                self.assertTrue(profiler.install())
+                os.kill(os.getpid(), signal.SIGUSR1)
+                deadline = time.time() + 5
+                while profiler.last_output is None and time.time() < deadline:
+                    time.sleep(0.02)
+            finally:
+                signal.signal(signal.SIGUSR1, previous)
+
+            self.assertIsNotNone(profiler.last_output)
+            with open(profiler.last_output) as f:
+                line = f.readline()
+            self.assertTrue(line.startswith("MainThread;"))
+            self.assertTrue(line.rstrip().split(" ")[-1].isdigit())
+
+
+if __name__ == "__main__":
+    unittest.main()
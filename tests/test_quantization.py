@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+import cv2
+import numpy as np
+import sys
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from src.quantization import (
+    CalibrationFrames,
+    compare_detectors,
+    list_frames,
+    match_detections,
+    preprocess_for_onnx,
+)
+
+
+def detection(bbox, class_id=0, confidence=0.9):
+    return {
+        "bbox": bbox,
+        "confidence": confidence,
+        "class_id": class_id,
+        "class_name": str(class_id),
+    }
+
+
+class TestQuantizationHelpers(unittest.TestCase):
+    """Test cases for calibration input and accuracy comparison helpers."""
+
+    def test_preprocess_matches_yolo_input(self):
+        """Test frames become letterboxed 1x3xHxW float tensors."""
+        frame = np.full((480, 640, 3), 255, dtype=np.uint8)
+        tensor = preprocess_for_onnx(frame, 320)
+
+        self.assertEqual(tensor.shape, (1, 3, 320, 320))
+        self.assertEqual(tensor.dtype, np.float32)
+        self.assertAlmostEqual(float(tensor.max()), 1.0)
+        # 640x480 letterboxed to 320x240 leaves grey bands top and bottom
+        self.assertAlmostEqual(float(tensor[0, 0, 0, 0]), 114 / 255, places=5)
+
+    def test_calibration_frames_from_folder(self):
+        """Test the calibration set reads image files in order."""
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("b.jpg", "a.png"):
+                cv2.imwrite(os.path.join(tmp, name), np.zeros((8, 8, 3), np.uint8))
+            with open(os.path.join(tmp, "notes.txt"), "w") as f:
+                f.write("not a frame")
+            paths = list_frames(tmp)
+            inputs = list(CalibrationFrames(paths, "images", 32))
+
+        self.assertEqual([os.path.basename(p) for p in paths], ["a.png", "b.jpg"])
+        self.assertEqual(len(inputs), 2)
+        self.assertEqual(inputs[0]["images"].shape, (1, 3, 32, 32))
+
+    def test_match_requires_class_and_overlap(self):
+        """Test matching by class and IoU, one match per reference box."""
+        reference = [detection([0, 0, 10, 10]), detection([20, 20, 30, 30], 1)]
+        candidate = [
+            detection([1, 1, 10, 10]),
+            detection([0, 0, 10, 10], confidence=0.5),
+            detection([20, 20, 30, 30], 2),
+        ]
+        stats = match_detections(reference, candidate)
+
+        self.assertEqual(stats["matched"], 1)
+        self.assertEqual(stats["reference"], 2)
+        self.assertEqual(stats["candidate"], 3)
+
+    def test_compare_detectors_report(self):
+        """Test the report treats the FP32 output as ground truth."""
+        frames = [np.zeros((4, 4, 3), np.uint8)] * 3
+
+        def reference(frame):
+            return [detection([0, 0, 10, 10]), detection([20, 20, 30, 30])]
+
+        def candidate(frame):
+            return [detection([0, 0, 10, 10])]
+
+        report = compare_detectors(reference, candidate, frames)
+        self.assertEqual(report["frames"], 3)
+        self.assertAlmostEqual(report["precision"], 1.0)
+        self.assertAlmostEqual(report["recall"], 0.5)
+        self.assertIn("speedup", report)
+
+
+if __name__ == "__main__":
+    unittest.main()
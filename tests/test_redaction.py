@@ -0,0 +1,80 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from src.redaction import Redactor
+
+
+def detection(x1, y1, x2, y2, class_name="person"):
+    return {
+        "bbox": [x1, y1, x2, y2],
+        "confidence": 0.9,
+        "class_id": 0,
+        "class_name": class_name,
+    }
+
+
+def noise(height=240, width=320):
+    return np.random.default_rng(0).integers(0, 256, (height, width, 3), np.uint8)
+
+
+class TestRedactor(unittest.TestCase):
+    """Test cases for region redaction."""
+
+    def test_only_regions_are_obscured(self):
+        """Test that pixelation covers the grown box and nothing else."""
+        frame = noise()
+        original = frame.copy()
+        redactor = Redactor(margin=0.0, cells=4, hold_frames=0)
+        redactor.redact(
+            frame, [detection(40, 40, 120, 200), detection(0, 0, 9, 9, "car")]
+        )
+
+        changed = np.argwhere((frame != original).any(axis=2))
+        self.assertEqual(changed.min(axis=0).tolist(), [40, 40])
+        self.assertEqual(changed.max(axis=0).tolist(), [199, 119])
+        # 4 cells across the longer side leaves a handful of distinct colours
+        region = frame[40:200, 40:120].reshape(-1, 3)
+        self.assertLessEqual(len(np.unique(region, axis=0)), 8)
+
+        blurred = noise()
+        Redactor("blur", margin=0.0, hold_frames=0).redact(
+            blurred, [detection(40, 40, 120, 200)]
+        )
+        self.assertLess(blurred[40:200, 40:120].std(), original[40:200, 40:120].std())
+        with self.assertRaises(ValueError):
+            Redactor("gaussian")
+
+    def test_regions_are_held_between_detections(self):
+        """Test that missed frames stay redacted for hold_frames frames."""
+        redactor = Redactor(margin=0.0, hold_frames=3)
+        redactor.redact(noise(), [detection(10, 10, 50, 90)])
+        for _ in range(3):
+            frame = noise()
+            redactor.redact(frame, [])
+            self.assertFalse(np.array_equal(frame, noise()))
+        frame = noise()
+        redactor.redact(frame, [])
+        np.testing.assert_array_equal(frame, noise())
+
+        # A moving object keeps replacing its own held region
+        for step in range(20):
+            redactor.redact(noise(), [detection(10 + step, 10, 50 + step, 90)])
+        self.assertEqual(len(redactor.plan([], (320, 240))), 1)
+
+    def test_head_fraction_limits_person_boxes(self):
+        """Test that only the top of person boxes is redacted."""
+        redactor = Redactor(head_fraction=0.25, margin=0.0, hold_frames=0)
+        regions = redactor.plan(
+            [detection(10, 20, 50, 100), detection(60, 20, 90, 50, "face")],
+            (320, 240),
+        )
+        self.assertEqual(sorted(regions.tolist()), [[10, 20, 50, 40], [60, 20, 90, 50]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+import json
+import socket
+import tempfile
+import threading
+import time
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from src.result_sinks import (
+    JsonLinesSink,
+    MsgpackSink,
+    ResultSink,
+    UnixSocketSink,
+    create_sink,
+    read_msgpack_frames,
+)
+
+
+def make_result(index):
+    return {
+        "camera": "0",
+        "frame_index": index,
+        "timestamp": 1700000000.0 + index,
+        "detections": [
+            {
+                "bbox": [1, 2, 3, 4],
+                "confidence": np.float32(0.5),
+                "class_id": 0,
+                "class_name": "person",
+            }
+        ],
+    }
+
+
+class SocketListener:
+    """Local UNIX socket stand-in for a downstream consumer."""
+
+    def __init__(self, path):
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(path)
+        self.server.listen(1)
+        self.data = bytearray()
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        conn, _ = self.server.accept()
+        with conn:
+            while True:
+                chunk = conn.recv(65536)
+                if not chunk:
+                    return
+                self.data.extend(chunk)
+
+    def close(self):
+        self.thread.join(timeout=2.0)
+        self.server.close()
+
+
+class SlowSink(ResultSink):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.batches = []
+
+    def write(self, data):
+        time.sleep(0.05)
+        self.batches.append(data)
+        return True
+
+
+class TestResultSinks(unittest.TestCase):
+    """Test cases for result sinks."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_json_lines_file(self):
+        """Test that results are flushed as one JSON object per line."""
+        path = os.path.join(self.tmp.name, "out.jsonl")
+        sink = JsonLinesSink(path, max_queue=8192)
+        self.assertTrue(sink.start())
+        for index in range(5000):
+            sink.publish(make_result(index))
+        sink.close()
+
+        with open(path) as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(len(lines), 5000)
+        self.assertEqual(lines[-1]["frame_index"], 4999)
+        self.assertEqual(lines[0]["detections"][0]["confidence"], 0.5)
+        self.assertEqual(sink.stats()["written"], 5000)
+
+    def test_msgpack_over_unix_socket(self):
+        """Test length-prefixed msgpack records through a local socket."""
+        path = os.path.join(self.tmp.name, "results.sock")
+        listener = SocketListener(path)
+        sink = create_sink(f"unix+msgpack:{path}", batch_size=16)
+        self.assertIsInstance(sink, UnixSocketSink)
+        self.assertTrue(sink.start())
+        for index in range(100):
+            sink.publish(make_result(index))
+        sink.close()
+        listener.close()
+
+        records = read_msgpack_frames(bytes(listener.data))
+        self.assertEqual([r["frame_index"] for r in records], list(range(100)))
+        self.assertEqual(records[0]["detections"][0]["class_name"], "person")
+
+    def test_missing_socket_drops_without_blocking(self):
+        """Test that an absent consumer costs dropped results, not stalls."""
+        sink = UnixSocketSink(os.path.join(self.tmp.name, "nobody.sock"))
+        self.assertTrue(sink.start())
+        start = time.perf_counter()
+        for index in range(50):
+            sink.publish(make_result(index))
+        self.assertLess(time.perf_counter() - start, 0.1)
+        sink.close()
+        self.assertEqual(sink.stats()["dropped"], 50)
+
+    def test_full_queue_drops_new_results(self):
+        """Test that publish never blocks when the writer falls behind."""
+        sink = SlowSink(max_queue=10, batch_size=5)
+        observed = []
+        sink.write_observer = observed.extend
+        self.assertTrue(sink.start())
+        accepted = sum(sink.publish(make_result(i)) for i in range(100))
+        sink.close()
+        self.assertLess(accepted, 100)
+        self.assertEqual(sink.published, accepted)
+        self.assertEqual(sink.dropped, 100 - accepted)
+        self.assertEqual(sink.written, accepted)
+        # The observer sees exactly the results that were written
+        self.assertEqual(len(observed), accepted)
+
+    def test_msgpack_file(self):
+        """Test the msgpack file sink and spec parsing."""
+        path = os.path.join(self.tmp.name, "out.bin")
+        sink = create_sink(f"msgpack:{path}")
+        self.assertIsInstance(sink, MsgpackSink)
+        self.assertTrue(sink.start())
+        sink.publish(make_result(7))
+        sink.close()
+        with open(path, "rb") as f:
+            self.assertEqual(read_msgpack_frames(f.read())[0]["frame_index"], 7)
+        with self.assertRaises(ValueError):
+            create_sink("carrier-pigeon:home")
+
+
+if __name__ == "__main__":
+    unittest.main()
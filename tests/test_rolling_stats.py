@@ -0,0 +1,81 @@
+import unittest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from src.rolling_stats import RollingStats, format_duration
+
+
+def detection(class_name, confidence):
+    return {
+        "bbox": [0, 0, 10, 10],
+        "confidence": confidence,
+        "class_id": 0,
+        "class_name": class_name,
+    }
+
+
+class TestRollingStats(unittest.TestCase):
+    """Test cases for the windowed per-class statistics."""
+
+    def test_counts_confidence_and_peaks(self):
+        """Test per-class aggregates within one window."""
+        stats = RollingStats(windows=(60,), buckets=60)
+        stats.update([detection("person", 0.9), detection("person", 0.7)], 0.0)
+        stats.update([detection("car", 0.6)], 0.5)
+        stats.update([], 1.0)
+        stats.update([detection("person", 0.8)], 2.0)
+
+        summary = stats.summary(timestamp=2.0)
+        self.assertEqual(summary["frames"], 4)
+        self.assertEqual(summary["detections"], 4)
+        self.assertEqual(summary["peak_objects"], 2)
+        person = summary["classes"]["person"]
+        self.assertEqual(person["count"], 3)
+        self.assertAlmostEqual(person["mean_confidence"], 0.8)
+        self.assertEqual(person["peak"], 2)
+        self.assertAlmostEqual(person["per_frame"], 0.75)
+        self.assertEqual(summary["classes"]["car"]["peak"], 1)
+
+    def test_windows_slide_and_expire(self):
+        """Test that old buckets leave each window at its own pace."""
+        stats = RollingStats(windows=(60, 3600), buckets=60)
+        stats.update([detection("person", 0.9)] * 5, 0.0)
+        for second in range(1, 120):
+            stats.update([detection("dog", 0.5)], float(second))
+
+        short = stats.summary(60, timestamp=119.0)
+        self.assertNotIn("person", short["classes"])
+        self.assertEqual(short["classes"]["dog"]["count"], 60)
+        self.assertEqual(short["peak_objects"], 1)
+        long = stats.summary(3600, timestamp=119.0)
+        self.assertEqual(long["classes"]["person"]["peak"], 5)
+        self.assertEqual(long["frames"], 120)
+
+        # Querying after a long quiet period expires everything
+        idle = stats.summary(60, timestamp=1000.0)
+        self.assertEqual((idle["frames"], idle["classes"]), (0, {}))
+        with self.assertRaises(ValueError):
+            stats.summary(42)
+
+    def test_format_summary(self):
+        """Test the log line of each window."""
+        stats = RollingStats()
+        stats.update([detection("person", 0.9), detection("car", 0.5)], 10.0)
+        lines = stats.format_summary(10.0).splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(
+            lines[0],
+            "Last 1m: 1 frames, peak 2 objects; "
+            "person 1 (conf 0.90, peak 1), car 1 (conf 0.50, peak 1)",
+        )
+        self.assertTrue(lines[2].startswith("Last 1h:"))
+        self.assertEqual(
+            [format_duration(s) for s in (90, 300, 7.5)], ["90s", "5m", "7.5s"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import cv2
+import json
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from src import snapshot_store
+from src.snapshot_store import SnapshotStore, _Crop, difference_hash, hamming
+
+
+def detection(bbox, class_name="person", confidence=0.9, track_id=None):
+    result = {
+        "bbox": bbox,
+        "confidence": confidence,
+        "class_id": 0,
+        "class_name": class_name,
+    }
+    if track_id is not None:
+        result["track_id"] = track_id
+    return result
+
+
+def scene(seed):
+    return np.random.default_rng(seed).integers(0, 256, (240, 320, 3), np.uint8)
+
+
+def read_index(directory):
+    with open(os.path.join(directory, "index.jsonl")) as f:
+        return [json.loads(line) for line in f]
+
+
+class TestSnapshotStore(unittest.TestCase):
+    """Test cases for the thumbnail store."""
+
+    def test_significant_detections_are_stored(self):
+        """Test filtering, thumbnail size and index entries."""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SnapshotStore(tmp, max_side=32, dedup_distance=0)
+            self.assertTrue(store.start())
+            queued = store.submit(
+                scene(0),
+                [
+                    detection([10, 10, 110, 210], track_id=3),
+                    detection([0, 0, 20, 20]),  # too small
+                    detection([50, 50, 150, 150], confidence=0.3),
+                ],
+                camera="lobby",
+                frame_index=7,
+            )
+            store.close()
+            self.assertEqual(queued, 1)
+
+            entries = read_index(tmp)
+            self.assertEqual(len(entries), 1)
+            entry = entries[0]
+            self.assertEqual(entry["camera"], "lobby")
+            self.assertEqual((entry["frame_index"], entry["track_id"]), (7, 3))
+            self.assertEqual(entry["bbox"], [10, 10, 110, 210])
+            thumbnail = cv2.imread(os.path.join(tmp, entry["file"]))
+            self.assertEqual(thumbnail.shape, (32, 16, 3))
+            self.assertEqual(store.stats()["written"], 1)
+
+    def test_near_identical_snapshots_are_skipped(self):
+        """Test dHash deduplication per object."""
+        first, other = scene(1), scene(2)
+        noisy = np.clip(first.astype(int) + 3, 0, 255).astype(np.uint8)
+        self.assertLessEqual(hamming(difference_hash(first), difference_hash(noisy)), 6)
+        self.assertGreater(hamming(difference_hash(first), difference_hash(other)), 6)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SnapshotStore(tmp, workers=1)
+            store.start()
+            box = [0, 0, 320, 240]
+            for index, frame in enumerate([first, noisy, first, other]):
+                store.submit(frame, [detection(box, track_id=1)], frame_index=index)
+            # Another object may look the same and is still stored
+            store.submit(first, [detection(box, track_id=2)], frame_index=4)
+            store.close()
+            stats = store.stats()
+            self.assertEqual((stats["written"], stats["deduplicated"]), (3, 2))
+
+    def test_departed_objects_are_forgotten(self):
+        """Test that dedup state for one-off track ids stays bounded."""
+        crop = np.zeros((8, 8, 3), np.uint8)
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SnapshotStore(tmp, dedup_window=10.0)
+            # A new object every 10 ms, none of which comes back
+            for track_id in range(5000):
+                meta = {"timestamp": track_id * 0.01}
+                store._is_duplicate(_Crop(crop, meta, ("0", track_id)), track_id)
+            self.assertLessEqual(len(store._recent), 1001)
+            self.assertIn(("0", 4999), store._recent)
+
+            with mock.patch.object(snapshot_store, "MAX_RECENT_OBJECTS", 100):
+                for track_id in range(5000, 5500):
+                    meta = {"timestamp": 50.0}
+                    store._is_duplicate(_Crop(crop, meta, ("0", track_id)), 0)
+            self.assertEqual(len(store._recent), 100)
+
+    def test_size_cap_evicts_oldest_and_survives_restart(self):
+        """Test the rolling size cap, index compaction and reloading."""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SnapshotStore(tmp, workers=1, dedup_distance=0, max_bytes=40000)
+            store.start()
+            for index in range(100):
+                store.submit(scene(index), [detection([0, 0, 200, 200])], "0", index)
+            store.close()
+
+            entries = read_index(tmp)
+            files = os.listdir(os.path.join(tmp, "0"))
+            self.assertEqual(len(files), len(entries))
+            self.assertLessEqual(sum(entry["bytes"] for entry in entries), 40000)
+            self.assertEqual(entries[-1]["frame_index"], 99)
+            self.assertGreater(store.stats()["evicted"], 0)
+
+            reopened = SnapshotStore(tmp)
+            reopened.start()
+            self.assertEqual(reopened.stats()["stored"], len(entries))
+            reopened.close()
+
+    def test_full_queue_drops_crops(self):
+        """Test that submit() never blocks on a full queue."""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SnapshotStore(tmp, max_queue_bytes=100 * 100 * 3)
+            # Not started, so nothing drains the queue
+            for _ in range(3):
+                store.submit(scene(0), [detection([0, 0, 100, 100])])
+            self.assertEqual(store.stats()["dropped"], 2)
+            self.assertEqual(store.stats()["queued"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
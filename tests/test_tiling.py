@@ -0,0 +1,102 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from src.geometry import batched_nms
+from src.tiling import MotionTileSelector, TiledDetector, compute_tiles
+
+
+class FakeDetector:
+    """Batched detector that reports one box per crop containing bright pixels."""
+
+    def __init__(self):
+        self.confidence_threshold = 0.5
+        self.stage_observer = None
+        self.model = object()
+        self.batch_sizes = []
+
+    def load_model(self):
+        return True
+
+    def detect_batch(self, frames):
+        self.batch_sizes.append(len(frames))
+        results = []
+        for crop in frames:
+            ys, xs = np.nonzero(crop[:, :, 0] > 128)
+            if len(xs) == 0:
+                results.append([])
+                continue
+            bbox = [int(xs.min()), int(ys.min()), int(xs.max()) + 1, int(ys.max()) + 1]
+            results.append(
+                [{"bbox": bbox, "confidence": 0.9, "class_id": 0, "class_name": "x"}]
+            )
+        return results
+
+
+class TestTiling(unittest.TestCase):
+    """Test cases for tiled inference."""
+
+    def test_compute_tiles_covers_frame(self):
+        """Test that tiles cover the frame with the requested overlap."""
+        tiles = compute_tiles(3840, 2160, 640, 0.2)
+        self.assertTrue(np.all(tiles[:, 2] - tiles[:, 0] == 640))
+        self.assertEqual(tiles[:, 2].max(), 3840)
+        self.assertEqual(tiles[:, 3].max(), 2160)
+        xs = np.unique(tiles[:, 0])
+        self.assertTrue(np.all(np.diff(xs) <= 640 * 0.8))
+        # Frames smaller than a tile give one clipped tile
+        self.assertEqual(compute_tiles(320, 240, 640).tolist(), [[0, 0, 320, 240]])
+
+    def test_batched_nms_is_class_aware(self):
+        """Test that only same-class overlapping boxes suppress each other."""
+        boxes = np.array(
+            [[0, 0, 10, 10], [1, 1, 11, 11], [0, 0, 10, 10], [50, 50, 60, 60]]
+        )
+        scores = np.array([0.9, 0.8, 0.7, 0.6])
+        keep = batched_nms(boxes, scores, np.array([0, 0, 1, 0]), 0.5)
+        self.assertEqual(keep.tolist(), [0, 2, 3])
+
+    def test_object_on_tile_border_is_merged(self):
+        """Test that a box seen by two overlapping tiles is reported once."""
+        detector = FakeDetector()
+        tiled = TiledDetector(detector, tile_size=100, overlap=0.5)
+        frame = np.zeros((100, 200, 3), dtype=np.uint8)
+        frame[40:60, 90:110] = 255
+
+        detections = tiled.detect_objects(frame)
+
+        self.assertEqual(detector.batch_sizes, [3])
+        self.assertEqual(len(detections), 1)
+        self.assertEqual(detections[0]["bbox"], [90, 40, 110, 60])
+
+    def test_motion_selector_skips_static_tiles(self):
+        """Test that unchanged tiles are skipped but keep their detections."""
+        detector = FakeDetector()
+        selector = MotionTileSelector(downscale=4, refresh_interval=0)
+        tiled = TiledDetector(detector, tile_size=100, overlap=0.0)
+        tiled.motion_selector = selector
+        frame = np.zeros((100, 400, 3), dtype=np.uint8)
+        frame[10:30, 10:30] = 255
+
+        first = tiled.detect_objects(frame)
+        self.assertEqual(len(first), 1)
+        first[0]["track_id"] = 7  # as ZoneAnalytics does
+        frame[60:80, 310:330] = 255
+        detections = tiled.detect_objects(frame)
+
+        self.assertEqual(detector.batch_sizes, [4, 1])
+        self.assertEqual(
+            sorted(d["bbox"] for d in detections),
+            [[10, 10, 30, 30], [310, 60, 330, 80]],
+        )
+        # Reused detections are copies, not the previous frame's dicts
+        self.assertFalse(any("track_id" in d for d in detections))
+        self.assertAlmostEqual(tiled.stats()["active_fraction"], 5 / 8)
+
+
+if __name__ == "__main__":
+    unittest.main()